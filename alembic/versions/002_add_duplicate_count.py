@@ -0,0 +1,33 @@
+"""add_duplicate_count
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '002'
+down_revision: Union[str, Sequence[str], None] = '001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Number of duplicate profiles collapsed within a job
+    op.add_column(
+        'push_jobs',
+        sa.Column('duplicate_count', sa.Integer(), nullable=True, server_default='0'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('push_jobs') as batch_op:
+        batch_op.drop_column('duplicate_count')
@@ -0,0 +1,117 @@
+"""add_contact_match_keys
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.domain import make_name_key, normalize_email, normalize_linkedin_id
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003'
+down_revision: Union[str, Sequence[str], None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows backfilled per UPDATE batch
+BACKFILL_BATCH_SIZE = 10_000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Normalized match keys, filled by the application on insert and update
+    op.add_column('contacts', sa.Column('email_norm', sa.String(), nullable=True))
+    op.add_column('contacts', sa.Column('linkedin_norm', sa.String(), nullable=True))
+    op.add_column('contacts', sa.Column('name_key', sa.String(), nullable=True))
+
+    _backfill_match_keys()
+
+    # Job lookups (get_by_job_id, get_synced_contacts_by_job_id)
+    op.create_index('ix_contacts_job_id', 'contacts', ['job_id'])
+    op.create_index('ix_contacts_job_id_status', 'contacts', ['job_id', 'status'])
+    op.create_index('ix_contacts_hubspot_id', 'contacts', ['hubspot_id'])
+    # Matching and history lookups
+    op.create_index('ix_contacts_email_norm', 'contacts', ['email_norm'])
+    op.create_index('ix_contacts_linkedin_norm', 'contacts', ['linkedin_norm'])
+    op.create_index('ix_contacts_name_key', 'contacts', ['name_key'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contacts_name_key', table_name='contacts')
+    op.drop_index('ix_contacts_linkedin_norm', table_name='contacts')
+    op.drop_index('ix_contacts_email_norm', table_name='contacts')
+    op.drop_index('ix_contacts_hubspot_id', table_name='contacts')
+    op.drop_index('ix_contacts_job_id_status', table_name='contacts')
+    op.drop_index('ix_contacts_job_id', table_name='contacts')
+
+    with op.batch_alter_table('contacts') as batch_op:
+        batch_op.drop_column('name_key')
+        batch_op.drop_column('linkedin_norm')
+        batch_op.drop_column('email_norm')
+
+
+def _backfill_match_keys() -> None:
+    """Compute match keys for existing rows, in id order and fixed-size batches.
+
+    Normalization runs in Python so that it is identical to the application's,
+    whatever the database's own lower() does with non-ASCII text.
+    """
+    bind = op.get_bind()
+    contacts = sa.table(
+        'contacts',
+        sa.column('id', sa.Integer()),
+        sa.column('first_name', sa.String()),
+        sa.column('last_name', sa.String()),
+        sa.column('email', sa.String()),
+        sa.column('linkedin_id', sa.String()),
+        sa.column('email_norm', sa.String()),
+        sa.column('linkedin_norm', sa.String()),
+        sa.column('name_key', sa.String()),
+    )
+    update = (
+        contacts.update()
+        .where(contacts.c.id == sa.bindparam('row_id'))
+        .values(
+            email_norm=sa.bindparam('email_norm'),
+            linkedin_norm=sa.bindparam('linkedin_norm'),
+            name_key=sa.bindparam('name_key'),
+        )
+    )
+
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(
+                contacts.c.id,
+                contacts.c.first_name,
+                contacts.c.last_name,
+                contacts.c.email,
+                contacts.c.linkedin_id,
+            )
+            .where(contacts.c.id > last_id)
+            .order_by(contacts.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+
+        bind.execute(
+            update,
+            [
+                {
+                    'row_id': row.id,
+                    'email_norm': normalize_email(row.email),
+                    'linkedin_norm': normalize_linkedin_id(row.linkedin_id),
+                    'name_key': make_name_key(row.first_name, row.last_name),
+                }
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
@@ -0,0 +1,43 @@
+"""add_crm_contacts
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004'
+down_revision: Union[str, Sequence[str], None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Local mirror of CRM contacts, matched against in SQL
+    op.create_table(
+        'crm_contacts',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('hubspot_id', sa.String(), nullable=False, unique=True),
+        sa.Column('firstname', sa.String(), nullable=True),
+        sa.Column('lastname', sa.String(), nullable=True),
+        sa.Column('email', sa.String(), nullable=True),
+        sa.Column('linkedin_id', sa.String(), nullable=True),
+        sa.Column('phone', sa.String(), nullable=True),
+        sa.Column('company', sa.String(), nullable=True),
+        sa.Column('email_norm', sa.String(), nullable=True, index=True),
+        sa.Column('linkedin_norm', sa.String(), nullable=True, index=True),
+        sa.Column('name_key', sa.String(), nullable=True, index=True),
+        sa.Column('synced_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('crm_contacts')
@@ -1,7 +1,22 @@
-from app.dependencies.services import get_job_executor, get_push_service, get_unit_of_work
+from app.dependencies.admin import is_admin, require_admin
+from app.dependencies.services import (
+    close_crm_client,
+    get_job_executor,
+    get_job_profiler,
+    get_matching_service,
+    get_push_service,
+    get_readiness_service,
+    get_unit_of_work,
+)
 
 __all__ = [
+    "close_crm_client",
     "get_push_service",
     "get_job_executor",
+    "get_job_profiler",
+    "get_matching_service",
+    "get_readiness_service",
     "get_unit_of_work",
+    "is_admin",
+    "require_admin",
 ]
@@ -0,0 +1,25 @@
+import os
+import secrets
+from typing import Annotated
+
+from fastapi import Header, HTTPException, status
+
+# Token expected in X-Admin-Token by admin-only endpoints (unset: they are disabled)
+DEBUG_ADMIN_TOKEN = os.getenv("DEBUG_ADMIN_TOKEN") or None
+
+
+def is_admin(token: str | None) -> bool:
+    """Whether token is the admin token."""
+    return (
+        DEBUG_ADMIN_TOKEN is not None
+        and token is not None
+        and secrets.compare_digest(token, DEBUG_ADMIN_TOKEN)
+    )
+
+
+def require_admin(x_admin_token: Annotated[str | None, Header()] = None) -> None:
+    """Dependency rejecting requests without the admin token; 404 while no token is set."""
+    if DEBUG_ADMIN_TOKEN is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not is_admin(x_admin_token):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin token required")
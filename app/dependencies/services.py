@@ -1,12 +1,80 @@
+import os
+
 from app.domain import CrmClient, UnitOfWork
-from app.infrastructure import HubSpotClient, SqlAlchemyUnitOfWork
-from app.services import PushService
-from app.services.contact_matching_service import ContactMatchingService
+from app.infrastructure import (
+    BatchingCrmClient,
+    HubSpotClient,
+    HubSpotHttpClient,
+    InstrumentedCrmClient,
+    SqlAlchemyUnitOfWork,
+    TokenBucket,
+    engine,
+    ping,
+    pool_utilization,
+)
+from app.infrastructure.profiling import JobProfiler
+from app.services import PushService, ReadinessService
+from app.services.columnar_matching_service import NumpyContactMatchingService
+from app.services.contact_matching_service import (
+    ContactMatchingService,
+    SqlContactMatchingService,
+)
+from app.services.external_matching_service import ExternalMergeMatchingService
+from app.services.snapshot_matching_service import SnapshotContactMatchingService
+from app.services.sync_pipeline import SYNC_CRM_CONCURRENCY, PipelineConfig
 from app.services.job_executor_service import JobExecutorService, get_job_executor_service
 
+# HubSpot API base URL, e.g. a FakeHubSpotServer for load tests (unset: in-memory client)
+HUBSPOT_BASE_URL = os.getenv("HUBSPOT_BASE_URL") or None
+# Batch CRM writes from all running jobs through one process-wide aggregator
+CRM_WRITE_AGGREGATOR_ENABLED = os.getenv("CRM_WRITE_AGGREGATOR_ENABLED", "false").lower() == "true"
+# Matching backend: "python" (dictionaries), "numpy" (hashed key columns, needs the
+# numpy extra), "external" (sorted runs spilled to disk, for portals exceeding RAM)
+# "sql" (one query per partition against the crm_contacts mirror table) or "snapshot"
+# (a memory-mapped match index file, rewritten from the CRM when stale)
+MATCH_BACKEND = os.getenv("MATCH_BACKEND", "python").lower()
+# Skip index lookups for contacts the CRM's match-key Bloom filter rules out
+MATCH_PREFILTER_ENABLED = os.getenv("MATCH_PREFILTER_ENABLED", "true").lower() == "true"
+
 # Singleton instances
-_hubspot_client: CrmClient = HubSpotClient()
-_matching_service = ContactMatchingService()
+# The in-memory client also provides the match-key filter; over HTTP there is none
+_hubspot: HubSpotClient | None = None
+_hubspot_http: HubSpotHttpClient | None = None
+_hubspot_client: CrmClient
+_crm_rate_limiter: TokenBucket | None = None
+if HUBSPOT_BASE_URL:
+    _hubspot_http = HubSpotHttpClient(HUBSPOT_BASE_URL)
+    _crm_rate_limiter = _hubspot_http.rate_limiter
+    _hubspot_client = _hubspot_http
+else:
+    _hubspot = HubSpotClient()
+    _hubspot_client = _hubspot
+# Metrics measure the calls actually made to the CRM, below the aggregator
+_hubspot_client = InstrumentedCrmClient(_hubspot_client)
+_write_aggregator: BatchingCrmClient | None = None
+_pipeline_config: PipelineConfig | None = None
+if CRM_WRITE_AGGREGATOR_ENABLED:
+    _write_aggregator = BatchingCrmClient(_hubspot_client)
+    _hubspot_client = _write_aggregator
+    # With fewer writes in flight, every job's batch waits out the full max wait
+    _pipeline_config = PipelineConfig(
+        crm_concurrency=max(SYNC_CRM_CONCURRENCY, _write_aggregator.batch_size)
+    )
+_matching_backends = {
+    "numpy": NumpyContactMatchingService,
+    "external": ExternalMergeMatchingService,
+    "sql": lambda: SqlContactMatchingService(uow_factory=SqlAlchemyUnitOfWork),
+    "snapshot": SnapshotContactMatchingService,
+}
+if MATCH_BACKEND in _matching_backends:
+    _matching_service = _matching_backends[MATCH_BACKEND]()
+else:
+    _matching_service = ContactMatchingService(
+        prefilter=(
+            _hubspot.get_match_filter if MATCH_PREFILTER_ENABLED and _hubspot else None
+        )
+    )
+_readiness_service: ReadinessService | None = None
 
 
 def get_crm_client() -> CrmClient:
@@ -14,6 +82,17 @@ def get_crm_client() -> CrmClient:
     return _hubspot_client
 
 
+def close_crm_client() -> None:
+    """
+    Flush CRM writes still queued in the aggregator, then close the HTTP
+    client's pooled connections; call once jobs are drained.
+    """
+    if _write_aggregator is not None:
+        _write_aggregator.close()
+    if _hubspot_http is not None:
+        _hubspot_http.close()
+
+
 def get_matching_service() -> ContactMatchingService:
     """Dependency that provides the ContactMatchingService."""
     return _matching_service
@@ -30,9 +109,30 @@ def get_push_service() -> PushService:
         uow=get_unit_of_work(),
         crm_client=get_crm_client(),
         matching_service=get_matching_service(),
+        pipeline_config=_pipeline_config,
     )
 
 
 def get_job_executor() -> JobExecutorService:
     """Dependency that provides the JobExecutorService."""
     return get_job_executor_service()
+
+
+def get_job_profiler() -> JobProfiler:
+    """Dependency that provides the profiler of push jobs."""
+    return get_job_executor_service().profiler
+
+
+def get_readiness_service() -> ReadinessService:
+    """Dependency that provides the ReadinessService."""
+    global _readiness_service
+    if _readiness_service is None:
+        _readiness_service = ReadinessService(
+            job_executor=get_job_executor_service(),
+            ping=ping,
+            pool_utilization=lambda: pool_utilization(engine.pool),
+            crm_headroom=(
+                (lambda: _crm_rate_limiter.headroom) if _crm_rate_limiter is not None else None
+            ),
+        )
+    return _readiness_service
@@ -1,31 +1,63 @@
-from app.domain.entities import HubSpotContact, HubSpotContactProperties, MatchResult, SyncResult
+from app.domain.entities import (
+    BloomFilter,
+    ContactGroup,
+    ContactIdMatchResult,
+    DeduplicationResult,
+    HubSpotContact,
+    HubSpotContactProperties,
+    JobTimings,
+    MatchKeyFilter,
+    MatchKeys,
+    MatchResult,
+    StageStats,
+    SyncResult,
+    make_name_key,
+    normalize_email,
+    normalize_linkedin_id,
+)
 from app.domain.exceptions import (
     DomainException,
     JobNotFoundError,
+    JobInterruptedError,
     ContactNotFoundError,
     HubSpotApiError,
 )
 from app.domain.interfaces import (
     CrmClient,
     ContactRepositoryInterface,
+    CrmContactRepositoryInterface,
     PushJobRepositoryInterface,
     UnitOfWork,
 )
 
 __all__ = [
     # Entities
+    "ContactGroup",
+    "ContactIdMatchResult",
+    "DeduplicationResult",
     "HubSpotContact",
     "HubSpotContactProperties",
+    "JobTimings",
     "MatchResult",
+    "StageStats",
     "SyncResult",
+    # Match keys
+    "BloomFilter",
+    "MatchKeyFilter",
+    "MatchKeys",
+    "make_name_key",
+    "normalize_email",
+    "normalize_linkedin_id",
     # Exceptions
     "DomainException",
     "JobNotFoundError",
+    "JobInterruptedError",
     "ContactNotFoundError",
     "HubSpotApiError",
     # Interfaces
     "CrmClient",
     "ContactRepositoryInterface",
+    "CrmContactRepositoryInterface",
     "PushJobRepositoryInterface",
     "UnitOfWork",
 ]
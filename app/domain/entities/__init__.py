@@ -1,10 +1,29 @@
+from app.domain.entities.deduplication import ContactGroup, DeduplicationResult
 from app.domain.entities.hubspot import HubSpotContact, HubSpotContactProperties
-from app.domain.entities.matching import MatchResult
-from app.domain.entities.sync import SyncResult
+from app.domain.entities.match_filter import BloomFilter, MatchKeyFilter
+from app.domain.entities.match_keys import (
+    MatchKeys,
+    make_name_key,
+    normalize_email,
+    normalize_linkedin_id,
+)
+from app.domain.entities.matching import ContactIdMatchResult, MatchResult
+from app.domain.entities.sync import JobTimings, StageStats, SyncResult
 
 __all__ = [
+    "BloomFilter",
+    "ContactGroup",
+    "ContactIdMatchResult",
+    "DeduplicationResult",
     "HubSpotContact",
     "HubSpotContactProperties",
+    "JobTimings",
+    "MatchKeyFilter",
+    "MatchKeys",
     "MatchResult",
+    "make_name_key",
+    "normalize_email",
+    "normalize_linkedin_id",
+    "StageStats",
     "SyncResult",
 ]
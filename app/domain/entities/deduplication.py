@@ -0,0 +1,33 @@
+from dataclasses import dataclass
+
+from app.schemas import ContactResponse
+
+
+@dataclass(frozen=True)
+class ContactGroup:
+    """Local contacts of one job that describe the same person."""
+
+    representative: ContactResponse
+    members: list[ContactResponse]
+
+    @property
+    def duplicate_count(self) -> int:
+        """Number of members collapsed into the representative."""
+        return len(self.members) - 1
+
+
+@dataclass(frozen=True)
+class DeduplicationResult:
+    """Result of grouping a job's contacts by match key."""
+
+    groups: list[ContactGroup]
+
+    @property
+    def representatives(self) -> list[ContactResponse]:
+        """One contact per group, carrying the merged data of its members."""
+        return [group.representative for group in self.groups]
+
+    @property
+    def duplicate_count(self) -> int:
+        """Total number of contacts collapsed into another one."""
+        return sum(group.duplicate_count for group in self.groups)
@@ -1,9 +1,9 @@
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HubSpotContactProperties:
-    """Properties of a HubSpot contact."""
+    """Properties of a HubSpot contact. Slotted: portals hold millions of them."""
 
     firstname: str | None = None
     lastname: str | None = None
@@ -13,7 +13,7 @@ class HubSpotContactProperties:
     company: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HubSpotContact:
     """Domain entity representing a HubSpot contact."""
 
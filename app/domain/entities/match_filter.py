@@ -0,0 +1,153 @@
+import math
+import struct
+from dataclasses import dataclass
+from hashlib import blake2b
+
+from app.domain.entities.match_keys import MatchKeys
+
+# Magic, bit count, hash count, capacity, items added
+_BLOOM_HEADER = struct.Struct("<4sQIQQ")
+_BLOOM_MAGIC = b"BLM1"
+
+# Key tiers, as MatchKeys attributes
+_TIERS = ("linkedin_id", "email", "name")
+
+
+class BloomFilter:
+    """
+    Bloom filter over strings: no false negatives, tunable false positives.
+
+    Bit positions come from an unkeyed blake2b digest with double hashing,
+    so a filter serialized with to_bytes gives the same answers in any
+    process.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(1, capacity)
+        self._bit_count = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self._hash_count = max(1, round(self._bit_count / capacity * math.log(2)))
+        self._bits = bytearray((self._bit_count + 7) // 8)
+        self.capacity = capacity
+        self.count = 0
+
+    def _positions(self, key: str) -> list[int]:
+        digest = blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * step) % self._bit_count for i in range(self._hash_count)]
+
+    def add(self, key: str) -> None:
+        """Add a key to the filter."""
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        """Whether the key may have been added. False is always right."""
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Estimated probability that a key never added is reported as present."""
+        fill_ratio = int.from_bytes(self._bits, "little").bit_count() / self._bit_count
+        return fill_ratio ** self._hash_count
+
+    @property
+    def saturated(self) -> bool:
+        """Whether more keys were added than the filter was sized for."""
+        return self.count > self.capacity
+
+    def to_bytes(self) -> bytes:
+        """Serialize the filter."""
+        header = _BLOOM_HEADER.pack(
+            _BLOOM_MAGIC, self._bit_count, self._hash_count, self.capacity, self.count
+        )
+        return header + bytes(self._bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BloomFilter":
+        """Deserialize a filter written by to_bytes."""
+        magic, bit_count, hash_count, capacity, count = _BLOOM_HEADER.unpack_from(data)
+        if magic != _BLOOM_MAGIC:
+            raise ValueError("Not a serialized BloomFilter")
+        bloom = cls.__new__(cls)
+        bloom._bit_count = bit_count
+        bloom._hash_count = hash_count
+        bloom._bits = bytearray(data[_BLOOM_HEADER.size:])
+        bloom.capacity = capacity
+        bloom.count = count
+        return bloom
+
+
+@dataclass
+class MatchKeyFilter:
+    """
+    One Bloom filter per match-key tier, over a set of CRM contacts.
+
+    A local contact none of whose keys is in the filters cannot match any
+    of those contacts.
+    """
+
+    linkedin_id: BloomFilter
+    email: BloomFilter
+    name: BloomFilter
+
+    @classmethod
+    def create(cls, capacity: int, error_rate: float = 0.01) -> "MatchKeyFilter":
+        """Create empty filters sized for capacity contacts."""
+        return cls(*(BloomFilter(capacity, error_rate) for _ in _TIERS))
+
+    def _filters(self) -> tuple[BloomFilter, ...]:
+        return (self.linkedin_id, self.email, self.name)
+
+    def add(self, keys: MatchKeys) -> None:
+        """Add the keys of a CRM contact."""
+        for bloom, name in zip(self._filters(), _TIERS):
+            key = getattr(keys, name)
+            if key:
+                bloom.add(key)
+
+    def might_match(self, keys: MatchKeys) -> bool:
+        """Whether a contact with these keys may match. False is always right."""
+        return any(
+            key and key in bloom
+            for bloom, key in zip(self._filters(), (getattr(keys, name) for name in _TIERS))
+        )
+
+    @property
+    def false_positive_rates(self) -> dict[str, float]:
+        """Estimated false-positive rate of each tier's filter."""
+        return {name: bloom.false_positive_rate for bloom, name in zip(self._filters(), _TIERS)}
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Estimated false-positive rate for a contact having all three keys."""
+        miss = 1.0
+        for rate in self.false_positive_rates.values():
+            miss *= 1 - rate
+        return 1 - miss
+
+    @property
+    def saturated(self) -> bool:
+        """Whether any tier holds more keys than it was sized for."""
+        return any(bloom.saturated for bloom in self._filters())
+
+    def to_bytes(self) -> bytes:
+        """Serialize the filters, each prefixed by its length."""
+        parts = [bloom.to_bytes() for bloom in self._filters()]
+        return b"".join(struct.pack("<Q", len(part)) + part for part in parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "MatchKeyFilter":
+        """Deserialize filters written by to_bytes."""
+        filters = []
+        offset = 0
+        for _ in _TIERS:
+            (length,) = struct.unpack_from("<Q", data, offset)
+            offset += 8
+            filters.append(BloomFilter.from_bytes(data[offset:offset + length]))
+            offset += length
+        return cls(*filters)
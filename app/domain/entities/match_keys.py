@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+
+from app.domain.entities.hubspot import HubSpotContact
+from app.schemas import ContactResponse
+
+
+def normalize_email(email: str | None) -> str | None:
+    """Normalize an email for matching: trimmed and lowercased."""
+    if not email or not email.strip():
+        return None
+    return email.strip().lower()
+
+
+def normalize_linkedin_id(linkedin_id: str | None) -> str | None:
+    """Normalize a LinkedIn ID for matching: trimmed and lowercased."""
+    if not linkedin_id or not linkedin_id.strip():
+        return None
+    return linkedin_id.strip().lower()
+
+
+def make_name_key(first_name: str | None, last_name: str | None) -> str | None:
+    """Build a name key for matching, only when both names are present."""
+    if not first_name or not last_name:
+        return None
+    return f"{first_name.strip().lower()}|{last_name.strip().lower()}"
+
+
+@dataclass(frozen=True)
+class MatchKeys:
+    """Normalized keys used to match a contact, in priority order."""
+
+    linkedin_id: str | None = None
+    email: str | None = None
+    name: str | None = None
+
+    @classmethod
+    def of_contact(cls, contact: ContactResponse) -> "MatchKeys":
+        """Keys of a local contact, using the stored normalized columns when set."""
+        return cls(
+            linkedin_id=contact.linkedin_norm or normalize_linkedin_id(contact.linkedin_id),
+            email=contact.email_norm or normalize_email(contact.email),
+            name=contact.name_key or make_name_key(contact.first_name, contact.last_name),
+        )
+
+    @classmethod
+    def of_hubspot(cls, hubspot_contact: HubSpotContact) -> "MatchKeys":
+        """Keys of a HubSpot contact."""
+        props = hubspot_contact.properties
+        return cls(
+            linkedin_id=normalize_linkedin_id(props.linkedin_id),
+            email=normalize_email(props.email),
+            name=make_name_key(props.firstname, props.lastname),
+        )
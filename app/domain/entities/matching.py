@@ -10,3 +10,12 @@ class MatchResult:
 
     matched: list[tuple[ContactResponse, HubSpotContact]]
     unmatched: list[ContactResponse]
+
+
+@dataclass(frozen=True)
+class ContactIdMatchResult:
+    """Result of a matching operation performed by the database, as IDs."""
+
+    # (local contact ID, HubSpot contact ID)
+    matched: list[tuple[int, str]]
+    unmatched: list[int]
@@ -1,4 +1,49 @@
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
+
+
+@dataclass(frozen=True)
+class StageStats:
+    """Throughput statistics of one sync pipeline stage."""
+
+    name: str
+    items: int
+    busy_seconds: float
+    wall_seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """Items processed per second of busy time."""
+        if self.busy_seconds <= 0:
+            return 0.0
+        return self.items / self.busy_seconds
+
+
+@dataclass(frozen=True)
+class JobTimings:
+    """
+    Where the time of one run of a push job went.
+
+    Phase times are busy times: the match, CRM write and persist phases
+    overlap in the sync pipeline, so they can add up to more than the total.
+    """
+
+    fetch_seconds: float = 0.0
+    match_seconds: float = 0.0
+    update_seconds: float = 0.0
+    create_seconds: float = 0.0
+    persist_seconds: float = 0.0
+    total_seconds: float = 0.0
+    crm_calls: int = 0
+    db_statements: int = 0
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "JobTimings":
+        """Create JobTimings from a dictionary, ignoring unknown keys."""
+        return cls(**{key: value for key, value in data.items() if key in cls.__dataclass_fields__})
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary format."""
+        return asdict(self)
 
 
 @dataclass(frozen=True)
@@ -7,3 +52,6 @@ class SyncResult:
 
     created_count: int
     updated_count: int
+    duplicate_count: int = 0
+    stages: tuple[StageStats, ...] = ()
+    timings: JobTimings | None = None
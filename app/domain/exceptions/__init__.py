@@ -1,11 +1,12 @@
 from app.domain.exceptions.base import DomainException
-from app.domain.exceptions.job import JobNotFoundError
+from app.domain.exceptions.job import JobInterruptedError, JobNotFoundError
 from app.domain.exceptions.contact import ContactNotFoundError
 from app.domain.exceptions.hubspot import HubSpotApiError
 
 __all__ = [
     "DomainException",
     "JobNotFoundError",
+    "JobInterruptedError",
     "ContactNotFoundError",
     "HubSpotApiError",
 ]
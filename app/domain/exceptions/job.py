@@ -7,3 +7,20 @@ class JobNotFoundError(DomainException):
     def __init__(self, job_id: int):
         self.job_id = job_id
         super().__init__(f"Job with id '{job_id}' not found")
+
+
+class JobInterruptedError(DomainException):
+    """Raised when a job stops early at a checkpoint, e.g. during shutdown."""
+
+    def __init__(
+        self,
+        job_id: int,
+        created_count: int = 0,
+        updated_count: int = 0,
+        duplicate_count: int = 0,
+    ):
+        self.job_id = job_id
+        self.created_count = created_count
+        self.updated_count = updated_count
+        self.duplicate_count = duplicate_count
+        super().__init__(f"Job with id '{job_id}' was interrupted")
@@ -15,6 +15,16 @@ class CrmClient(Protocol):
         """Retrieve all contacts from the CRM."""
         ...
 
+    def get_contacts_page(
+        self, after: str | None = None
+    ) -> tuple[list[HubSpotContact], str | None]:
+        """Retrieve one page of contacts in one call, with the cursor of the next page if any."""
+        ...
+
+    def get_contacts_by_ids(self, contact_ids: list[str]) -> list[HubSpotContact]:
+        """Retrieve several contacts by ID in one call, skipping unknown IDs."""
+        ...
+
     def create_contact(self, contact_data: dict) -> HubSpotContact:
         """Create a new contact in the CRM."""
         ...
@@ -22,3 +32,13 @@ class CrmClient(Protocol):
     def update_contact(self, contact_id: str, contact_data: dict) -> HubSpotContact:
         """Update an existing contact in the CRM."""
         ...
+
+    def batch_create_contacts(self, contacts_data: list[dict]) -> list[HubSpotContact]:
+        """Create several contacts in one CRM call, in input order."""
+        ...
+
+    def batch_update_contacts(
+        self, updates: list[tuple[str, dict]]
+    ) -> list[HubSpotContact]:
+        """Update several contacts in one CRM call, in input order."""
+        ...
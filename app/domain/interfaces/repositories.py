@@ -1,5 +1,6 @@
 from typing import Protocol
 
+from app.domain.entities import ContactIdMatchResult, HubSpotContact
 from app.schemas import ContactCreate, ContactResponse, ContactUpdate
 from app.schemas import PushJobCreate, PushJobResponse, PushJobUpdate
 
@@ -15,6 +16,15 @@ class ContactRepositoryInterface(Protocol):
         """Get all contacts for a specific job."""
         ...
 
+    def get_latest_synced_by_keys(
+        self,
+        emails: list[str],
+        linkedin_ids: list[str],
+        exclude_job_id: int | None = None,
+    ) -> list[ContactResponse]:
+        """Get the latest earlier synced contact of each email and LinkedIn ID, most recent first."""
+        ...
+
     def create(self, schema: ContactCreate) -> ContactResponse:
         """Create a new contact."""
         ...
@@ -42,6 +52,28 @@ class ContactRepositoryInterface(Protocol):
         ...
 
 
+class CrmContactRepositoryInterface(Protocol):
+    """Interface for the local mirror of CRM contacts."""
+
+    def upsert_many(self, hubspot_contacts: list[HubSpotContact]) -> None:
+        """Insert or update mirrored contacts, keyed by HubSpot ID."""
+        ...
+
+    def get_by_hubspot_ids(self, hubspot_ids: list[str]) -> list[HubSpotContact]:
+        """Get mirrored contacts by HubSpot ID, skipping unknown IDs."""
+        ...
+
+    def delete_missing(self, hubspot_ids: set[str]) -> int:
+        """Delete mirrored contacts whose HubSpot ID is not given, returning how many."""
+        ...
+
+    def match_job_contacts(
+        self, job_id: int, contact_ids: list[int] | None = None
+    ) -> ContactIdMatchResult:
+        """Match a job's contacts against the mirror, returning IDs."""
+        ...
+
+
 class PushJobRepositoryInterface(Protocol):
     """Interface for push job repository implementations."""
 
@@ -57,15 +89,34 @@ class PushJobRepositoryInterface(Protocol):
         """Create a new pending job."""
         ...
 
+    def get_pending_jobs(self) -> list[PushJobResponse]:
+        """Get all pending jobs."""
+        ...
+
     def mark_as_completed(
         self,
         job_id: int,
         created_count: int = 0,
         updated_count: int = 0,
+        duplicate_count: int = 0,
     ) -> PushJobResponse | None:
         """Mark a job as completed with counts."""
         ...
 
+    def save_progress(
+        self,
+        job_id: int,
+        created_count: int = 0,
+        updated_count: int = 0,
+        duplicate_count: int = 0,
+    ) -> PushJobResponse | None:
+        """Record partial counts for a job that stays pending to be resumed."""
+        ...
+
     def mark_as_failed(self, job_id: int, error: str) -> PushJobResponse | None:
         """Mark a job as failed with error message."""
         ...
+
+    def save_timings(self, job_id: int, timings: dict) -> None:
+        """Record the phase timings of the last run of a job."""
+        ...
@@ -2,6 +2,7 @@ from typing import Protocol
 
 from app.domain.interfaces.repositories import (
     ContactRepositoryInterface,
+    CrmContactRepositoryInterface,
     PushJobRepositoryInterface,
 )
 
@@ -24,6 +25,12 @@ class UnitOfWork(Protocol):
 
     push_jobs: PushJobRepositoryInterface
     contacts: ContactRepositoryInterface
+    crm_contacts: CrmContactRepositoryInterface
+
+    @property
+    def statement_count(self) -> int:
+        """Database statements run by the current, or last, transaction."""
+        ...
 
     def __enter__(self) -> "UnitOfWork":
         """Enter the context manager."""
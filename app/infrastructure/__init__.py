@@ -1,8 +1,36 @@
+from app.infrastructure.database import (
+    QueryStatsMiddleware,
+    assert_max_queries,
+    ping,
+    pool_utilization,
+    report_queries,
+    track_queries,
+)
 from app.infrastructure.database.connection import Session, engine
-from app.infrastructure.database.models import Base, Contact, PushJob
+from app.infrastructure.database.models import Base, Contact, CrmContact, PushJob
 from app.infrastructure.database.unit_of_work import SqlAlchemyUnitOfWork
+from app.infrastructure.external.batching_crm_client import BatchingCrmClient
 from app.infrastructure.external.hubspot_client import HubSpotClient
-from app.infrastructure.task.async_executor import AsyncTaskExecutor
+from app.infrastructure.external.hubspot_http_client import HubSpotHttpClient
+from app.infrastructure.external.instrumented_crm_client import InstrumentedCrmClient
+from app.infrastructure.external.rate_limiter import TokenBucket
+from app.infrastructure.index.match_index_snapshot import MatchIndexSnapshot
+from app.infrastructure.metrics import REGISTRY, HttpMetricsMiddleware
+from app.infrastructure.task import (
+    AsyncTaskExecutor,
+    BlockingCallError,
+    BlockingCallGuardMiddleware,
+    EventLoopWatchdog,
+    ExecutorShutdownError,
+    install_blocking_guard,
+    uninstall_blocking_guard,
+)
+from app.infrastructure.tracing import (
+    FileSpanExporter,
+    InMemorySpanExporter,
+    get_tracer,
+    set_span_exporter,
+)
 
 __all__ = [
     # Database
@@ -10,10 +38,37 @@ __all__ = [
     "engine",
     "Base",
     "Contact",
+    "CrmContact",
     "PushJob",
     "SqlAlchemyUnitOfWork",
+    "QueryStatsMiddleware",
+    "assert_max_queries",
+    "ping",
+    "pool_utilization",
+    "report_queries",
+    "track_queries",
     # External
+    "BatchingCrmClient",
     "HubSpotClient",
+    "HubSpotHttpClient",
+    "InstrumentedCrmClient",
+    "TokenBucket",
+    # Index
+    "MatchIndexSnapshot",
+    # Metrics
+    "REGISTRY",
+    "HttpMetricsMiddleware",
     # Task
     "AsyncTaskExecutor",
+    "BlockingCallError",
+    "BlockingCallGuardMiddleware",
+    "EventLoopWatchdog",
+    "ExecutorShutdownError",
+    "install_blocking_guard",
+    "uninstall_blocking_guard",
+    # Tracing
+    "FileSpanExporter",
+    "InMemorySpanExporter",
+    "get_tracer",
+    "set_span_exporter",
 ]
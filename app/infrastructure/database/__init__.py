@@ -1,5 +1,13 @@
 from app.infrastructure.database.connection import Session, engine
-from app.infrastructure.database.models import Base, Contact, PushJob
+from app.infrastructure.database.health import ping, pool_utilization
+from app.infrastructure.database.middleware import QueryStatsMiddleware
+from app.infrastructure.database.models import Base, Contact, CrmContact, PushJob
+from app.infrastructure.database.query_stats import (
+    QueryStats,
+    assert_max_queries,
+    report_queries,
+    track_queries,
+)
 from app.infrastructure.database.unit_of_work import SqlAlchemyUnitOfWork
 
 __all__ = [
@@ -7,6 +15,14 @@ __all__ = [
     "engine",
     "Base",
     "Contact",
+    "CrmContact",
     "PushJob",
+    "QueryStats",
+    "QueryStatsMiddleware",
     "SqlAlchemyUnitOfWork",
+    "assert_max_queries",
+    "ping",
+    "pool_utilization",
+    "report_queries",
+    "track_queries",
 ]
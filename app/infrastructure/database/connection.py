@@ -3,12 +3,26 @@ import os
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from app.infrastructure.database import query_tracing  # noqa: F401  (registers query spans)
+from app.infrastructure.database.pool import InstrumentedQueuePool, bind_pool_gauges
+
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./crm.db")
 
+# Pool with checkout metrics; in-memory SQLite keeps its default single-connection pool
+_pool_options = (
+    {} if DATABASE_URL in ("sqlite://", "sqlite:///:memory:")
+    else {"poolclass": InstrumentedQueuePool}
+)
+
 # Handle SQLite specific settings
 if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+    engine = create_engine(
+        DATABASE_URL, connect_args={"check_same_thread": False}, **_pool_options
+    )
 else:
-    engine = create_engine(DATABASE_URL)
+    engine = create_engine(DATABASE_URL, **_pool_options)
+
+if isinstance(engine.pool, InstrumentedQueuePool):
+    bind_pool_gauges(engine.pool)
 
 Session = sessionmaker(bind=engine)
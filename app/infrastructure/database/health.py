@@ -0,0 +1,27 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool, QueuePool
+
+from app.infrastructure.database.connection import engine as default_engine
+
+
+def ping(engine: Engine = default_engine) -> None:
+    """Run a trivial statement on a pooled connection; raises if the database is unreachable."""
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+def pool_utilization(pool: Pool) -> float | None:
+    """
+    Share of the pool's connections checked out, overflow included.
+
+    None for pools without a fixed capacity, such as the single
+    connection of in-memory SQLite or a QueuePool with unlimited overflow.
+    """
+    if not isinstance(pool, QueuePool):
+        return None
+    # QueuePool has no public accessor for its overflow limit
+    max_overflow = pool._max_overflow
+    if max_overflow < 0:
+        return None
+    return pool.checkedout() / (pool.size() + max_overflow)
@@ -0,0 +1,25 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.infrastructure.database.query_stats import report_queries, track_queries
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware counting the SQL statements and database time of every
+    HTTP request, and logging statement shapes it repeats (likely N+1s).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                route = getattr(scope.get("route"), "path", scope["path"])
+                report_queries(stats, "http", f"{scope['method']} {route}")
@@ -1,9 +1,11 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, event
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from sqlalchemy.sql import func
 
+from app.domain import make_name_key, normalize_email, normalize_linkedin_id
+
 
 class Base(DeclarativeBase):
     pass
@@ -11,10 +13,13 @@ class Base(DeclarativeBase):
 
 class Contact(Base):
     __tablename__ = "contacts"
+    __table_args__ = (
+        Index("ix_contacts_job_id_status", "job_id", "status"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    job_id: Mapped[int] = mapped_column(ForeignKey("push_jobs.id"))
-    hubspot_id: Mapped[str | None] = mapped_column()
+    job_id: Mapped[int] = mapped_column(ForeignKey("push_jobs.id"), index=True)
+    hubspot_id: Mapped[str | None] = mapped_column(index=True)
     status: Mapped[str | None] = mapped_column(
         default="pending"
     )  # pending, completed, failed
@@ -24,6 +29,10 @@ class Contact(Base):
     linkedin_id: Mapped[str | None] = mapped_column(index=True)
     phone: Mapped[str | None] = mapped_column()
     company: Mapped[str | None] = mapped_column()
+    # Normalized match keys, kept in sync with the raw columns on every write
+    email_norm: Mapped[str | None] = mapped_column(index=True)
+    linkedin_norm: Mapped[str | None] = mapped_column(index=True)
+    name_key: Mapped[str | None] = mapped_column(index=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -31,10 +40,63 @@ class Contact(Base):
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
+    def fill_match_keys(self) -> None:
+        """Compute the normalized match keys from the raw columns."""
+        self.email_norm = normalize_email(self.email)
+        self.linkedin_norm = normalize_linkedin_id(self.linkedin_id)
+        self.name_key = make_name_key(self.first_name, self.last_name)
+
     def __repr__(self) -> str:
         return f"Contact(id={self.id}, hubspot_id={self.hubspot_id}, first_name={self.first_name}, last_name={self.last_name}, email={self.email}, linkedin_id={self.linkedin_id}, phone={self.phone}, company={self.company})"
 
 
+@event.listens_for(Contact, "before_insert")
+@event.listens_for(Contact, "before_update")
+def _fill_contact_match_keys(mapper, connection, target: Contact) -> None:
+    target.fill_match_keys()
+
+
+class CrmContact(Base):
+    """
+    Local mirror of a CRM contact, used to match contacts in SQL.
+
+    Rows are kept in the order the CRM lists its contacts: when several CRM
+    contacts share a match key, the one with the lowest id wins.
+    """
+
+    __tablename__ = "crm_contacts"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    hubspot_id: Mapped[str] = mapped_column(unique=True)
+    firstname: Mapped[str | None] = mapped_column()
+    lastname: Mapped[str | None] = mapped_column()
+    email: Mapped[str | None] = mapped_column()
+    linkedin_id: Mapped[str | None] = mapped_column()
+    phone: Mapped[str | None] = mapped_column()
+    company: Mapped[str | None] = mapped_column()
+    email_norm: Mapped[str | None] = mapped_column(index=True)
+    linkedin_norm: Mapped[str | None] = mapped_column(index=True)
+    name_key: Mapped[str | None] = mapped_column(index=True)
+    synced_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    def fill_match_keys(self) -> None:
+        """Compute the normalized match keys from the raw columns."""
+        self.email_norm = normalize_email(self.email)
+        self.linkedin_norm = normalize_linkedin_id(self.linkedin_id)
+        self.name_key = make_name_key(self.firstname, self.lastname)
+
+    def __repr__(self) -> str:
+        return f"CrmContact(id={self.id}, hubspot_id={self.hubspot_id}, email={self.email}, linkedin_id={self.linkedin_id})"
+
+
+@event.listens_for(CrmContact, "before_insert")
+@event.listens_for(CrmContact, "before_update")
+def _fill_crm_contact_match_keys(mapper, connection, target: CrmContact) -> None:
+    target.fill_match_keys()
+
+
 class PushJob(Base):
     __tablename__ = "push_jobs"
 
@@ -45,6 +107,9 @@ class PushJob(Base):
     error: Mapped[str | None] = mapped_column()
     created_count: Mapped[int | None] = mapped_column(default=0)
     updated_count: Mapped[int | None] = mapped_column(default=0)
+    duplicate_count: Mapped[int | None] = mapped_column(default=0)
+    # Phase timings and call counts of the last run, see JobTimings
+    timings: Mapped[dict | None] = mapped_column(JSON)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -0,0 +1,29 @@
+import time
+
+from sqlalchemy.pool import QueuePool
+
+from app.infrastructure.metrics.instruments import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_CHECKOUTS,
+    DB_POOL_OVERFLOW,
+    DB_POOL_SIZE,
+)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool counting checkouts and timing the wait for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        connection = super()._do_get()
+        DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+        DB_POOL_CHECKOUTS.inc()
+        return connection
+
+
+def bind_pool_gauges(pool: QueuePool) -> None:
+    """Report the occupancy of a pool on the db_pool_* gauges."""
+    DB_POOL_CHECKED_OUT.set_function(pool.checkedout)
+    DB_POOL_SIZE.set_function(pool.size)
+    DB_POOL_OVERFLOW.set_function(pool.overflow)
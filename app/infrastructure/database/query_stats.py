@@ -0,0 +1,129 @@
+"""
+Count the SQL statements run within a scope, and the time they took.
+
+Listeners on every engine add each statement to the scopes active in the
+calling thread (or task); scopes nest. Outside any scope a statement costs
+one context variable lookup.
+
+Statements are also counted by shape, their text with placeholder lists
+collapsed: a shape repeated many times within one request or job usually
+is a query run per row, an N+1.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.infrastructure.metrics.instruments import DB_SCOPE_SECONDS, DB_SCOPE_STATEMENTS
+
+logger = logging.getLogger(__name__)
+
+# Runs of one statement shape within a request or job logged as a likely N+1
+DB_REPEATED_STATEMENT_THRESHOLD = int(os.getenv("DB_REPEATED_STATEMENT_THRESHOLD", "20"))
+
+# A parenthesized list of bind parameters, in any paramstyle
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|:\w+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)")
+# Rows of a multi-row VALUES clause, once their placeholders are collapsed
+_ROW_LIST = re.compile(r"\(\?\.\.\.\)(?:, \(\?\.\.\.\))+")
+
+
+@lru_cache(maxsize=4096)
+def statement_shape(statement: str) -> str:
+    """The statement with whitespace normalized and every IN list or VALUES row as (?...)."""
+    shape = _PLACEHOLDER_LIST.sub("(?...)", " ".join(statement.split()))
+    return _ROW_LIST.sub("(?...), ...", shape)
+
+
+@dataclass
+class QueryStats:
+    """SQL statements run within a scope, their total duration and their shapes."""
+
+    statements: int = 0
+    seconds: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+    # Threads started in a copy of the context share the scopes of their parent
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, shape: str, seconds: float) -> None:
+        with self._lock:
+            self.statements += 1
+            self.seconds += seconds
+            self.shapes[shape] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Shapes run at least threshold times, most frequent first."""
+        with self._lock:
+            return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+_scopes: ContextVar[tuple[QueryStats, ...]] = ContextVar("query_stats_scopes", default=())
+
+
+@contextmanager
+def track_queries(inherit: bool = True) -> Iterator[QueryStats]:
+    """
+    Count the statements run by the current thread until the block exits.
+
+    Args:
+        inherit: Also count them in the enclosing scopes. Background jobs
+            pass False, so the request that scheduled them does not count
+            their statements.
+    """
+    stats = QueryStats()
+    token = _scopes.set((_scopes.get() if inherit else ()) + (stats,))
+    try:
+        yield stats
+    finally:
+        _scopes.reset(token)
+
+
+def report_queries(stats: QueryStats, scope: str, label: str) -> None:
+    """
+    Observe the statements of a request or job on the db_scope_* metrics,
+    and log the shapes it repeated DB_REPEATED_STATEMENT_THRESHOLD times or more.
+    """
+    DB_SCOPE_STATEMENTS.labels(scope).observe(stats.statements)
+    DB_SCOPE_SECONDS.labels(scope).observe(stats.seconds)
+    for shape, count in stats.repeated(DB_REPEATED_STATEMENT_THRESHOLD):
+        logger.warning("%s ran %d times, a likely N+1: %s", label, count, shape)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """Test helper: fail if the block runs more than limit statements, listing them by shape."""
+    with track_queries() as stats:
+        yield stats
+    if stats.statements > limit:
+        shapes = "\n".join(f"  {count} x {shape}" for shape, count in stats.shapes.most_common())
+        raise AssertionError(
+            f"{stats.statements} statements run, at most {limit} expected:\n{shapes}"
+        )
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _scopes.get():
+        context._query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    shape = statement_shape(statement)
+    for stats in _scopes.get():
+        stats.record(shape, elapsed)
@@ -0,0 +1,48 @@
+"""
+A span for every SQL statement, child of the span that ran it.
+
+Listeners on every engine; while tracing is off they only check that no
+span was started.
+"""
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.infrastructure.tracing import get_tracer
+
+_tracer = get_tracer(__name__)
+
+# Longest statement text kept on a span
+_MAX_STATEMENT_LENGTH = 2000
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_span(conn, cursor, statement, parameters, context, executemany) -> None:
+    span = _tracer.start_span("db.query")
+    if not span.is_recording():
+        return
+    operation = statement.split(None, 1)[0].upper() if statement else ""
+    span.name = f"db.{operation.lower()}"
+    span.set_attributes({
+        "db.system": conn.dialect.name,
+        "db.operation": operation,
+        "db.statement": statement[:_MAX_STATEMENT_LENGTH],
+        "db.executemany": executemany,
+    })
+    context._trace_span = span
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_query_span(conn, cursor, statement, parameters, context, executemany) -> None:
+    span = getattr(context, "_trace_span", None)
+    if span is not None:
+        span.end()
+
+
+@event.listens_for(Engine, "handle_error")
+def _fail_query_span(exception_context) -> None:
+    span = getattr(exception_context.execution_context, "_trace_span", None)
+    if span is not None:
+        span.record_exception(exception_context.original_exception)
+        span.set_status("ERROR", str(exception_context.original_exception))
+        span.end()
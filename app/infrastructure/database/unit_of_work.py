@@ -1,6 +1,9 @@
+from contextlib import ExitStack
+
 from sqlalchemy.orm import Session
 
 from app.infrastructure.database.connection import Session as SessionFactory
+from app.infrastructure.database.query_stats import QueryStats, track_queries
 
 
 class SqlAlchemyUnitOfWork:
@@ -14,6 +17,9 @@ class SqlAlchemyUnitOfWork:
     def __init__(self, session_factory: type[Session] = SessionFactory):
         self._session_factory = session_factory
         self._session: Session | None = None
+        # Closes the session, then the query scope, when the transaction ends
+        self._exit_stack: ExitStack | None = None
+        self._query_stats = QueryStats()
 
     @property
     def push_jobs(self):
@@ -35,9 +41,29 @@ class SqlAlchemyUnitOfWork:
             raise RuntimeError("UnitOfWork not started. Use 'with' statement.")
         return ContactRepository(self._session)
 
+    @property
+    def crm_contacts(self):
+        """Access to the CRM contact mirror repository."""
+        # Import here to avoid circular imports
+        from app.repositories import CrmContactRepository
+
+        if self._session is None:
+            raise RuntimeError("UnitOfWork not started. Use 'with' statement.")
+        return CrmContactRepository(self._session)
+
+    @property
+    def statement_count(self) -> int:
+        """SQL statements run by the current, or last, transaction."""
+        return self._query_stats.statements
+
     def __enter__(self) -> "SqlAlchemyUnitOfWork":
         """Start a new transaction."""
-        self._session = self._session_factory()
+        with ExitStack() as stack:
+            self._query_stats = stack.enter_context(track_queries())
+            session = self._session_factory()
+            stack.callback(session.close)
+            self._exit_stack = stack.pop_all()
+        self._session = session
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
@@ -51,5 +77,6 @@ class SqlAlchemyUnitOfWork:
             else:
                 self._session.rollback()
         finally:
-            self._session.close()
             self._session = None
+            exit_stack, self._exit_stack = self._exit_stack, None
+            exit_stack.close()
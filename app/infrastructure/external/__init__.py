@@ -1,3 +1,13 @@
+from app.infrastructure.external.batching_crm_client import BatchingCrmClient
 from app.infrastructure.external.hubspot_client import HubSpotClient
+from app.infrastructure.external.hubspot_http_client import HubSpotHttpClient
+from app.infrastructure.external.instrumented_crm_client import InstrumentedCrmClient
+from app.infrastructure.external.rate_limiter import TokenBucket
 
-__all__ = ["HubSpotClient"]
+__all__ = [
+    "BatchingCrmClient",
+    "HubSpotClient",
+    "HubSpotHttpClient",
+    "InstrumentedCrmClient",
+    "TokenBucket",
+]
@@ -0,0 +1,267 @@
+"""
+Process-wide CRM write aggregator.
+
+Collects create and update requests from every running job and sends them
+to the underlying CRM client as full batches.
+
+This implementation conforms to the CrmClient protocol defined in the domain layer.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+from app.domain import CrmClient, HubSpotApiError, HubSpotContact
+
+# Records per batch call; a full batch is flushed immediately
+CRM_BATCH_SIZE = int(os.getenv("CRM_BATCH_SIZE", "100"))
+# Maximum time a request waits for its batch to fill up
+CRM_BATCH_MAX_WAIT_MS = float(os.getenv("CRM_BATCH_MAX_WAIT_MS", "200"))
+
+
+@dataclass(eq=False)
+class _PendingWrite:
+    """A create or update waiting to be sent in the next batch."""
+
+    contact_data: dict
+    contact_id: str | None = None
+    future: Future = field(default_factory=Future)
+    queued_at: float = field(default_factory=time.monotonic)
+    # Callers whose update to the same contact was merged into this one
+    coalesced: list[Future] = field(default_factory=list)
+
+    def set_result(self, contact: HubSpotContact) -> None:
+        for future in (self.future, *self.coalesced):
+            future.set_result(contact)
+
+    def set_exception(self, exc: BaseException) -> None:
+        for future in (self.future, *self.coalesced):
+            future.set_exception(exc)
+
+
+def _combine_contact_data(earlier: dict, later: dict) -> dict:
+    """
+    Combine two updates of one contact in order: later non-empty values win.
+
+    Only correct for the callers' own values, not data already merged with a
+    CRM snapshot, whose stale values would override an earlier caller's.
+    """
+    return {
+        key: later.get(key) or earlier.get(key)
+        for key in {**earlier, **later}
+    }
+
+
+class BatchingCrmClient:
+    """
+    CRM client that batches writes across all concurrent callers.
+
+    Each call to create_contact or update_contact is queued and the calling
+    thread waits for its own result. A background thread flushes queued
+    creates and updates when batch_size records are waiting, or when the
+    oldest one has waited max_wait_ms. Results and errors are routed back to
+    the caller that submitted each record.
+
+    Updates to a HubSpot contact that already has an update queued are
+    coalesced into it: the data is combined in submission order, with
+    non-empty values from the latest update winning, and written once. The
+    CRM keeps its current value for fields no caller set, so update data
+    must only hold the caller's own values. Every contributing caller
+    receives the resulting contact. Since batches are
+    flushed one at a time, updates to one contact are never sent concurrently.
+
+    Implements the CrmClient protocol for dependency inversion.
+    """
+
+    def __init__(
+        self,
+        crm_client: CrmClient,
+        batch_size: int = CRM_BATCH_SIZE,
+        max_wait_ms: float = CRM_BATCH_MAX_WAIT_MS,
+    ):
+        self._client = crm_client
+        self._batch_size = batch_size
+        self._max_wait = max_wait_ms / 1000
+        self._condition = threading.Condition()
+        self._creates: list[_PendingWrite] = []
+        self._updates: list[_PendingWrite] = []
+        self._updates_by_id: dict[str, _PendingWrite] = {}
+        self._closed = False
+        self._flusher: threading.Thread | None = None
+        self.coalesced_updates = 0
+
+    @property
+    def batch_size(self) -> int:
+        """Records per batch call; callers need this many writes in flight to fill one."""
+        return self._batch_size
+
+    def get_all_contacts(self) -> list[HubSpotContact]:
+        """Retrieve all contacts from the CRM."""
+        return self._client.get_all_contacts()
+
+    def get_contacts_page(
+        self, after: str | None = None
+    ) -> tuple[list[HubSpotContact], str | None]:
+        """Retrieve one page of contacts in one call."""
+        return self._client.get_contacts_page(after)
+
+    def get_contacts_by_ids(self, contact_ids: list[str]) -> list[HubSpotContact]:
+        """Retrieve several contacts by ID in one call."""
+        return self._client.get_contacts_by_ids(contact_ids)
+
+    def create_contact(self, contact_data: dict) -> HubSpotContact:
+        """Create a contact as part of the next batch and wait for it."""
+        return self.submit_create(contact_data).result()
+
+    def update_contact(self, contact_id: str, contact_data: dict) -> HubSpotContact:
+        """Update a contact as part of the next batch and wait for it."""
+        return self.submit_update(contact_id, contact_data).result()
+
+    def batch_create_contacts(self, contacts_data: list[dict]) -> list[HubSpotContact]:
+        """Queue several creates and wait for all of them."""
+        futures = [self.submit_create(contact_data) for contact_data in contacts_data]
+        return [future.result() for future in futures]
+
+    def batch_update_contacts(
+        self, updates: list[tuple[str, dict]]
+    ) -> list[HubSpotContact]:
+        """Queue several updates and wait for all of them."""
+        futures = [
+            self.submit_update(contact_id, contact_data)
+            for contact_id, contact_data in updates
+        ]
+        return [future.result() for future in futures]
+
+    def submit_create(self, contact_data: dict) -> Future:
+        """Queue a create and return a future for the created contact."""
+        return self._submit(self._creates, _PendingWrite(contact_data=contact_data))
+
+    def submit_update(self, contact_id: str, contact_data: dict) -> Future:
+        """Queue an update and return a future for the updated contact."""
+        with self._condition:
+            queued = self._updates_by_id.get(contact_id)
+            if queued is not None and not self._closed:
+                future: Future = Future()
+                queued.contact_data = _combine_contact_data(queued.contact_data, contact_data)
+                queued.coalesced.append(future)
+                self.coalesced_updates += 1
+                return future
+
+            write = _PendingWrite(contact_data=contact_data, contact_id=contact_id)
+            self._updates_by_id[contact_id] = write
+            try:
+                return self._submit(self._updates, write)
+            except RuntimeError:
+                del self._updates_by_id[contact_id]
+                raise
+
+    def close(self) -> None:
+        """Flush everything still queued and stop the background thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            flusher = self._flusher
+        if flusher is not None:
+            flusher.join()
+
+    def _submit(self, pending: list[_PendingWrite], write: _PendingWrite) -> Future:
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("BatchingCrmClient is closed")
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._run, name="crm-batch-flusher", daemon=True
+                )
+                self._flusher.start()
+            pending.append(write)
+            self._condition.notify_all()
+        return write.future
+
+    def _run(self) -> None:
+        """Background loop flushing batches on size or age."""
+        while True:
+            with self._condition:
+                while not self._closed and not self._due():
+                    self._condition.wait(timeout=self._time_to_deadline())
+                creates = self._take(self._creates)
+                updates = self._take(self._updates)
+                for write in updates:
+                    del self._updates_by_id[write.contact_id]
+                done = self._closed and not self._creates and not self._updates
+
+            if creates:
+                self._flush_creates(creates)
+            if updates:
+                self._flush_updates(updates)
+            if done:
+                return
+
+    def _due(self) -> bool:
+        """Whether a batch is full or the oldest queued write waited long enough."""
+        if len(self._creates) >= self._batch_size or len(self._updates) >= self._batch_size:
+            return True
+        return self._time_to_deadline() == 0
+
+    def _time_to_deadline(self) -> float | None:
+        """Seconds until the oldest queued write must be flushed, None if idle."""
+        queued = [pending[0].queued_at for pending in (self._creates, self._updates) if pending]
+        if not queued:
+            return None
+        return max(0.0, min(queued) + self._max_wait - time.monotonic())
+
+    def _take(self, pending: list[_PendingWrite]) -> list[_PendingWrite]:
+        """Remove and return up to one batch of queued writes."""
+        batch = pending[:self._batch_size]
+        del pending[:self._batch_size]
+        return batch
+
+    def _flush_creates(self, batch: list[_PendingWrite]) -> None:
+        try:
+            contacts = self._client.batch_create_contacts(
+                [write.contact_data for write in batch]
+            )
+        except Exception as exc:
+            # Retrying creates one by one could duplicate contacts
+            for write in batch:
+                write.set_exception(exc)
+            return
+
+        if len(contacts) != len(batch):
+            # Which creates the contacts belong to is unknown, so every caller fails
+            error = HubSpotApiError(
+                f"Batch create of {len(batch)} contacts returned {len(contacts)}"
+            )
+            for write in batch:
+                write.set_exception(error)
+            return
+        for write, contact in zip(batch, contacts):
+            write.set_result(contact)
+
+    def _flush_updates(self, batch: list[_PendingWrite]) -> None:
+        try:
+            contacts = self._client.batch_update_contacts(
+                [(write.contact_id, write.contact_data) for write in batch]
+            )
+        except Exception:
+            # Updates are idempotent: retry one by one so that a single bad
+            # record only fails the job that submitted it
+            for write in batch:
+                try:
+                    write.set_result(
+                        self._client.update_contact(write.contact_id, write.contact_data)
+                    )
+                except Exception as exc:
+                    write.set_exception(exc)
+            return
+
+        contacts_by_id = {contact.id: contact for contact in contacts}
+        for write in batch:
+            contact = contacts_by_id.get(write.contact_id)
+            if contact is not None:
+                write.set_result(contact)
+            else:
+                write.set_exception(HubSpotApiError(
+                    f"Batch update returned no result for contact {write.contact_id}"
+                ))
@@ -0,0 +1,475 @@
+"""
+Local HubSpot-compatible HTTP server, for load tests and capacity planning.
+
+Serves the CRM v3 contacts endpoints the application uses, backed by the
+in-memory HubSpotClient store:
+
+    GET   /crm/v3/objects/contacts               list, paged with limit/after
+    POST  /crm/v3/objects/contacts/search        filterGroups with EQ, NEQ, IN,
+                                                 HAS_PROPERTY, NOT_HAS_PROPERTY
+    POST  /crm/v3/objects/contacts/batch/read
+    POST  /crm/v3/objects/contacts/batch/create
+    POST  /crm/v3/objects/contacts/batch/update
+    POST  /crm/v3/objects/contacts
+    PATCH /crm/v3/objects/contacts/{id}
+
+Every request is delayed by a log-normal latency, and can be answered with
+a 429 (random throttling, or the per-second rate limit) or a random 5xx,
+each configurable. The portal can be seeded with synthetic contacts.
+
+Run standalone and point the application at it with HUBSPOT_BASE_URL:
+
+    python -m app.infrastructure.external.fake_hubspot_server --port 8090 --contacts 100000
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from app.domain import ContactNotFoundError, HubSpotContact
+from app.infrastructure.external.hubspot_client import HubSpotClient
+
+logger = logging.getLogger(__name__)
+
+_CONTACTS_PATH = "/crm/v3/objects/contacts"
+# HubSpot limits on records per batch call and per search page
+_MAX_BATCH_SIZE = 100
+_MAX_SEARCH_PAGE_SIZE = 200
+
+# HubSpot property name -> key of the contact data dicts used by CrmClient
+_PROPERTY_TO_FIELD = {
+    "firstname": "first_name",
+    "lastname": "last_name",
+    "email": "email",
+    "linkedin_id": "linkedin_id",
+    "phone": "phone",
+    "company": "company",
+}
+
+_FIRST_NAMES = ("James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael",
+                "Linda", "David", "Elizabeth", "William", "Barbara", "Richard", "Susan")
+_LAST_NAMES = ("Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller",
+               "Davis", "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson")
+_COMPANIES = ("Acme Corp", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries")
+
+
+@dataclass(frozen=True)
+class FakeHubSpotConfig:
+    """Behaviour of a FakeHubSpotServer. Defaults come from FAKE_HUBSPOT_* variables."""
+
+    # Median response latency, and spread of its log-normal distribution (0: constant)
+    latency_ms: float = float(os.getenv("FAKE_HUBSPOT_LATENCY_MS", "0"))
+    latency_sigma: float = float(os.getenv("FAKE_HUBSPOT_LATENCY_SIGMA", "0.5"))
+    # Fraction of requests answered 429, regardless of the rate limit
+    throttle_rate: float = float(os.getenv("FAKE_HUBSPOT_THROTTLE_RATE", "0"))
+    # Fraction of requests answered with a random 500, 502 or 503
+    error_rate: float = float(os.getenv("FAKE_HUBSPOT_ERROR_RATE", "0"))
+    # Requests accepted per one-second window before answering 429 (0: unlimited)
+    rate_limit_per_second: int = int(os.getenv("FAKE_HUBSPOT_RATE_LIMIT_PER_SECOND", "0"))
+    # Retry-After sent with every 429
+    retry_after_seconds: float = float(os.getenv("FAKE_HUBSPOT_RETRY_AFTER_SECONDS", "1"))
+    # Return batch results in random order, as HubSpot does not keep the input order
+    shuffle_batch_results: bool = (
+        os.getenv("FAKE_HUBSPOT_SHUFFLE_BATCH_RESULTS", "false").lower() == "true"
+    )
+    # Largest page returned by the list endpoint
+    page_size: int = int(os.getenv("FAKE_HUBSPOT_PAGE_SIZE", "100"))
+    # Synthetic contacts created on startup
+    seed_contacts: int = int(os.getenv("FAKE_HUBSPOT_SEED_CONTACTS", "0"))
+    # Seed of the synthetic portal and of the latency and fault draws
+    random_seed: int = int(os.getenv("FAKE_HUBSPOT_RANDOM_SEED", "0"))
+    # Bearer token required on every request (unset: any or none)
+    access_token: str | None = os.getenv("FAKE_HUBSPOT_ACCESS_TOKEN") or None
+
+
+class _ApiError(Exception):
+    """An error response, in the HubSpot error format."""
+
+    def __init__(self, status: int, category: str, message: str, **context: list[str]):
+        self.status = status
+        self.body = {"status": "error", "category": category, "message": message}
+        if context:
+            self.body["context"] = context
+        super().__init__(message)
+
+
+def _to_json(contact: HubSpotContact) -> dict:
+    data = contact.to_dict()
+    data["properties"]["hs_object_id"] = contact.id
+    data["archived"] = False
+    return data
+
+
+def _to_contact_data(properties: dict) -> dict:
+    """Contact data, as taken by HubSpotClient, from HubSpot properties."""
+    return {
+        field: properties[name]
+        for name, field in _PROPERTY_TO_FIELD.items()
+        if properties.get(name) is not None
+    }
+
+
+def _batch_inputs(body: dict) -> list[dict]:
+    inputs = body.get("inputs")
+    if not isinstance(inputs, list):
+        raise _ApiError(400, "VALIDATION_ERROR", "inputs must be a list")
+    if len(inputs) > _MAX_BATCH_SIZE:
+        raise _ApiError(
+            400, "VALIDATION_ERROR", f"Batch size {len(inputs)} exceeds {_MAX_BATCH_SIZE}"
+        )
+    return inputs
+
+
+def _matches_filter(properties: dict, search_filter: dict) -> bool:
+    """Evaluate one search filter; values compare case-insensitively, like HubSpot."""
+    value = properties.get(search_filter.get("propertyName"))
+    value = value.lower() if isinstance(value, str) else value
+    operator = search_filter.get("operator", "EQ")
+    if operator == "HAS_PROPERTY":
+        return value is not None
+    if operator == "NOT_HAS_PROPERTY":
+        return value is None
+    if operator in ("EQ", "NEQ"):
+        equal = value == str(search_filter.get("value", "")).lower()
+        return equal if operator == "EQ" else not equal
+    if operator == "IN":
+        return value in {str(v).lower() for v in search_filter.get("values", [])}
+    raise _ApiError(400, "VALIDATION_ERROR", f"Unsupported operator {operator}")
+
+
+class FakeHubSpotServer:
+    """
+    HubSpot-compatible HTTP server on a background thread.
+
+    Handles requests on one thread each, against a thread-safe HubSpotClient
+    store. Port 0 picks a free port; the address is in url once started.
+    Counts responses per status code in stats.
+    """
+
+    def __init__(
+        self,
+        config: FakeHubSpotConfig | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.config = config or FakeHubSpotConfig()
+        self.store = HubSpotClient()
+        self.stats: Counter[int] = Counter()
+        self._random = random.Random(self.config.random_seed)
+        self._lock = threading.Lock()
+        # Contact IDs in creation order, for paging; the store never deletes
+        self._ids = [contact.id for contact in self.store.get_all_contacts()]
+        self._window_start = 0.0
+        self._window_requests = 0
+        self._seed(self.config.seed_contacts)
+
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeHubSpotServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            # Checked for shutdown at this interval
+            kwargs={"poll_interval": 0.05},
+            name="fake-hubspot",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve requests on the calling thread, until interrupted."""
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeHubSpotServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def _seed(self, count: int) -> None:
+        """Create synthetic contacts; about one in ten shares a name with another."""
+        rng = random.Random(self.config.random_seed)
+        for i in range(count):
+            first = rng.choice(_FIRST_NAMES)
+            last = rng.choice(_LAST_NAMES)
+            data = {
+                "first_name": first,
+                "last_name": last if rng.random() < 0.1 else f"{last}{i}",
+                "email": f"{first.lower()}.{last.lower()}.{i}@example.com",
+                "company": rng.choice(_COMPANIES),
+            }
+            if rng.random() < 0.7:
+                data["linkedin_id"] = f"{first.lower()}-{last.lower()}-{i}"
+            if rng.random() < 0.5:
+                data["phone"] = f"+1555{i:07d}"
+            self._create(data)
+        if count:
+            logger.info("Seeded fake HubSpot portal with %d contacts", count)
+
+    def _create(self, contact_data: dict) -> HubSpotContact:
+        contact = self.store.create_contact(contact_data)
+        with self._lock:
+            self._ids.append(contact.id)
+        return contact
+
+    # Fault injection
+
+    def _delay(self) -> None:
+        if self.config.latency_ms <= 0:
+            return
+        with self._lock:
+            factor = self._random.lognormvariate(0, self.config.latency_sigma)
+        time.sleep(self.config.latency_ms * factor / 1000)
+
+    def _inject_faults(self) -> None:
+        """Raise the 429 or 5xx this request is answered with, if any."""
+        with self._lock:
+            limit = self.config.rate_limit_per_second
+            if limit:
+                now = time.monotonic()
+                if now - self._window_start >= 1:
+                    self._window_start = now
+                    self._window_requests = 0
+                self._window_requests += 1
+                if self._window_requests > limit:
+                    raise _ApiError(429, "RATE_LIMITS", "Secondly rate limit reached")
+            if self._random.random() < self.config.throttle_rate:
+                raise _ApiError(429, "RATE_LIMITS", "Throttled")
+            if self._random.random() < self.config.error_rate:
+                status = self._random.choice((500, 502, 503))
+                raise _ApiError(status, "INTERNAL_ERROR", "Injected server error")
+
+    # Endpoints
+
+    def _list(self, query: dict[str, list[str]]) -> tuple[int, dict]:
+        limit = min(int(query.get("limit", ["10"])[0]), self.config.page_size)
+        after = int(query.get("after", ["0"])[0])
+        with self._lock:
+            page_ids = self._ids[after:after + limit]
+            more = after + limit < len(self._ids)
+        body: dict = {
+            "results": [_to_json(c) for c in self.store.get_contacts_by_ids(page_ids)]
+        }
+        if more:
+            body["paging"] = {"next": {"after": str(after + limit)}}
+        return 200, body
+
+    def _search(self, body: dict) -> tuple[int, dict]:
+        limit = min(int(body.get("limit", 10)), _MAX_SEARCH_PAGE_SIZE)
+        after = int(body.get("after", 0))
+        groups = body.get("filterGroups") or [{"filters": []}]
+        hits = [
+            contact
+            for contact in self.store.get_all_contacts()
+            if any(
+                all(
+                    _matches_filter(contact.to_dict()["properties"], search_filter)
+                    for search_filter in group.get("filters", [])
+                )
+                for group in groups
+            )
+        ]
+        page = hits[after:after + limit]
+        response: dict = {"total": len(hits), "results": [_to_json(c) for c in page]}
+        if after + limit < len(hits):
+            response["paging"] = {"next": {"after": str(after + limit)}}
+        return 200, response
+
+    def _batch_read(self, body: dict) -> tuple[int, dict]:
+        ids = [str(item.get("id")) for item in _batch_inputs(body)]
+        contacts = self.store.get_contacts_by_ids(ids)
+        response: dict = {"status": "COMPLETE", "results": [_to_json(c) for c in contacts]}
+        missing = sorted(set(ids) - {contact.id for contact in contacts})
+        if missing:
+            response["numErrors"] = 1
+            response["errors"] = [{
+                "status": "error",
+                "category": "OBJECT_NOT_FOUND",
+                "message": "Could not get some CONTACT objects",
+                "context": {"ids": missing},
+            }]
+            return 207, response
+        return 200, response
+
+    def _batch_create(self, body: dict) -> tuple[int, dict]:
+        results = []
+        for item in _batch_inputs(body):
+            result = _to_json(self._create(_to_contact_data(item.get("properties", {}))))
+            if "objectWriteTraceId" in item:
+                result["objectWriteTraceId"] = item["objectWriteTraceId"]
+            results.append(result)
+        return 201, {"status": "COMPLETE", "results": self._batch_order(results)}
+
+    def _batch_update(self, body: dict) -> tuple[int, dict]:
+        updates = [
+            (str(item.get("id")), _to_contact_data(item.get("properties", {})))
+            for item in _batch_inputs(body)
+        ]
+        try:
+            contacts = self.store.batch_update_contacts(updates)
+        except ContactNotFoundError as exc:
+            raise _ApiError(404, "OBJECT_NOT_FOUND", exc.message, ids=[exc.contact_id])
+        return 200, {
+            "status": "COMPLETE", "results": self._batch_order([_to_json(c) for c in contacts])
+        }
+
+    def _batch_order(self, results: list[dict]) -> list[dict]:
+        if self.config.shuffle_batch_results:
+            with self._lock:
+                self._random.shuffle(results)
+        return results
+
+    def _create_one(self, body: dict) -> tuple[int, dict]:
+        return 201, _to_json(self._create(_to_contact_data(body.get("properties", {}))))
+
+    def _update_one(self, contact_id: str, body: dict) -> tuple[int, dict]:
+        try:
+            contact = self.store.update_contact(
+                contact_id, _to_contact_data(body.get("properties", {}))
+            )
+        except ContactNotFoundError as exc:
+            raise _ApiError(404, "OBJECT_NOT_FOUND", exc.message, ids=[contact_id])
+        return 200, _to_json(contact)
+
+    def _route(self, method: str, path: str, query: dict, body: dict) -> tuple[int, dict]:
+        if method == "GET" and path == _CONTACTS_PATH:
+            return self._list(query)
+        if method == "POST":
+            routes = {
+                _CONTACTS_PATH: self._create_one,
+                f"{_CONTACTS_PATH}/search": self._search,
+                f"{_CONTACTS_PATH}/batch/read": self._batch_read,
+                f"{_CONTACTS_PATH}/batch/create": self._batch_create,
+                f"{_CONTACTS_PATH}/batch/update": self._batch_update,
+            }
+            if path in routes:
+                return routes[path](body)
+        if method == "PATCH" and path.startswith(f"{_CONTACTS_PATH}/"):
+            return self._update_one(path.rsplit("/", 1)[1], body)
+        raise _ApiError(404, "NOT_FOUND", f"No route for {method} {path}")
+
+    def _respond(self, method: str, target: str, headers, raw_body: bytes) -> tuple[int, dict]:
+        """Status and JSON body for a request, after latency and fault injection."""
+        self._delay()
+        try:
+            token = self.config.access_token
+            if token and headers.get("Authorization") != f"Bearer {token}":
+                raise _ApiError(401, "INVALID_AUTHENTICATION", "Invalid access token")
+            self._inject_faults()
+            url = urlsplit(target)
+            try:
+                body = json.loads(raw_body) if raw_body else {}
+            except ValueError:
+                raise _ApiError(400, "VALIDATION_ERROR", "Invalid JSON body")
+            status, response = self._route(method, url.path, parse_qs(url.query), body)
+        except _ApiError as exc:
+            status, response = exc.status, exc.body
+        with self._lock:
+            self.stats[status] += 1
+        return status, response
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, so clients can pool connections
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw_body = self.rfile.read(length) if length else b""
+                status, response = server._respond(self.command, self.path, self.headers, raw_body)
+                payload = json.dumps(response).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                if status == 429:
+                    self.send_header("Retry-After", f"{server.config.retry_after_seconds:g}")
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PATCH = _handle
+
+            def log_message(self, format: str, *args) -> None:
+                logger.debug(format, *args)
+
+        return Handler
+
+
+def main(argv: list[str] | None = None) -> None:
+    defaults = FakeHubSpotConfig()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--contacts", type=int, default=defaults.seed_contacts,
+                        help="synthetic contacts to seed the portal with")
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms,
+                        help="median response latency")
+    parser.add_argument("--latency-sigma", type=float, default=defaults.latency_sigma,
+                        help="log-normal spread of the latency (0: constant)")
+    parser.add_argument("--throttle-rate", type=float, default=defaults.throttle_rate,
+                        help="fraction of requests answered 429")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate,
+                        help="fraction of requests answered 5xx")
+    parser.add_argument("--rate-limit", type=int, default=defaults.rate_limit_per_second,
+                        help="requests per second before answering 429 (0: unlimited)")
+    parser.add_argument("--shuffle-batch-results", action="store_true",
+                        default=defaults.shuffle_batch_results,
+                        help="return batch results in random order")
+    parser.add_argument("--page-size", type=int, default=defaults.page_size)
+    parser.add_argument("--seed", type=int, default=defaults.random_seed)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    server = FakeHubSpotServer(
+        FakeHubSpotConfig(
+            latency_ms=args.latency_ms,
+            latency_sigma=args.latency_sigma,
+            throttle_rate=args.throttle_rate,
+            error_rate=args.error_rate,
+            rate_limit_per_second=args.rate_limit,
+            shuffle_batch_results=args.shuffle_batch_results,
+            page_size=args.page_size,
+            seed_contacts=args.contacts,
+            random_seed=args.seed,
+            access_token=defaults.access_token,
+        ),
+        host=args.host,
+        port=args.port,
+    )
+    logger.info("Fake HubSpot listening on %s", server.url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        logger.info("Responses by status: %s", dict(server.stats))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,19 +5,70 @@ In a real scenario, this would make actual HTTP requests to HubSpot API.
 This implementation conforms to the CrmClient protocol defined in the domain layer.
 """
 
-from app.domain import HubSpotContact, HubSpotContactProperties, ContactNotFoundError
+import itertools
+import logging
+import os
+import threading
+
+from app.domain import (
+    HubSpotContact,
+    HubSpotContactProperties,
+    ContactNotFoundError,
+    MatchKeyFilter,
+    MatchKeys,
+)
+
+logger = logging.getLogger(__name__)
+
+# Locks guarding contact writes, picked by contact ID
+HUBSPOT_STORE_STRIPES = int(os.getenv("HUBSPOT_STORE_STRIPES", "64"))
+# Target false-positive rate of the match-key filter
+HUBSPOT_MATCH_FILTER_ERROR_RATE = float(os.getenv("HUBSPOT_MATCH_FILTER_ERROR_RATE", "0.01"))
+# Room for new contacts when the filter is sized, as a multiple of the current count
+_MATCH_FILTER_GROWTH = 2
+_MATCH_FILTER_MIN_CAPACITY = 1024
 
 
 class HubSpotClient:
     """
     HubSpot CRM client implementation.
 
+    The in-memory store is safe to share between threads without a global
+    lock. Writes to a contact hold one of HUBSPOT_STORE_STRIPES locks,
+    picked by contact ID, so writes to different contacts proceed in
+    parallel while updates to one contact never lose each other's changes.
+    IDs come from an atomic counter. Secondary indexes by normalized
+    LinkedIn ID, email and name are maintained on every write.
+
+    Contact IDs are also appended to a creation-order list, under a lock
+    only creates take, for a moment. Reads of the whole store copy that
+    list, so they see every contact created before them, in creation order,
+    without holding up writes to existing contacts.
+
+    Also maintains a Bloom filter over the match keys of every contact:
+    built when contacts are loaded, extended on every create and update,
+    and rebuilt on load once more contacts were added than it was sized for.
+
+    Relies on single dict and set operations being atomic, as in CPython.
+
     Implements the CrmClient protocol for dependency inversion.
     """
 
-    def __init__(self):
-        self._contacts: dict[str, HubSpotContact] = {
-            "hubspot_1": HubSpotContact(
+    def __init__(self, stripes: int = HUBSPOT_STORE_STRIPES):
+        self._contacts: dict[str, HubSpotContact] = {}
+        # Creation order, which is the order of get_all_contacts; append-only
+        self._order: list[str] = []
+        self._positions: dict[str, int] = {}
+        self._order_lock = threading.Lock()
+        self._next_id = itertools.count(1000)
+        self._locks = [threading.Lock() for _ in range(max(1, stripes))]
+        # Per match-key tier: normalized key -> IDs of contacts having it. Empty
+        # entries are kept: deleting them could race with a concurrent insert.
+        self._indexes: tuple[dict[str, dict[str, None]], ...] = ({}, {}, {})
+        self._filter_lock = threading.Lock()
+
+        for contact in (
+            HubSpotContact(
                 id="hubspot_1",
                 properties=HubSpotContactProperties(
                     firstname="John",
@@ -28,7 +79,7 @@ class HubSpotClient:
                     company="Example Inc",
                 ),
             ),
-            "hubspot_2": HubSpotContact(
+            HubSpotContact(
                 id="hubspot_2",
                 properties=HubSpotContactProperties(
                     firstname="Jane",
@@ -37,17 +88,112 @@ class HubSpotClient:
                     linkedin_id="linkedin_2",
                 ),
             ),
-        }
-        self._next_id = 1000
+        ):
+            self._store(contact, previous=None)
+        self._match_filter = self._build_match_filter(self._snapshot_contacts())
 
     def get_all_contacts(self) -> list[HubSpotContact]:
         """Pull all contacts from HubSpot CRM."""
-        return list(self._contacts.values())
+        contacts = self._snapshot_contacts()
+        if self._match_filter.saturated:
+            # Writers add to the filter under this lock after storing their
+            # contact, so none is left out of the snapshot and the new filter
+            with self._filter_lock:
+                if self._match_filter.saturated:
+                    self._match_filter = self._build_match_filter(self._snapshot_contacts())
+        return contacts
+
+    def get_contacts_page(
+        self, after: str | None = None
+    ) -> tuple[list[HubSpotContact], str | None]:
+        """Pull contacts from HubSpot CRM, all in a single page."""
+        return self.get_all_contacts(), None
+
+    def find_by_keys(self, keys: MatchKeys) -> HubSpotContact | None:
+        """
+        Find the contact matching a set of keys, using the secondary indexes.
+
+        Same priority as contact matching: LinkedIn ID, then email, then
+        name; the earliest created contact wins within a tier.
+        """
+        for index, key in zip(self._indexes, (keys.linkedin_id, keys.email, keys.name)):
+            if not key:
+                continue
+            contact_ids = list(index.get(key, ()))
+            if contact_ids:
+                first_id = min(contact_ids, key=self._positions.__getitem__)
+                return self._contacts[first_id]
+        return None
+
+    def get_match_filter(self) -> MatchKeyFilter:
+        """Bloom filter over the match keys of every contact, for prefiltering."""
+        return self._match_filter
+
+    def _snapshot_contacts(self) -> list[HubSpotContact]:
+        """The current version of every contact created so far, in creation order."""
+        with self._order_lock:
+            contact_ids = self._order[:]
+        return [self._contacts[contact_id] for contact_id in contact_ids]
+
+    def _lock_for(self, contact_id: str) -> threading.Lock:
+        """The lock stripe guarding writes to a contact."""
+        return self._locks[hash(contact_id) % len(self._locks)]
+
+    def _store(self, contact: HubSpotContact, previous: HubSpotContact | None) -> None:
+        """Store a contact and update the secondary indexes. Hold the contact's lock."""
+        # Stored before being listed or indexed, so that a listed or indexed ID always resolves
+        if previous is None:
+            with self._order_lock:
+                self._contacts[contact.id] = contact
+                self._positions[contact.id] = len(self._order)
+                self._order.append(contact.id)
+        else:
+            self._contacts[contact.id] = contact
+
+        old_keys = MatchKeys.of_hubspot(previous) if previous else MatchKeys()
+        new_keys = MatchKeys.of_hubspot(contact)
+        for index, old_key, new_key in zip(
+            self._indexes,
+            (old_keys.linkedin_id, old_keys.email, old_keys.name),
+            (new_keys.linkedin_id, new_keys.email, new_keys.name),
+        ):
+            if old_key == new_key:
+                continue
+            if old_key:
+                index[old_key].pop(contact.id, None)
+            if new_key:
+                index.setdefault(new_key, {})[contact.id] = None
+
+    def _add_to_filter(self, contact: HubSpotContact) -> None:
+        # Setting Bloom filter bits is a read-modify-write of shared bytes
+        with self._filter_lock:
+            self._match_filter.add(MatchKeys.of_hubspot(contact))
+
+    def _build_match_filter(self, contacts: list[HubSpotContact]) -> MatchKeyFilter:
+        match_filter = MatchKeyFilter.create(
+            capacity=max(_MATCH_FILTER_MIN_CAPACITY, len(contacts) * _MATCH_FILTER_GROWTH),
+            error_rate=HUBSPOT_MATCH_FILTER_ERROR_RATE,
+        )
+        for contact in contacts:
+            match_filter.add(MatchKeys.of_hubspot(contact))
+        logger.info(
+            "Built match-key filter over %d contacts, estimated false-positive rate %.4f",
+            len(contacts),
+            match_filter.false_positive_rate,
+        )
+        return match_filter
+
+    def get_contacts_by_ids(self, contact_ids: list[str]) -> list[HubSpotContact]:
+        """Batch-read contacts from HubSpot, skipping unknown IDs."""
+        return [
+            self._contacts[contact_id]
+            for contact_id in contact_ids
+            if contact_id in self._contacts
+        ]
 
     def create_contact(self, contact_data: dict) -> HubSpotContact:
         """Create a new contact in HubSpot."""
-        hubspot_id = f"hubspot_{self._next_id}"
-        self._next_id += 1
+        hubspot_id = f"hubspot_{next(self._next_id)}"
 
         contact = HubSpotContact(
             id=hubspot_id,
@@ -61,27 +207,53 @@ class HubSpotClient:
             ),
         )
 
-        self._contacts[hubspot_id] = contact
+        with self._lock_for(hubspot_id):
+            self._store(contact, previous=None)
+        self._add_to_filter(contact)
         return contact
 
     def update_contact(self, contact_id: str, contact_data: dict) -> HubSpotContact:
         """Update an existing contact in HubSpot."""
-        if contact_id not in self._contacts:
-            raise ContactNotFoundError(contact_id)
-
-        existing = self._contacts[contact_id]
+        with self._lock_for(contact_id):
+            existing = self._contacts.get(contact_id)
+            if existing is None:
+                raise ContactNotFoundError(contact_id)
 
-        updated_contact = HubSpotContact(
-            id=contact_id,
-            properties=HubSpotContactProperties(
-                firstname=contact_data.get("first_name") or existing.properties.firstname,
-                lastname=contact_data.get("last_name") or existing.properties.lastname,
-                email=contact_data.get("email") or existing.properties.email,
-                linkedin_id=contact_data.get("linkedin_id") or existing.properties.linkedin_id,
-                phone=contact_data.get("phone") or existing.properties.phone,
-                company=contact_data.get("company") or existing.properties.company,
-            ),
-        )
+            updated_contact = HubSpotContact(
+                id=contact_id,
+                properties=HubSpotContactProperties(
+                    firstname=contact_data.get("first_name") or existing.properties.firstname,
+                    lastname=contact_data.get("last_name") or existing.properties.lastname,
+                    email=contact_data.get("email") or existing.properties.email,
+                    linkedin_id=contact_data.get("linkedin_id") or existing.properties.linkedin_id,
+                    phone=contact_data.get("phone") or existing.properties.phone,
+                    company=contact_data.get("company") or existing.properties.company,
+                ),
+            )
+            self._store(updated_contact, previous=existing)
 
-        self._contacts[contact_id] = updated_contact
+        # Keys replaced by the update stay in the filter as false positives
+        self._add_to_filter(updated_contact)
         return updated_contact
+
+    def batch_create_contacts(self, contacts_data: list[dict]) -> list[HubSpotContact]:
+        """Create several contacts in HubSpot in one call."""
+        return [self.create_contact(contact_data) for contact_data in contacts_data]
+
+    def batch_update_contacts(
+        self, updates: list[tuple[str, dict]]
+    ) -> list[HubSpotContact]:
+        """
+        Update several contacts in HubSpot in one call.
+
+        Like the HubSpot batch API, the whole batch is rejected if any
+        contact does not exist.
+        """
+        for contact_id, _ in updates:
+            if contact_id not in self._contacts:
+                raise ContactNotFoundError(contact_id)
+
+        return [
+            self.update_contact(contact_id, contact_data)
+            for contact_id, contact_data in updates
+        ]
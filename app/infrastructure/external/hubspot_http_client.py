@@ -0,0 +1,326 @@
+"""
+HubSpot API client over HTTP.
+
+Talks to the CRM v3 contacts API, or to anything speaking it, such as
+FakeHubSpotServer for load tests.
+
+This implementation conforms to the CrmClient protocol defined in the domain layer.
+"""
+
+import logging
+import os
+import time
+
+import httpx
+
+from app.domain import (
+    ContactNotFoundError,
+    HubSpotApiError,
+    HubSpotContact,
+)
+from app.infrastructure.external.rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Private app access token sent as a bearer token
+HUBSPOT_ACCESS_TOKEN = os.getenv("HUBSPOT_ACCESS_TOKEN") or None
+# Timeout of each HTTP request
+HUBSPOT_TIMEOUT_SECONDS = float(os.getenv("HUBSPOT_TIMEOUT_SECONDS", "10"))
+# Retries of a request answered 429 or 5xx, or failing to connect (creates: 429 only)
+HUBSPOT_MAX_RETRIES = int(os.getenv("HUBSPOT_MAX_RETRIES", "5"))
+# First retry delay when the response has no Retry-After; doubles on each retry
+HUBSPOT_RETRY_BACKOFF_SECONDS = float(os.getenv("HUBSPOT_RETRY_BACKOFF_SECONDS", "0.5"))
+# Pooled keep-alive connections, shared by every job's threads
+HUBSPOT_MAX_CONNECTIONS = int(os.getenv("HUBSPOT_MAX_CONNECTIONS", "20"))
+# Client-side limit on requests per second (0: unlimited), e.g. 10 for 100 per 10 seconds
+HUBSPOT_RATE_LIMIT_PER_SECOND = float(os.getenv("HUBSPOT_RATE_LIMIT_PER_SECOND", "0"))
+# Requests the rate limiter lets through at once after a quiet period
+HUBSPOT_RATE_LIMIT_BURST = int(os.getenv("HUBSPOT_RATE_LIMIT_BURST", "100"))
+
+_CONTACTS_PATH = "/crm/v3/objects/contacts"
+# HubSpot limit on records per batch call, and largest list page
+_BATCH_SIZE = 100
+
+# Key of the contact data dicts used by CrmClient -> HubSpot property name
+_FIELD_TO_PROPERTY = {
+    "first_name": "firstname",
+    "last_name": "lastname",
+    "email": "email",
+    "linkedin_id": "linkedin_id",
+    "phone": "phone",
+    "company": "company",
+}
+_PROPERTIES = ",".join(_FIELD_TO_PROPERTY.values())
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Statuses and transport errors after which a create cannot have taken effect
+_CREATE_RETRY_STATUSES = {429}
+_UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def _to_properties(contact_data: dict) -> dict:
+    """
+    HubSpot properties from contact data.
+
+    Empty values are left out, so an update keeps the current value, as
+    with the in-memory HubSpotClient.
+    """
+    return {
+        name: contact_data[field]
+        for field, name in _FIELD_TO_PROPERTY.items()
+        if contact_data.get(field)
+    }
+
+
+def _batch_results(response: httpx.Response, path: str, expected: int) -> list[dict]:
+    """
+    Results of a batch write, which must have succeeded for every input.
+
+    Raises:
+        ContactNotFoundError: If HubSpot reports a contact of the batch missing.
+        HubSpotApiError: On any other error reported in a 2xx (207) response,
+            or a result count other than expected.
+    """
+    body = response.json()
+    for error in body.get("errors") or ():
+        ids = error.get("context", {}).get("ids")
+        if error.get("category") == "OBJECT_NOT_FOUND" and ids:
+            raise ContactNotFoundError(ids[0])
+        raise HubSpotApiError(
+            f"POST {path} answered {response.status_code}: {error.get('message')}"
+        )
+    results = body["results"]
+    if len(results) != expected:
+        raise HubSpotApiError(f"POST {path} returned {len(results)} results for {expected} inputs")
+    return results
+
+
+def _chunks(items: list, size: int = _BATCH_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class HubSpotHttpClient:
+    """
+    HubSpot CRM client over HTTP.
+
+    One httpx client, with a pool of keep-alive connections, is shared by
+    every caller; it is thread-safe. Requests answered 429 or 5xx, and
+    connection failures, are retried with exponential backoff, honouring
+    Retry-After. Creates are not idempotent: a 5xx or a timeout may come
+    after HubSpot stored the contact, so they are only retried when
+    throttled or when the request never reached the server. Batch calls
+    are split into chunks of the HubSpot limit.
+    With a rate limit, every attempt first takes a token from a bucket
+    shared by all callers, staying under the portal's limit instead of
+    running into 429s.
+
+    Implements the CrmClient protocol for dependency inversion.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        access_token: str | None = HUBSPOT_ACCESS_TOKEN,
+        timeout_seconds: float = HUBSPOT_TIMEOUT_SECONDS,
+        max_retries: int = HUBSPOT_MAX_RETRIES,
+        retry_backoff_seconds: float = HUBSPOT_RETRY_BACKOFF_SECONDS,
+        max_connections: int = HUBSPOT_MAX_CONNECTIONS,
+        rate_limit_per_second: float = HUBSPOT_RATE_LIMIT_PER_SECOND,
+        rate_limit_burst: int = HUBSPOT_RATE_LIMIT_BURST,
+    ):
+        headers = {"Authorization": f"Bearer {access_token}"} if access_token else {}
+        self._http = httpx.Client(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+        )
+        self._max_retries = max_retries
+        self._retry_backoff = retry_backoff_seconds
+        self.rate_limiter = (
+            TokenBucket(rate_limit_per_second, rate_limit_burst)
+            if rate_limit_per_second > 0 else None
+        )
+        self.retries = 0
+
+    def get_all_contacts(self) -> list[HubSpotContact]:
+        """Pull all contacts from HubSpot CRM, one page at a time."""
+        contacts, after = self.get_contacts_page()
+        while after is not None:
+            page, after = self.get_contacts_page(after)
+            contacts.extend(page)
+        return contacts
+
+    def get_contacts_page(
+        self, after: str | None = None
+    ) -> tuple[list[HubSpotContact], str | None]:
+        """Pull one page of contacts from HubSpot, with the cursor of the next page if any."""
+        params = {"limit": _BATCH_SIZE, "properties": _PROPERTIES}
+        if after is not None:
+            params["after"] = after
+        page = self._request("GET", _CONTACTS_PATH, params=params).json()
+        contacts = [HubSpotContact.from_dict(item) for item in page["results"]]
+        return contacts, page.get("paging", {}).get("next", {}).get("after")
+
+    def get_contacts_by_ids(self, contact_ids: list[str]) -> list[HubSpotContact]:
+        """Batch-read contacts from HubSpot, skipping unknown IDs."""
+        contacts: list[HubSpotContact] = []
+        for chunk in _chunks(contact_ids):
+            response = self._request(
+                "POST",
+                f"{_CONTACTS_PATH}/batch/read",
+                json={
+                    "inputs": [{"id": contact_id} for contact_id in chunk],
+                    "properties": list(_FIELD_TO_PROPERTY.values()),
+                },
+            )
+            contacts.extend(HubSpotContact.from_dict(item) for item in response.json()["results"])
+        return contacts
+
+    def create_contact(self, contact_data: dict) -> HubSpotContact:
+        """Create a new contact in HubSpot."""
+        response = self._request(
+            "POST",
+            _CONTACTS_PATH,
+            json={"properties": _to_properties(contact_data)},
+            idempotent=False,
+        )
+        return HubSpotContact.from_dict(response.json())
+
+    def update_contact(self, contact_id: str, contact_data: dict) -> HubSpotContact:
+        """Update an existing contact in HubSpot."""
+        response = self._request(
+            "PATCH",
+            f"{_CONTACTS_PATH}/{contact_id}",
+            json={"properties": _to_properties(contact_data)},
+            not_found_id=contact_id,
+        )
+        return HubSpotContact.from_dict(response.json())
+
+    def batch_create_contacts(self, contacts_data: list[dict]) -> list[HubSpotContact]:
+        """
+        Create several contacts in HubSpot, in calls of up to 100.
+
+        HubSpot does not keep the input order in its results; each input is
+        tagged with an objectWriteTraceId, which its result echoes, to
+        return the contacts in input order.
+        """
+        contacts: list[HubSpotContact] = []
+        path = f"{_CONTACTS_PATH}/batch/create"
+        for chunk in _chunks(contacts_data):
+            response = self._request(
+                "POST",
+                path,
+                json={
+                    "inputs": [
+                        {"properties": _to_properties(data), "objectWriteTraceId": str(i)}
+                        for i, data in enumerate(chunk)
+                    ]
+                },
+                idempotent=False,
+            )
+            results = _batch_results(response, path, len(chunk))
+            by_trace_id = {item.get("objectWriteTraceId"): item for item in results}
+            try:
+                contacts.extend(
+                    HubSpotContact.from_dict(by_trace_id[str(i)]) for i in range(len(chunk))
+                )
+            except KeyError as exc:
+                raise HubSpotApiError(f"POST {path} returned no result for input {exc}")
+        return contacts
+
+    def batch_update_contacts(
+        self, updates: list[tuple[str, dict]]
+    ) -> list[HubSpotContact]:
+        """
+        Update several contacts in HubSpot, in calls of up to 100.
+
+        A call is rejected as a whole if any of its contacts does not exist.
+        Contacts are returned in input order, whatever order HubSpot sends.
+        """
+        contacts: list[HubSpotContact] = []
+        path = f"{_CONTACTS_PATH}/batch/update"
+        for chunk in _chunks(updates):
+            response = self._request(
+                "POST",
+                path,
+                json={
+                    "inputs": [
+                        {"id": contact_id, "properties": _to_properties(data)}
+                        for contact_id, data in chunk
+                    ]
+                },
+                not_found_id=chunk[0][0] if chunk else None,
+            )
+            results = _batch_results(response, path, len(chunk))
+            by_id = {contact.id: contact for contact in map(HubSpotContact.from_dict, results)}
+            try:
+                contacts.extend(by_id[contact_id] for contact_id, _ in chunk)
+            except KeyError as exc:
+                raise HubSpotApiError(f"POST {path} returned no result for contact {exc}")
+        return contacts
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self._http.close()
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        not_found_id: str | None = None,
+        idempotent: bool = True,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        Send a request, retrying throttled and failed attempts.
+
+        A request that is not idempotent is only retried when answered 429
+        or when it failed before being sent, so it never takes effect twice.
+
+        Raises:
+            ContactNotFoundError: On a 404 for a contact request; the ID is
+                taken from the error context, or is not_found_id.
+            HubSpotApiError: On any other error, or once retries run out.
+        """
+        retry_statuses = _RETRY_STATUSES if idempotent else _CREATE_RETRY_STATUSES
+        retry_errors = httpx.TransportError if idempotent else _UNSENT_ERRORS
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                response = self._http.request(method, path, **kwargs)
+            except httpx.TransportError as exc:
+                if not isinstance(exc, retry_errors) or attempt == self._max_retries:
+                    raise HubSpotApiError(f"{method} {path} failed", exc) from exc
+                self._wait(attempt, None)
+                attempt += 1
+                continue
+
+            if response.status_code in retry_statuses and attempt < self._max_retries:
+                logger.debug("%s %s answered %d, retrying", method, path, response.status_code)
+                self._wait(attempt, response.headers.get("Retry-After"))
+                attempt += 1
+                continue
+            if response.status_code == 404 and not_found_id is not None:
+                ids = response.json().get("context", {}).get("ids") or [not_found_id]
+                raise ContactNotFoundError(ids[0])
+            if response.is_error:
+                raise HubSpotApiError(
+                    f"{method} {path} answered {response.status_code}: {response.text}"
+                )
+            return response
+
+    def _wait(self, attempt: int, retry_after: str | None) -> None:
+        self.retries += 1
+        try:
+            delay = float(retry_after) if retry_after else None
+        except ValueError:
+            delay = None
+        if delay is None:
+            delay = self._retry_backoff * 2 ** attempt
+        time.sleep(delay)
@@ -0,0 +1,97 @@
+"""
+CRM client decorator recording call counts, latencies and errors, and a
+span for every call.
+
+This implementation conforms to the CrmClient protocol defined in the domain layer.
+"""
+
+import time
+from typing import Callable, TypeVar
+
+from app.domain import CrmClient, HubSpotContact
+from app.infrastructure.metrics.instruments import (
+    CRM_REQUEST_DURATION,
+    CRM_REQUEST_ERRORS,
+    CRM_REQUESTS,
+)
+from app.infrastructure.tracing import get_tracer
+
+_T = TypeVar("_T")
+
+_tracer = get_tracer(__name__)
+
+
+class InstrumentedCrmClient:
+    """
+    CRM client that records crm_* metrics for every call to another one.
+
+    Each call is counted and timed under its operation name; failures are
+    also counted by exception class, then re-raised. Each call also runs in
+    a crm.<operation> span.
+
+    Implements the CrmClient protocol for dependency inversion.
+    """
+
+    def __init__(self, crm_client: CrmClient):
+        self._client = crm_client
+        # Labelled children per operation, resolved once instead of on every call
+        self._children: dict[str, tuple] = {}
+
+    def _call(self, operation: str, call: Callable[[], _T]) -> _T:
+        children = self._children.get(operation)
+        if children is None:
+            children = self._children[operation] = (
+                CRM_REQUESTS.labels(operation),
+                CRM_REQUEST_DURATION.labels(operation),
+            )
+        requests, duration = children
+        requests.inc()
+        start = time.perf_counter()
+        try:
+            with _tracer.start_as_current_span(f"crm.{operation}"):
+                return call()
+        except Exception as exc:
+            CRM_REQUEST_ERRORS.labels(operation, type(exc).__name__).inc()
+            raise
+        finally:
+            duration.observe(time.perf_counter() - start)
+
+    def get_all_contacts(self) -> list[HubSpotContact]:
+        """Retrieve all contacts from the CRM."""
+        return self._call("get_all_contacts", self._client.get_all_contacts)
+
+    def get_contacts_page(
+        self, after: str | None = None
+    ) -> tuple[list[HubSpotContact], str | None]:
+        """Retrieve one page of contacts in one call."""
+        return self._call("get_contacts_page", lambda: self._client.get_contacts_page(after))
+
+    def get_contacts_by_ids(self, contact_ids: list[str]) -> list[HubSpotContact]:
+        """Retrieve several contacts by ID in one call."""
+        return self._call(
+            "get_contacts_by_ids", lambda: self._client.get_contacts_by_ids(contact_ids)
+        )
+
+    def create_contact(self, contact_data: dict) -> HubSpotContact:
+        """Create a new contact in the CRM."""
+        return self._call("create_contact", lambda: self._client.create_contact(contact_data))
+
+    def update_contact(self, contact_id: str, contact_data: dict) -> HubSpotContact:
+        """Update an existing contact in the CRM."""
+        return self._call(
+            "update_contact", lambda: self._client.update_contact(contact_id, contact_data)
+        )
+
+    def batch_create_contacts(self, contacts_data: list[dict]) -> list[HubSpotContact]:
+        """Create several contacts in one CRM call."""
+        return self._call(
+            "batch_create_contacts", lambda: self._client.batch_create_contacts(contacts_data)
+        )
+
+    def batch_update_contacts(
+        self, updates: list[tuple[str, dict]]
+    ) -> list[HubSpotContact]:
+        """Update several contacts in one CRM call."""
+        return self._call(
+            "batch_update_contacts", lambda: self._client.batch_update_contacts(updates)
+        )
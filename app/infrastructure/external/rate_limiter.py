@@ -0,0 +1,52 @@
+import threading
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    """
+    Client-side rate limiter: rate calls per second on average, in bursts
+    of up to burst calls.
+
+    Thread-safe. A caller finding the bucket empty reserves the next token
+    and sleeps until it is due, so waiting callers are served in order.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Take a token, waiting for one if needed. Returns the seconds waited."""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    @property
+    def headroom(self) -> float:
+        """Fraction of the burst available right now, 0 when callers are waiting."""
+        with self._lock:
+            self._refill()
+            return max(0.0, self._tokens) / self.burst
@@ -0,0 +1,3 @@
+from app.infrastructure.index.match_index_snapshot import MatchIndexSnapshot
+
+__all__ = ["MatchIndexSnapshot"]
@@ -0,0 +1,374 @@
+"""
+Memory-mapped snapshot of the CRM match index.
+
+Layout (little-endian), every section aligned on 8 bytes:
+
+    header      magic, version, contact count, then per keyed section
+                (LinkedIn ID, email, name, HubSpot ID) its entry count and
+                the positions of its hash and reference arrays, then the
+                positions of the record offsets, records and string table
+    hashes      per keyed section, uint64 key hashes sorted by (hash, position)
+    refs        per keyed section, parallel to hashes: string table offset,
+                key length and contact position
+    offsets     uint64 start of each contact record, plus the end of the last
+    records     JSON of each contact, in CRM list order
+    strings     UTF-8 key bytes, each distinct key stored once
+
+Lookups binary-search the hash array in place, so opening a snapshot only
+maps the file: the OS loads and shares pages between processes on demand.
+
+Processes sharing a snapshot coordinate through an flock on a ".lock" file
+next to it: rewrites and delta changes hold it exclusively, opening holds
+it shared, so the snapshot and its delta are always read as a pair.
+"""
+
+import fcntl
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from bisect import bisect_left
+from contextlib import contextmanager
+from hashlib import blake2b
+from typing import Iterable, Iterator
+
+from app.domain import HubSpotContact, MatchKeys
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"MIX1"
+_VERSION = 1
+
+# Keyed sections: the match-key tiers in priority order, then the HubSpot ID
+_TIERS = ("linkedin_id", "email", "name")
+_SECTIONS = (*_TIERS, "id")
+
+_HEADER = struct.Struct("<4sIQ" + "QQQ" * len(_SECTIONS) + "QQQ")
+# String table offset, key length, contact position
+_REF = struct.Struct("<QII")
+_OFFSET = struct.Struct("<Q")
+
+_DELTA_SUFFIX = ".delta"
+_LOCK_SUFFIX = ".lock"
+
+
+def _hash_key(key: str) -> int:
+    """Stable 64-bit hash of a key, identical in every process."""
+    return int.from_bytes(blake2b(key.encode(), digest_size=8).digest(), "little")
+
+
+def _section_keys(contact: HubSpotContact) -> tuple[str | None, ...]:
+    """Keys of a contact for each keyed section."""
+    keys = MatchKeys.of_hubspot(contact)
+    return (*(getattr(keys, name) for name in _TIERS), contact.id)
+
+
+@contextmanager
+def _locked(path: str, operation: int = fcntl.LOCK_EX) -> Iterator[None]:
+    """Hold the lock of the snapshot at path, shared by every process using it."""
+    fd = os.open(path + _LOCK_SUFFIX, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, operation)
+        yield
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(fd)
+
+
+def _delta_size(path: str) -> int:
+    try:
+        return os.path.getsize(path + _DELTA_SUFFIX)
+    except FileNotFoundError:
+        return 0
+
+
+def _replace_atomically(path: str, data: bytes) -> None:
+    """Write data to a unique file next to path, then move it over path."""
+    fd, temporary_path = tempfile.mkstemp(
+        dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + "."
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+def _truncate_partial_line(fd: int) -> None:
+    """Cut a file open at fd back to its last complete line."""
+    size = os.fstat(fd).st_size
+    if size == 0 or os.pread(fd, 1, size - 1) == b"\n":
+        return
+    # Partial lines are a single record, so the last newline is near the end
+    start = size
+    while start > 0:
+        start = max(0, start - 64 * 1024)
+        end = os.pread(fd, size - start, start).rfind(b"\n")
+        if end != -1:
+            os.ftruncate(fd, start + end + 1)
+            return
+    os.ftruncate(fd, 0)
+
+
+def _pad(buffer: bytearray) -> int:
+    """Align the buffer on 8 bytes and return its length."""
+    buffer.extend(b"\0" * (-len(buffer) % 8))
+    return len(buffer)
+
+
+class MatchIndexSnapshot:
+    """
+    Read-only, memory-mapped CRM match index with an in-memory delta.
+
+    find() has the semantics of HubSpotMatchIndex over the CRM contact list:
+    LinkedIn ID, then email, then name, and the first contact in list order
+    wins within a tier. Contacts applied as a delta replace the snapshot
+    contact with the same HubSpot ID, keeping its position, or are appended
+    after the snapshot contacts.
+
+    Deltas written with append_delta are replayed when the snapshot is
+    opened. Writing a new snapshot discards the deltas appended before it
+    started reading the contacts; later ones may be missing from them, so
+    they are kept.
+    """
+
+    def __init__(self, path: str):
+        if sys.byteorder != "little":
+            raise ValueError("Match index snapshots require a little-endian host")
+
+        self._path = path
+        with _locked(path, fcntl.LOCK_SH):
+            self._file = open(path, "rb")
+            delta_lines = self._read_delta()
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        fields = _HEADER.unpack_from(self._mmap)
+        magic, version, self._snapshot_count = fields[:3]
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Not a match index snapshot: {path}")
+        sections = fields[3:3 + 3 * len(_SECTIONS)]
+        self._offsets_pos, self._records_pos, self._strings_pos = fields[-3:]
+
+        self._hashes = []
+        self._refs_pos = []
+        for i in range(len(_SECTIONS)):
+            count, hashes_pos, refs_pos = sections[3 * i:3 * i + 3]
+            self._hashes.append(self._view[hashes_pos:hashes_pos + 8 * count].cast("Q"))
+            self._refs_pos.append(refs_pos)
+
+        self._count = self._snapshot_count
+        # Delta: contacts by position, and per tier the positions having a key
+        self._delta_contacts: dict[int, HubSpotContact] = {}
+        self._delta_positions: dict[str, int] = {}
+        self._delta_keys: list[dict[str, set[int]]] = [{} for _ in _TIERS]
+
+        self.apply(self._parse_delta(delta_lines))
+
+    @classmethod
+    def write(cls, path: str, hubspot_contacts: Iterable[HubSpotContact]) -> None:
+        """Write a snapshot of the contacts, in CRM list order, replacing any previous one."""
+        with _locked(path):
+            # Deltas up to here are older than the contacts read below
+            replayed_size = _delta_size(path)
+        contacts = list(hubspot_contacts)
+        strings = bytearray()
+        string_offsets: dict[str, int] = {}
+        entries: list[list[tuple[int, int, int, int]]] = [[] for _ in _SECTIONS]
+
+        for position, contact in enumerate(contacts):
+            for section, key in enumerate(_section_keys(contact)):
+                if not key:
+                    continue
+                encoded = key.encode()
+                if key not in string_offsets:
+                    string_offsets[key] = len(strings)
+                    strings.extend(encoded)
+                entries[section].append(
+                    (_hash_key(key), position, string_offsets[key], len(encoded))
+                )
+
+        body = bytearray(b"\0" * _HEADER.size)
+        section_fields: list[int] = []
+        for section_entries in entries:
+            section_entries.sort()
+            hashes_pos = _pad(body)
+            for key_hash, *_ in section_entries:
+                body.extend(_OFFSET.pack(key_hash))
+            refs_pos = _pad(body)
+            for _, position, string_offset, length in section_entries:
+                body.extend(_REF.pack(string_offset, length, position))
+            section_fields.extend((len(section_entries), hashes_pos, refs_pos))
+
+        records = [json.dumps(contact.to_dict()).encode() for contact in contacts]
+        offsets_pos = _pad(body)
+        records_pos = offsets_pos + _OFFSET.size * (len(records) + 1)
+        record_offset = 0
+        for record in (*records, b""):
+            body.extend(_OFFSET.pack(record_offset))
+            record_offset += len(record)
+        for record in records:
+            body.extend(record)
+        strings_pos = _pad(body)
+        body.extend(strings)
+
+        _HEADER.pack_into(
+            body, 0, _MAGIC, _VERSION, len(contacts), *section_fields,
+            offsets_pos, records_pos, strings_pos,
+        )
+
+        with _locked(path):
+            _replace_atomically(path, body)
+            cls._discard_delta(path, replayed_size)
+
+    @staticmethod
+    def append_delta(path: str, hubspot_contacts: Iterable[HubSpotContact]) -> None:
+        """
+        Persist created or updated contacts, to be applied when the snapshot is opened.
+
+        The contacts are appended in a single write. A partial last line,
+        left by a process that died while appending, is cut off first.
+        """
+        data = b"".join(
+            json.dumps(contact.to_dict()).encode() + b"\n" for contact in hubspot_contacts
+        )
+        if not data:
+            return
+        with _locked(path):
+            fd = os.open(path + _DELTA_SUFFIX, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                _truncate_partial_line(fd)
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+
+    @staticmethod
+    def _discard_delta(path: str, size: int) -> None:
+        """Drop the first size bytes of the delta, keeping what was appended after them."""
+        delta_path = path + _DELTA_SUFFIX
+        if _delta_size(path) <= size:
+            if os.path.exists(delta_path):
+                os.remove(delta_path)
+            return
+        with open(delta_path, "rb") as delta:
+            delta.seek(size)
+            _replace_atomically(delta_path, delta.read())
+
+    def _parse_delta(self, lines: list[bytes]) -> Iterator[HubSpotContact]:
+        """Contacts of the delta lines, skipping lines that cannot be read."""
+        for number, line in enumerate(lines, 1):
+            try:
+                yield HubSpotContact.from_dict(json.loads(line))
+            except (ValueError, KeyError, TypeError):
+                logger.warning(
+                    "Skipping unreadable line %d of %s%s", number, self._path, _DELTA_SUFFIX
+                )
+
+    def _read_delta(self) -> list[bytes]:
+        try:
+            with open(self._path + _DELTA_SUFFIX, "rb") as delta:
+                return delta.readlines()
+        except FileNotFoundError:
+            return []
+
+    def apply(self, hubspot_contacts: Iterable[HubSpotContact]) -> None:
+        """Apply created or updated contacts on top of the snapshot, in memory."""
+        for contact in hubspot_contacts:
+            position = self._position_of(contact.id)
+            if position is None:
+                position = self._count
+                self._count += 1
+            self._delta_contacts[position] = contact
+            self._delta_positions[contact.id] = position
+            for tier, key in enumerate(_section_keys(contact)[:len(_TIERS)]):
+                if key:
+                    self._delta_keys[tier].setdefault(key, set()).add(position)
+
+    def find(self, keys: MatchKeys) -> HubSpotContact | None:
+        """Find the match for a set of keys, by priority order."""
+        for tier, name in enumerate(_TIERS):
+            key = getattr(keys, name)
+            if not key:
+                continue
+            position = self._first_position(tier, key)
+            if position is not None:
+                return self._contact_at(position)
+        return None
+
+    def get(self, hubspot_id: str) -> HubSpotContact | None:
+        """Get a contact by HubSpot ID."""
+        position = self._position_of(hubspot_id)
+        return None if position is None else self._contact_at(position)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        """Unmap the snapshot."""
+        for hashes in self._hashes:
+            hashes.release()
+        self._hashes = []
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> "MatchIndexSnapshot":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _snapshot_positions(self, section: int, key: str) -> Iterator[int]:
+        """Snapshot positions of contacts having a key, in increasing order."""
+        hashes = self._hashes[section]
+        key_hash = _hash_key(key)
+        encoded = key.encode()
+        refs_pos = self._refs_pos[section]
+        index = bisect_left(hashes, key_hash)
+        while index < len(hashes) and hashes[index] == key_hash:
+            string_offset, length, position = _REF.unpack_from(
+                self._mmap, refs_pos + _REF.size * index
+            )
+            start = self._strings_pos + string_offset
+            if length == len(encoded) and self._mmap[start:start + length] == encoded:
+                yield position
+            index += 1
+
+    def _first_position(self, tier: int, key: str) -> int | None:
+        """First position, snapshot or delta, of a current contact having a key."""
+        best = next(
+            (
+                position
+                for position in self._snapshot_positions(tier, key)
+                if position not in self._delta_contacts
+            ),
+            None,
+        )
+        for position in self._delta_keys[tier].get(key, ()):
+            if best is not None and position >= best:
+                continue
+            # A later delta may have changed this contact's keys
+            if getattr(MatchKeys.of_hubspot(self._delta_contacts[position]), _TIERS[tier]) == key:
+                best = position
+        return best
+
+    def _position_of(self, hubspot_id: str) -> int | None:
+        position = self._delta_positions.get(hubspot_id)
+        if position is None:
+            position = next(self._snapshot_positions(len(_TIERS), hubspot_id), None)
+        return position
+
+    def _contact_at(self, position: int) -> HubSpotContact:
+        contact = self._delta_contacts.get(position)
+        if contact is not None:
+            return contact
+        start, end = struct.unpack_from(
+            "<QQ", self._mmap, self._offsets_pos + _OFFSET.size * position
+        )
+        record = self._mmap[self._records_pos + start:self._records_pos + end]
+        return HubSpotContact.from_dict(json.loads(record))
@@ -0,0 +1,19 @@
+from app.infrastructure.metrics.middleware import HttpMetricsMiddleware
+from app.infrastructure.metrics.registry import (
+    CONTENT_TYPE,
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+)
+
+__all__ = [
+    "CONTENT_TYPE",
+    "REGISTRY",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "HttpMetricsMiddleware",
+    "MetricsRegistry",
+]
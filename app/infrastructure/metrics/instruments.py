@@ -0,0 +1,92 @@
+"""Metrics of the application, exposed on /metrics."""
+
+from app.infrastructure.metrics.registry import REGISTRY, Counter, Gauge, Histogram
+
+# Push jobs last from milliseconds to many minutes
+_JOB_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0)
+_WAIT_BUCKETS = (0.001, 0.01, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 600.0)
+# Statements run by one request or job
+_STATEMENT_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 50000)
+# Event loop lag is normally well under a millisecond
+_LAG_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Pool waits are normally well under a millisecond
+_POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+# Jobs
+
+PUSH_JOBS = REGISTRY.register(Counter(
+    "push_jobs", "Push jobs processed, by outcome", ("status",)
+))
+PUSH_JOB_DURATION = REGISTRY.register(Histogram(
+    "push_job_duration_seconds", "Processing time of push jobs, by outcome", ("status",),
+    buckets=_JOB_BUCKETS,
+))
+
+# Task executor
+
+TASKS_QUEUED = REGISTRY.register(Gauge(
+    "task_queue_depth", "Tasks submitted and waiting for a worker thread", ("task",)
+))
+TASKS_RUNNING = REGISTRY.register(Gauge(
+    "tasks_running", "Tasks running on a worker thread", ("task",)
+))
+TASK_QUEUE_WAIT = REGISTRY.register(Histogram(
+    "task_queue_wait_seconds", "Time from task submission to its start", ("task",),
+    buckets=_WAIT_BUCKETS,
+))
+
+# Event loop
+
+EVENT_LOOP_LAG = REGISTRY.register(Histogram(
+    "event_loop_lag_seconds", "Delay of event loop callbacks past their scheduled time",
+    buckets=_LAG_BUCKETS,
+))
+EVENT_LOOP_STALLS = REGISTRY.register(Counter(
+    "event_loop_stalls", "Event loop blocked beyond the stall threshold"
+))
+
+# CRM
+
+CRM_REQUESTS = REGISTRY.register(Counter(
+    "crm_requests", "CRM client calls, by operation", ("operation",)
+))
+CRM_REQUEST_ERRORS = REGISTRY.register(Counter(
+    "crm_request_errors", "Failed CRM client calls, by operation and error", ("operation", "error")
+))
+CRM_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "crm_request_duration_seconds", "Latency of CRM client calls, by operation", ("operation",)
+))
+
+# Database pool
+
+DB_POOL_CHECKOUTS = REGISTRY.register(Counter(
+    "db_pool_checkouts", "Connections checked out of the pool"
+))
+DB_POOL_CHECKOUT_WAIT = REGISTRY.register(Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection",
+    buckets=_POOL_WAIT_BUCKETS,
+))
+DB_POOL_CHECKED_OUT = REGISTRY.register(Gauge(
+    "db_pool_checked_out", "Connections currently checked out"
+))
+DB_POOL_SIZE = REGISTRY.register(Gauge(
+    "db_pool_size", "Configured size of the connection pool"
+))
+DB_POOL_OVERFLOW = REGISTRY.register(Gauge(
+    "db_pool_overflow", "Connections open beyond the pool size (negative: unused pool slots)"
+))
+
+DB_SCOPE_STATEMENTS = REGISTRY.register(Histogram(
+    "db_scope_statements", "SQL statements run per HTTP request or job", ("scope",),
+    buckets=_STATEMENT_BUCKETS,
+))
+DB_SCOPE_SECONDS = REGISTRY.register(Histogram(
+    "db_scope_seconds", "Time spent in SQL statements per HTTP request or job", ("scope",)
+))
+
+# HTTP
+
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "Latency of HTTP requests, by route template",
+    ("method", "route", "status"),
+))
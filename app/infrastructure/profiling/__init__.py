@@ -0,0 +1,9 @@
+from app.infrastructure.profiling.job_profiler import JobProfiler
+from app.infrastructure.profiling.sampler import sample_stacks, to_collapsed, to_pstats
+
+__all__ = [
+    "JobProfiler",
+    "sample_stacks",
+    "to_collapsed",
+    "to_pstats",
+]
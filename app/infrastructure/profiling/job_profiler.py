@@ -0,0 +1,66 @@
+"""Deterministic profiles of individual push jobs, stored by job ID."""
+
+import cProfile
+import logging
+import os
+import random
+from contextlib import contextmanager
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+# Fraction of push jobs run under cProfile (0: only jobs asked for with X-Profile-Job)
+PROFILE_JOB_SAMPLE_RATE = float(os.getenv("PROFILE_JOB_SAMPLE_RATE", "0"))
+# Directory of the job profiles, one job-<id>.pstats file per job
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+
+
+class JobProfiler:
+    """
+    Runs selected jobs under cProfile and keeps their pstats file.
+
+    Jobs not selected run as they would without it. cProfile follows the
+    thread running the job, which does the fetch and persist phases; match
+    and CRM write stages run in pipeline threads.
+    """
+
+    def __init__(self, directory: str = PROFILE_DIR, sample_rate: float = PROFILE_JOB_SAMPLE_RATE):
+        self._directory = directory
+        self._sample_rate = sample_rate
+
+    def should_profile(self, requested: bool = False) -> bool:
+        """Whether to profile a job: when requested, or at the sample rate."""
+        return requested or (self._sample_rate > 0 and random.random() < self._sample_rate)
+
+    @contextmanager
+    def profile(self, job_id: int) -> Iterator[None]:
+        """Profile the block and store its stats for the job."""
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Only one profiler can be active at a time on Python 3.12+
+            logger.warning("Push job %s not profiled: another profile is running", job_id)
+            profiler = None
+        if profiler is None:
+            yield
+            return
+
+        try:
+            yield
+        finally:
+            profiler.disable()
+            os.makedirs(self._directory, exist_ok=True)
+            profiler.dump_stats(self.path(job_id))
+            logger.info("Push job %s profile written to %s", job_id, self.path(job_id))
+
+    def path(self, job_id: int) -> str:
+        return os.path.join(self._directory, f"job-{job_id}.pstats")
+
+    def load(self, job_id: int) -> bytes | None:
+        """The stored pstats file of a job, None if it was not profiled."""
+        try:
+            with open(self.path(job_id), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
@@ -0,0 +1,105 @@
+"""
+Wall-clock stack sampler for the whole process.
+
+Samples the stack of every thread at a fixed interval, without
+instrumenting code, so a running server can be profiled on demand.
+Results are exported as collapsed stacks, for flame graph tools, or as a
+pstats file with times estimated from the sample counts.
+"""
+
+import marshal
+import sys
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+
+# A function: (filename, first line, name), as keyed in pstats
+Function = tuple[str, int, str]
+# Samples of (thread name, stack from the outermost frame)
+Samples = Counter[tuple[str, tuple[Function, ...]]]
+
+
+def sample_stacks(seconds: float, interval: float = 0.01) -> Samples:
+    """Sample the stacks of all other threads every interval, for seconds."""
+    own = threading.get_ident()
+    samples: Samples = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            stack.reverse()
+            samples[(names.get(ident, str(ident)), tuple(stack))] += 1
+        time.sleep(interval)
+    return samples
+
+
+@lru_cache(maxsize=4096)
+def _short_path(filename: str) -> str:
+    """The filename relative to the longest sys.path entry containing it."""
+    best = ""
+    for entry in sys.path:
+        if entry and filename.startswith(entry.rstrip("/") + "/") and len(entry) > len(best):
+            best = entry.rstrip("/") + "/"
+    return filename[len(best):]
+
+
+def to_collapsed(samples: Samples) -> str:
+    """Samples as collapsed stacks: "thread;outer (file:line);...;inner count" per line."""
+    lines = []
+    for (thread, stack), count in samples.most_common():
+        frames = [thread.replace(";", ":")] + [
+            f"{name} ({_short_path(filename)}:{line})" for filename, line, name in stack
+        ]
+        lines.append(f"{';'.join(frames)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def to_pstats(samples: Samples, interval: float) -> bytes:
+    """
+    Samples as a pstats file, loadable with pstats.Stats or snakeviz.
+
+    Each sample counts as interval seconds: its innermost function gets it
+    as own time, every function on the stack as cumulative time. Call
+    counts are sample counts.
+    """
+    # function -> [samples on stack, own samples, cumulative time, callers]
+    stats: dict[Function, list] = {}
+    for (_, stack), count in samples.items():
+        if not stack:
+            continue
+        seconds = count * interval
+        seen = set()
+        for depth, function in enumerate(stack):
+            entry = stats.setdefault(function, [0, 0, 0.0, {}])
+            if function not in seen:
+                seen.add(function)
+                entry[0] += count
+                entry[2] += seconds
+            if depth:
+                caller = entry[3].setdefault(stack[depth - 1], [0, 0, 0.0, 0.0])
+                caller[0] += count
+                caller[1] += count
+                caller[3] += seconds
+        stats[stack[-1]][1] += count
+        leaf_callers = stats[stack[-1]][3]
+        if len(stack) > 1:
+            leaf_callers[stack[-2]][2] += seconds
+
+    return marshal.dumps({
+        function: (
+            calls,
+            calls,
+            own * interval,
+            cumulative,
+            {caller: tuple(edge) for caller, edge in callers.items()},
+        )
+        for function, (calls, own, cumulative, callers) in stats.items()
+    })
@@ -1,3 +1,19 @@
-from app.infrastructure.task.async_executor import AsyncTaskExecutor
+from app.infrastructure.task.async_executor import AsyncTaskExecutor, ExecutorShutdownError
+from app.infrastructure.task.blocking_guard import (
+    BlockingCallError,
+    BlockingCallGuardMiddleware,
+    install_blocking_guard,
+    uninstall_blocking_guard,
+)
+from app.infrastructure.task.loop_watchdog import EventLoopWatchdog, LoopStall
 
-__all__ = ["AsyncTaskExecutor"]
+__all__ = [
+    "AsyncTaskExecutor",
+    "BlockingCallError",
+    "BlockingCallGuardMiddleware",
+    "EventLoopWatchdog",
+    "ExecutorShutdownError",
+    "LoopStall",
+    "install_blocking_guard",
+    "uninstall_blocking_guard",
+]
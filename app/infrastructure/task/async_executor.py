@@ -1,14 +1,129 @@
 import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
 from typing import Callable
 
+from app.infrastructure.metrics.instruments import TASK_QUEUE_WAIT, TASKS_QUEUED, TASKS_RUNNING
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorShutdownError(RuntimeError):
+    """Raised when work is submitted to an executor that is shutting down."""
+
+
+@dataclass(eq=False)
+class TrackedTask:
+    """A task submitted to the executor, kept until it finishes."""
+
+    name: str
+    args: tuple
+    kwargs: dict
+    future: asyncio.Future | None = None
+    started: bool = False
+    released: bool = False
+    submitted_at: float = field(default_factory=time.monotonic)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
 
 class AsyncTaskExecutor:
+    """
+    Runs registered tasks in worker threads and keeps track of them.
+
+    Tasks still waiting for a worker thread when shutdown begins are released
+    without running, so their job can be picked up again later.
+
+    Reports, per task name, the tasks queued and running and the time tasks
+    waited for a worker thread.
+    """
+
     def __init__(self):
         self.tasks = {}
+        self._in_flight: set[TrackedTask] = set()
+        self._accepting = True
+
+    @property
+    def accepting(self) -> bool:
+        """Whether the executor still accepts new work."""
+        return self._accepting
+
+    @property
+    def in_flight(self) -> list[TrackedTask]:
+        """Tasks that have been submitted and have not finished yet."""
+        return list(self._in_flight)
+
+    @property
+    def queued(self) -> int:
+        """Tasks submitted and still waiting for a worker thread."""
+        return sum(
+            1 for tracked in list(self._in_flight) if not tracked.started and not tracked.released
+        )
 
     def add_task(self, name: str, task: Callable):
         self.tasks[name] = task
 
     def execute(self, name: str, *args, **kwargs):
+        if not self._accepting:
+            raise ExecutorShutdownError(
+                f"Executor is shutting down, cannot run task '{name}'"
+            )
+
         task = self.tasks[name]
-        asyncio.create_task(asyncio.to_thread(task, *args, **kwargs))
+        tracked = TrackedTask(name=name, args=args, kwargs=kwargs)
+        # to_thread runs the task in a copy of this context: its spans join the caller's trace
+        tracked.future = asyncio.create_task(
+            asyncio.to_thread(self._run, tracked, task)
+        )
+        self._in_flight.add(tracked)
+        TASKS_QUEUED.labels(name).inc()
+        tracked.future.add_done_callback(lambda _: self._in_flight.discard(tracked))
+        return tracked
+
+    def _run(self, tracked: TrackedTask, task: Callable) -> None:
+        """Run a task in a worker thread unless shutdown started before it did."""
+        TASKS_QUEUED.labels(tracked.name).dec()
+        with tracked._lock:
+            if not self._accepting:
+                tracked.released = True
+                return
+            tracked.started = True
+        TASK_QUEUE_WAIT.labels(tracked.name).observe(time.monotonic() - tracked.submitted_at)
+
+        running = TASKS_RUNNING.labels(tracked.name)
+        running.inc()
+        try:
+            task(*tracked.args, **tracked.kwargs)
+        finally:
+            running.dec()
+
+    async def shutdown(self, grace_period: float) -> list[TrackedTask]:
+        """
+        Stop accepting work and wait for in-flight tasks to finish.
+
+        Args:
+            grace_period: Maximum number of seconds to wait for running tasks.
+
+        Returns:
+            Tasks that did not complete: those released before they started
+            and those still running when the grace period expired.
+        """
+        self._accepting = False
+        tracked_tasks = list(self._in_flight)
+        pending = [t.future for t in tracked_tasks if t.future is not None]
+
+        if pending:
+            await asyncio.wait(pending, timeout=grace_period)
+
+        unfinished = []
+        for tracked in tracked_tasks:
+            if tracked.released or not tracked.future.done():
+                unfinished.append(tracked)
+            elif tracked.future.exception() is not None:
+                logger.warning(
+                    "Task '%s' failed during shutdown: %s",
+                    tracked.name,
+                    tracked.future.exception(),
+                )
+        return unfinished
@@ -0,0 +1,94 @@
+"""
+Development check for blocking calls made on the event loop.
+
+Once installed, SQL statements, time.sleep and synchronous httpx requests
+raise BlockingCallError when made from the event loop thread while it
+handles an HTTP request, as sync code called directly from an async def
+route would. Calls moved to a worker thread, such as with
+run_in_threadpool, pass. Not meant for production: it slows down every
+guarded call.
+"""
+
+import asyncio
+import os
+import time
+from contextvars import ContextVar
+
+import httpx
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Raise on blocking calls made on the event loop by request handlers (development only)
+LOOP_RAISE_ON_BLOCKING_CALLS = (
+    os.getenv("LOOP_RAISE_ON_BLOCKING_CALLS", "false").lower() == "true"
+)
+
+_handling_request: ContextVar[bool] = ContextVar("handling_request", default=False)
+
+_original_sleep = time.sleep
+_original_send = httpx.Client.send
+
+
+class BlockingCallError(RuntimeError):
+    """Raised when a request handler blocks the event loop."""
+
+
+def _check(call: str) -> None:
+    if not _handling_request.get():
+        return
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # A worker thread: blocking is fine here
+        return
+    raise BlockingCallError(
+        f"{call} blocks the event loop; run it in a worker thread (run_in_threadpool)"
+    )
+
+
+def _guarded_sleep(seconds: float) -> None:
+    _check("time.sleep()")
+    _original_sleep(seconds)
+
+
+def _guarded_send(self, request, **kwargs):
+    _check(f"httpx {request.method} {request.url}")
+    return _original_send(self, request, **kwargs)
+
+
+def _guard_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    _check(f"SQL statement {statement.split(None, 1)[0] if statement else ''}")
+
+
+def install_blocking_guard() -> None:
+    """Make guarded calls check that they are not blocking a request on the event loop."""
+    time.sleep = _guarded_sleep
+    httpx.Client.send = _guarded_send
+    if not event.contains(Engine, "before_cursor_execute", _guard_statement):
+        event.listen(Engine, "before_cursor_execute", _guard_statement)
+
+
+def uninstall_blocking_guard() -> None:
+    time.sleep = _original_sleep
+    httpx.Client.send = _original_send
+    if event.contains(Engine, "before_cursor_execute", _guard_statement):
+        event.remove(Engine, "before_cursor_execute", _guard_statement)
+
+
+class BlockingCallGuardMiddleware:
+    """ASGI middleware marking request handling, where the blocking guard applies."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _handling_request.set(True)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _handling_request.reset(token)
@@ -0,0 +1,102 @@
+"""
+Event loop lag monitoring.
+
+A heartbeat task sleeps for a fixed interval and records how late it wakes
+up: the lag every other coroutine suffered too. A watcher thread notices a
+heartbeat that is overdue while the loop is still blocked, and logs the
+stack of the loop thread at that moment, pointing at the blocking code.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import suppress
+from dataclasses import dataclass
+
+from app.infrastructure.metrics.instruments import EVENT_LOOP_LAG, EVENT_LOOP_STALLS
+
+logger = logging.getLogger(__name__)
+
+# Measure event loop lag in the background
+LOOP_WATCHDOG_ENABLED = os.getenv("LOOP_WATCHDOG_ENABLED", "true").lower() == "true"
+# How often the heartbeat measures the lag
+LOOP_WATCHDOG_INTERVAL = float(os.getenv("LOOP_WATCHDOG_INTERVAL", "0.1"))
+# Lag after which the stack blocking the loop is logged
+LOOP_STALL_THRESHOLD = float(os.getenv("LOOP_STALL_THRESHOLD", "0.25"))
+
+
+@dataclass(frozen=True)
+class LoopStall:
+    """The event loop found blocked, with the stack it was blocked in."""
+
+    blocked_seconds: float
+    stack: str
+
+
+class EventLoopWatchdog:
+    """
+    Records event loop lag on the event_loop_lag_seconds histogram, and the
+    stack of each stall longer than stall_threshold.
+
+    Started and stopped from the loop it watches.
+    """
+
+    def __init__(
+        self,
+        interval: float = LOOP_WATCHDOG_INTERVAL,
+        stall_threshold: float = LOOP_STALL_THRESHOLD,
+    ):
+        self._interval = interval
+        self._stall_threshold = stall_threshold
+        self._last_beat = time.monotonic()
+        self._loop_thread: int | None = None
+        self._heartbeat_task: asyncio.Task | None = None
+        self._watcher: threading.Thread | None = None
+        self._stopped = threading.Event()
+        # Latest stalls, for inspection
+        self.stalls: deque[LoopStall] = deque(maxlen=20)
+
+    async def start(self) -> None:
+        self._loop_thread = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        self._watcher = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watcher.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._heartbeat_task
+        if self._watcher is not None:
+            self._watcher.join()
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self._interval
+            await asyncio.sleep(self._interval)
+            now = time.monotonic()
+            EVENT_LOOP_LAG.observe(max(0.0, now - expected))
+            self._last_beat = now
+
+    def _watch(self) -> None:
+        reported_beat = None
+        # Check often enough to catch the loop while it is still blocked
+        while not self._stopped.wait(min(self._interval, self._stall_threshold) / 2):
+            beat = self._last_beat
+            blocked = time.monotonic() - beat - self._interval
+            if blocked <= self._stall_threshold or beat == reported_beat:
+                continue
+            reported_beat = beat
+            frame = sys._current_frames().get(self._loop_thread)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+            self.stalls.append(LoopStall(blocked_seconds=blocked, stack=stack))
+            EVENT_LOOP_STALLS.inc()
+            logger.warning("Event loop blocked for over %.3fs, in:\n%s", blocked, stack)
@@ -0,0 +1,29 @@
+from app.infrastructure.tracing.exporters import (
+    FileSpanExporter,
+    InMemorySpanExporter,
+    exporter_from_env,
+)
+from app.infrastructure.tracing.tracer import (
+    INVALID_SPAN,
+    Span,
+    SpanExporter,
+    Tracer,
+    get_current_span,
+    get_span_exporter,
+    get_tracer,
+    set_span_exporter,
+)
+
+__all__ = [
+    "INVALID_SPAN",
+    "FileSpanExporter",
+    "InMemorySpanExporter",
+    "Span",
+    "SpanExporter",
+    "Tracer",
+    "exporter_from_env",
+    "get_current_span",
+    "get_span_exporter",
+    "get_tracer",
+    "set_span_exporter",
+]
@@ -0,0 +1,67 @@
+"""Span exporters that work offline: in memory, or JSON lines in a file."""
+
+import json
+import os
+import threading
+from typing import Sequence
+
+from app.infrastructure.tracing.tracer import Span, SpanExporter
+
+# Where spans are exported: "none", "memory" or "file"
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "none").lower()
+# File spans are appended to, one JSON object per line, with TRACING_EXPORTER=file
+TRACING_FILE = os.getenv("TRACING_FILE", "traces.jsonl")
+
+
+class InMemorySpanExporter:
+    """Keeps ended spans in a list, for tests and scripts."""
+
+    def __init__(self):
+        self._spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[Span]) -> None:
+        with self._lock:
+            self._spans.extend(spans)
+
+    def get_finished_spans(self) -> tuple[Span, ...]:
+        with self._lock:
+            return tuple(self._spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+    def shutdown(self) -> None:
+        pass
+
+
+class FileSpanExporter:
+    """Appends ended spans to a file as JSON lines."""
+
+    def __init__(self, path: str = TRACING_FILE):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[Span]) -> None:
+        lines = "".join(json.dumps(span.to_dict(), default=str) + "\n" for span in spans)
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(lines)
+                self._file.flush()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def exporter_from_env() -> SpanExporter | None:
+    """The exporter selected by TRACING_EXPORTER, None when tracing is off."""
+    if TRACING_EXPORTER == "memory":
+        return InMemorySpanExporter()
+    if TRACING_EXPORTER == "file":
+        return FileSpanExporter(TRACING_FILE)
+    if TRACING_EXPORTER not in ("", "none"):
+        raise ValueError(f"Unknown TRACING_EXPORTER: {TRACING_EXPORTER}")
+    return None
@@ -0,0 +1,220 @@
+"""
+Minimal tracing with the shape of the OpenTelemetry API.
+
+    tracer = get_tracer(__name__)
+    with tracer.start_as_current_span("process_job", attributes={"job.id": 1}) as span:
+        span.set_attribute("contacts", 10)
+
+This is not the opentelemetry package, which the app does not depend on:
+only the names of the calls above are shared, so spans cannot be handed to
+an OpenTelemetry SDK or collector, only to the exporters in this package.
+
+Spans are only recorded while an exporter is set; otherwise every span is
+one shared non-recording span, and starting one costs a global lookup.
+The current span lives in a context variable, so it follows asyncio tasks
+and asyncio.to_thread calls; plain threads must be started in a copy of
+the context to join the trace.
+"""
+
+import random
+import time
+from contextvars import ContextVar
+from typing import Protocol, Sequence
+
+_current_span: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+
+
+class SpanExporter(Protocol):
+    """Receives spans as they end."""
+
+    def export(self, spans: Sequence["Span"]) -> None:
+        ...
+
+    def shutdown(self) -> None:
+        ...
+
+
+_exporter: SpanExporter | None = None
+
+
+def set_span_exporter(exporter: SpanExporter | None) -> SpanExporter | None:
+    """Start recording spans to exporter, or stop with None. Returns the previous one."""
+    global _exporter
+    previous, _exporter = _exporter, exporter
+    return previous
+
+
+def get_span_exporter() -> SpanExporter | None:
+    return _exporter
+
+
+class Span:
+    """An operation of a trace, exported when it ends."""
+
+    __slots__ = (
+        "name", "scope", "trace_id", "span_id", "parent_id",
+        "start_time", "end_time", "attributes", "status", "status_description",
+        "_exporter",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        scope: str,
+        parent: "Span | None",
+        attributes: dict | None,
+        exporter: SpanExporter,
+    ):
+        self.name = name
+        self.scope = scope
+        # A parent that already ended, like the request that scheduled a job, still links the trace
+        if parent is not None:
+            self.trace_id = parent.trace_id
+            self.parent_id = parent.span_id
+        else:
+            self.trace_id = f"{random.getrandbits(128):032x}"
+            self.parent_id = None
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.start_time = time.time_ns()
+        self.end_time: int | None = None
+        self.attributes = dict(attributes) if attributes else {}
+        self.status = "UNSET"
+        self.status_description: str | None = None
+        self._exporter = exporter
+
+    def is_recording(self) -> bool:
+        return self.end_time is None
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: dict) -> None:
+        self.attributes.update(attributes)
+
+    def set_status(self, status: str, description: str | None = None) -> None:
+        """Set the status: "OK" or "ERROR"."""
+        self.status = status
+        self.status_description = description
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.attributes["exception.type"] = type(exc).__name__
+        self.attributes["exception.message"] = str(exc)
+
+    def end(self) -> None:
+        if self.end_time is not None:
+            return
+        self.end_time = time.time_ns()
+        self._exporter.export((self,))
+
+    @property
+    def duration_ms(self) -> float | None:
+        if self.end_time is None:
+            return None
+        return (self.end_time - self.start_time) / 1e6
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "scope": self.scope,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+            "status": self.status,
+            "status_description": self.status_description,
+        }
+
+
+class _NonRecordingSpan:
+    """Span returned while tracing is off; every method does nothing."""
+
+    __slots__ = ()
+
+    trace_id = None
+    span_id = None
+
+    def is_recording(self) -> bool:
+        return False
+
+    def set_attribute(self, key: str, value) -> None:
+        pass
+
+    def set_attributes(self, attributes: dict) -> None:
+        pass
+
+    def set_status(self, status: str, description: str | None = None) -> None:
+        pass
+
+    def record_exception(self, exc: BaseException) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+INVALID_SPAN = _NonRecordingSpan()
+
+
+class _NoOpScope:
+    __slots__ = ()
+
+    def __enter__(self) -> _NonRecordingSpan:
+        return INVALID_SPAN
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        return None
+
+
+_NOOP_SCOPE = _NoOpScope()
+
+
+class _SpanScope:
+    """Makes a span current for a block, recording an error it raises, and ends it."""
+
+    __slots__ = ("_span", "_token")
+
+    def __init__(self, span: Span):
+        self._span = span
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        _current_span.reset(self._token)
+        if exc_val is not None:
+            self._span.record_exception(exc_val)
+            self._span.set_status("ERROR", str(exc_val))
+        self._span.end()
+
+
+class Tracer:
+    """Starts spans for one instrumentation scope, usually a module."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def start_span(self, name: str, attributes: dict | None = None) -> "Span | _NonRecordingSpan":
+        """A span child of the current one, which the caller must end()."""
+        exporter = _exporter
+        if exporter is None:
+            return INVALID_SPAN
+        return Span(name, self.name, _current_span.get(), attributes, exporter)
+
+    def start_as_current_span(self, name: str, attributes: dict | None = None):
+        """Context manager running its block in a new span, child of the current one."""
+        exporter = _exporter
+        if exporter is None:
+            return _NOOP_SCOPE
+        return _SpanScope(Span(name, self.name, _current_span.get(), attributes, exporter))
+
+
+def get_tracer(name: str) -> Tracer:
+    return Tracer(name)
+
+
+def get_current_span() -> "Span | _NonRecordingSpan":
+    return _current_span.get() or INVALID_SPAN
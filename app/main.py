@@ -1,14 +1,71 @@
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+
+from app.dependencies import close_crm_client, get_job_executor, get_matching_service
+from app.infrastructure import (
+    BlockingCallGuardMiddleware,
+    EventLoopWatchdog,
+    HttpMetricsMiddleware,
+    QueryStatsMiddleware,
+    install_blocking_guard,
+)
+from app.infrastructure.task.blocking_guard import LOOP_RAISE_ON_BLOCKING_CALLS
+from app.infrastructure.task.loop_watchdog import LOOP_WATCHDOG_ENABLED
+from app.infrastructure.tracing import exporter_from_env, set_span_exporter
+from app.routers import debug_router, health_router, metrics_router, push_router
+
+# Resume jobs left pending by a previous process (single-instance deployments only)
+JOB_RESUME_PENDING_ON_STARTUP = os.getenv("JOB_RESUME_PENDING_ON_STARTUP", "false").lower() == "true"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Resume pending jobs on startup. On shutdown, drain in-flight jobs, flush
+    queued CRM writes and stop matching workers.
+    """
+    span_exporter = exporter_from_env()
+    if span_exporter is not None:
+        set_span_exporter(span_exporter)
+    watchdog = EventLoopWatchdog() if LOOP_WATCHDOG_ENABLED else None
+    if watchdog is not None:
+        await watchdog.start()
+    job_executor = get_job_executor()
+    if JOB_RESUME_PENDING_ON_STARTUP:
+        job_executor.resume_pending_jobs()
+
+    yield
+
+    await job_executor.shutdown()
+    # Jobs still running past the checkpoint timeout may be waiting on queued writes
+    await run_in_threadpool(close_crm_client)
+    get_matching_service().close()
+    if watchdog is not None:
+        await watchdog.stop()
+    if span_exporter is not None:
+        set_span_exporter(None)
+        span_exporter.shutdown()
 
-from app.routers import health_router, push_router
 
 # Initialize FastAPI app
 app = FastAPI(
     title="CRM Push API",
     description="API for pushing contact profiles to HubSpot CRM",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
+if LOOP_RAISE_ON_BLOCKING_CALLS:
+    install_blocking_guard()
+    app.add_middleware(BlockingCallGuardMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(HttpMetricsMiddleware)
+
 # Register routers
 app.include_router(health_router)
+app.include_router(metrics_router)
 app.include_router(push_router)
+app.include_router(debug_router)
@@ -1,9 +1,11 @@
 from app.repositories.base import BaseRepository
 from app.repositories.contact_repository import ContactRepository
+from app.repositories.crm_contact_repository import CrmContactRepository
 from app.repositories.push_job_repository import PushJobRepository
 
 __all__ = [
     "BaseRepository",
     "ContactRepository",
+    "CrmContactRepository",
     "PushJobRepository",
 ]
@@ -11,6 +11,9 @@ CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 ResponseSchemaType = TypeVar("ResponseSchemaType", bound=BaseModel)
 
+# Bound parameters per IN clause, below the limits of every supported database
+IN_CLAUSE_CHUNK_SIZE = 500
+
 
 class BaseRepository(ABC, Generic[ModelType, CreateSchemaType, UpdateSchemaType, ResponseSchemaType]):
     """
@@ -1,7 +1,9 @@
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
+from app.domain import normalize_email, normalize_linkedin_id
 from app.infrastructure import Contact
-from app.repositories.base import BaseRepository
+from app.repositories.base import IN_CLAUSE_CHUNK_SIZE, BaseRepository
 from app.schemas.contact import ContactCreate, ContactResponse, ContactUpdate
 
 
@@ -34,19 +36,19 @@ class ContactRepository(BaseRepository[Contact, ContactCreate, ContactUpdate, Co
         return self._to_response_list(db_objs)
 
     def get_by_email(self, email: str) -> ContactResponse | None:
-        """Get a contact by email."""
+        """Get a contact by email, ignoring case and surrounding whitespace."""
         db_obj = (
             self._session.query(self._model)
-            .filter(self._model.email == email)
+            .filter(self._model.email_norm == normalize_email(email))
             .first()
         )
         return self._to_response(db_obj)
 
     def get_by_linkedin_id(self, linkedin_id: str) -> ContactResponse | None:
-        """Get a contact by LinkedIn ID."""
+        """Get a contact by LinkedIn ID, ignoring case and surrounding whitespace."""
         db_obj = (
             self._session.query(self._model)
-            .filter(self._model.linkedin_id == linkedin_id)
+            .filter(self._model.linkedin_norm == normalize_linkedin_id(linkedin_id))
             .first()
         )
         return self._to_response(db_obj)
@@ -63,6 +65,52 @@ class ContactRepository(BaseRepository[Contact, ContactCreate, ContactUpdate, Co
         )
         return self._to_response_list(db_objs)
 
+    def get_latest_synced_by_keys(
+        self,
+        emails: list[str],
+        linkedin_ids: list[str],
+        exclude_job_id: int | None = None,
+    ) -> list[ContactResponse]:
+        """
+        Get, for each of the given emails and LinkedIn IDs, the latest contact
+        of an earlier job already synced to HubSpot with that key, most
+        recent first.
+
+        Keys are compared on their normalized form, using the indexed
+        email_norm and linkedin_norm columns. Only the latest row of each
+        key is loaded, however long the sync history.
+        """
+        email_norms = {normalize_email(email) for email in emails} - {None}
+        linkedin_norms = {normalize_linkedin_id(value) for value in linkedin_ids} - {None}
+
+        latest_ids: set[int] = set()
+        for column, keys in (
+            (self._model.email_norm, sorted(email_norms)),
+            (self._model.linkedin_norm, sorted(linkedin_norms)),
+        ):
+            for start in range(0, len(keys), IN_CLAUSE_CHUNK_SIZE):
+                query = (
+                    select(func.max(self._model.id))
+                    .where(
+                        column.in_(keys[start:start + IN_CLAUSE_CHUNK_SIZE]),
+                        self._model.hubspot_id.isnot(None),
+                    )
+                    .group_by(column)
+                )
+                if exclude_job_id is not None:
+                    query = query.where(self._model.job_id != exclude_job_id)
+                latest_ids.update(self._session.scalars(query))
+
+        ids = sorted(latest_ids, reverse=True)
+        db_objs = []
+        for start in range(0, len(ids), IN_CLAUSE_CHUNK_SIZE):
+            db_objs.extend(
+                self._session.query(self._model)
+                .filter(self._model.id.in_(ids[start:start + IN_CLAUSE_CHUNK_SIZE]))
+                .order_by(self._model.id.desc())
+            )
+        return self._to_response_list(db_objs)
+
     def mark_as_completed(self, contact_id: int, hubspot_id: str) -> ContactResponse | None:
         """Mark a contact as completed with HubSpot ID."""
         return self.update(
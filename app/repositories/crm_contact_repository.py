@@ -0,0 +1,155 @@
+from sqlalchemy import and_, delete, func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.domain import ContactIdMatchResult, HubSpotContact, HubSpotContactProperties
+from app.infrastructure import Contact, CrmContact
+from app.repositories.base import IN_CLAUSE_CHUNK_SIZE
+
+_PROPERTY_FIELDS = ("firstname", "lastname", "email", "linkedin_id", "phone", "company")
+
+
+class CrmContactRepository:
+    """
+    Repository for the local mirror of CRM contacts.
+
+    Returns HubSpotContact domain entities. Also runs the three-tier contact
+    matching as a single SQL query against the mirror.
+    """
+
+    def __init__(self, session: Session):
+        self._session = session
+
+    def upsert_many(self, hubspot_contacts: list[HubSpotContact]) -> None:
+        """
+        Insert or update mirrored contacts, keyed by HubSpot ID.
+
+        New contacts are inserted in list order, after the existing ones;
+        existing contacts keep their position.
+        """
+        existing: dict[str, CrmContact] = {}
+        hubspot_ids = [contact.id for contact in hubspot_contacts]
+        for start in range(0, len(hubspot_ids), IN_CLAUSE_CHUNK_SIZE):
+            chunk = hubspot_ids[start:start + IN_CLAUSE_CHUNK_SIZE]
+            for row in self._session.query(CrmContact).filter(CrmContact.hubspot_id.in_(chunk)):
+                existing[row.hubspot_id] = row
+
+        for hubspot_contact in hubspot_contacts:
+            row = existing.get(hubspot_contact.id)
+            if row is None:
+                row = CrmContact(hubspot_id=hubspot_contact.id)
+                self._session.add(row)
+                existing[hubspot_contact.id] = row
+            for field in _PROPERTY_FIELDS:
+                setattr(row, field, getattr(hubspot_contact.properties, field))
+
+        self._session.flush()
+
+    def get_by_hubspot_ids(self, hubspot_ids: list[str]) -> list[HubSpotContact]:
+        """Get mirrored contacts by HubSpot ID, in mirror order, skipping unknown IDs."""
+        rows: list[CrmContact] = []
+        for start in range(0, len(hubspot_ids), IN_CLAUSE_CHUNK_SIZE):
+            chunk = hubspot_ids[start:start + IN_CLAUSE_CHUNK_SIZE]
+            rows.extend(self._session.query(CrmContact).filter(CrmContact.hubspot_id.in_(chunk)))
+        rows.sort(key=lambda row: row.id)
+        return [self._to_entity(row) for row in rows]
+
+    def delete_missing(self, hubspot_ids: set[str]) -> int:
+        """Delete mirrored contacts whose HubSpot ID is not given, returning how many."""
+        missing = [
+            hubspot_id
+            for hubspot_id in self._session.scalars(select(CrmContact.hubspot_id))
+            if hubspot_id not in hubspot_ids
+        ]
+        for start in range(0, len(missing), IN_CLAUSE_CHUNK_SIZE):
+            chunk = missing[start:start + IN_CLAUSE_CHUNK_SIZE]
+            self._session.execute(delete(CrmContact).where(CrmContact.hubspot_id.in_(chunk)))
+        return len(missing)
+
+    def match_job_contacts(
+        self, job_id: int, contact_ids: list[int] | None = None
+    ) -> ContactIdMatchResult:
+        """
+        Match a job's contacts against the mirror, in one query per chunk of
+        contact IDs.
+
+        Each contact is joined to mirrored contacts sharing its normalized
+        LinkedIn ID (tier 1), email (tier 2) or name (tier 3). ROW_NUMBER()
+        keeps, per contact, the candidate with the best tier and then the
+        lowest mirror position, which matches ContactMatchingService.
+
+        Args:
+            job_id: The job whose contacts are matched.
+            contact_ids: Restrict matching to these contacts of the job.
+
+        Returns:
+            Matched (contact ID, HubSpot ID) pairs and unmatched contact IDs,
+            both in contact ID order.
+        """
+        if contact_ids is None:
+            return self._match_contacts([Contact.job_id == job_id])
+
+        matched: list[tuple[int, str]] = []
+        unmatched: list[int] = []
+        contact_ids = sorted(contact_ids)
+        for start in range(0, len(contact_ids), IN_CLAUSE_CHUNK_SIZE):
+            chunk = contact_ids[start:start + IN_CLAUSE_CHUNK_SIZE]
+            result = self._match_contacts([Contact.job_id == job_id, Contact.id.in_(chunk)])
+            matched.extend(result.matched)
+            unmatched.extend(result.unmatched)
+        return ContactIdMatchResult(matched=matched, unmatched=unmatched)
+
+    def _match_contacts(self, job_filter: list) -> ContactIdMatchResult:
+        """Match the contacts selected by job_filter, in contact ID order."""
+        tiers = [
+            (1, Contact.linkedin_norm, CrmContact.linkedin_norm),
+            (2, Contact.email_norm, CrmContact.email_norm),
+            (3, Contact.name_key, CrmContact.name_key),
+        ]
+        candidates = union_all(
+            *(
+                select(
+                    Contact.id.label("contact_id"),
+                    CrmContact.hubspot_id.label("hubspot_id"),
+                    literal(tier).label("tier"),
+                    CrmContact.id.label("position"),
+                )
+                .join(CrmContact, local_key == crm_key)
+                .where(*job_filter)
+                for tier, local_key, crm_key in tiers
+            )
+        ).subquery("candidates")
+
+        ranked = select(
+            candidates.c.contact_id,
+            candidates.c.hubspot_id,
+            func.row_number()
+            .over(
+                partition_by=candidates.c.contact_id,
+                order_by=(candidates.c.tier, candidates.c.position),
+            )
+            .label("rank"),
+        ).subquery("ranked")
+
+        query = (
+            select(Contact.id, ranked.c.hubspot_id)
+            .outerjoin(ranked, and_(ranked.c.contact_id == Contact.id, ranked.c.rank == 1))
+            .where(*job_filter)
+            .order_by(Contact.id)
+        )
+
+        matched: list[tuple[int, str]] = []
+        unmatched: list[int] = []
+        for contact_id, hubspot_id in self._session.execute(query):
+            if hubspot_id is None:
+                unmatched.append(contact_id)
+            else:
+                matched.append((contact_id, hubspot_id))
+        return ContactIdMatchResult(matched=matched, unmatched=unmatched)
+
+    def _to_entity(self, row: CrmContact) -> HubSpotContact:
+        return HubSpotContact(
+            id=row.hubspot_id,
+            properties=HubSpotContactProperties(
+                **{field: getattr(row, field) for field in _PROPERTY_FIELDS}
+            ),
+        )
@@ -51,7 +51,8 @@ class PushJobRepository(BaseRepository[PushJob, PushJobCreate, PushJobUpdate, Pu
         self,
         job_id: int,
         created_count: int = 0,
-        updated_count: int = 0
+        updated_count: int = 0,
+        duplicate_count: int = 0
     ) -> PushJobResponse | None:
         """Mark a job as completed with counts."""
         db_obj = self._session.query(self._model).filter(self._model.id == job_id).first()
@@ -61,6 +62,29 @@ class PushJobRepository(BaseRepository[PushJob, PushJobCreate, PushJobUpdate, Pu
         db_obj.status = "completed"
         db_obj.created_count = created_count
         db_obj.updated_count = updated_count
+        db_obj.duplicate_count = duplicate_count
+        db_obj.updated_at = datetime.now()
+
+        self._session.flush()
+        self._session.refresh(db_obj)
+        return self._to_response(db_obj)
+
+    def save_progress(
+        self,
+        job_id: int,
+        created_count: int = 0,
+        updated_count: int = 0,
+        duplicate_count: int = 0
+    ) -> PushJobResponse | None:
+        """Record partial counts for a job that stays pending to be resumed."""
+        db_obj = self._session.query(self._model).filter(self._model.id == job_id).first()
+        if db_obj is None:
+            return None
+
+        db_obj.status = "pending"
+        db_obj.created_count = created_count
+        db_obj.updated_count = updated_count
+        db_obj.duplicate_count = duplicate_count
         db_obj.updated_at = datetime.now()
 
         self._session.flush()
@@ -81,6 +105,15 @@ class PushJobRepository(BaseRepository[PushJob, PushJobCreate, PushJobUpdate, Pu
         self._session.refresh(db_obj)
         return self._to_response(db_obj)
 
+    def save_timings(self, job_id: int, timings: dict) -> None:
+        """Record the phase timings of the last run of a job."""
+        db_obj = self._session.query(self._model).filter(self._model.id == job_id).first()
+        if db_obj is None:
+            return
+
+        db_obj.timings = timings
+        self._session.flush()
+
     def create_pending_job(self) -> PushJobResponse:
         """Create a new pending job."""
         return self.create(PushJobCreate(status="pending"))
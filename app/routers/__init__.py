@@ -1,7 +1,11 @@
+from app.routers.debug import router as debug_router
 from app.routers.health import router as health_router
+from app.routers.metrics import router as metrics_router
 from app.routers.push import router as push_router
 
 __all__ = [
+    "debug_router",
     "health_router",
+    "metrics_router",
     "push_router",
 ]
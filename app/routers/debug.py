@@ -0,0 +1,88 @@
+import asyncio
+import os
+import threading
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi.responses import Response
+
+from app.dependencies import get_job_profiler, require_admin
+from app.infrastructure.profiling import JobProfiler, sample_stacks, to_collapsed, to_pstats
+from app.schemas import ErrorResponse
+
+# Longest sampling a single /debug/profile request may ask for
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+
+router = APIRouter(prefix="/debug", tags=["Debug"], dependencies=[Depends(require_admin)])
+
+JobProfilerDep = Annotated[JobProfiler, Depends(get_job_profiler)]
+
+# One sampling at a time: concurrent ones would only slow each other down
+_sampling = threading.Lock()
+
+_ADMIN_RESPONSES = {
+    403: {"description": "Missing or wrong X-Admin-Token", "model": ErrorResponse},
+    404: {"description": "Admin endpoints are disabled (no DEBUG_ADMIN_TOKEN)", "model": ErrorResponse},
+}
+
+
+@router.get(
+    "/profile",
+    response_class=Response,
+    summary="Profile the running process",
+    description="Sample the stacks of every thread for some seconds. Requires X-Admin-Token.",
+    responses={
+        200: {"description": "Collapsed stacks (text) or a pstats file"},
+        409: {"description": "Another profile is being sampled", "model": ErrorResponse},
+        **_ADMIN_RESPONSES,
+    },
+)
+async def profile(
+    seconds: Annotated[float, Query(gt=0, le=PROFILE_MAX_SECONDS)] = 10.0,
+    interval: Annotated[float, Query(ge=0.001, le=1.0)] = 0.01,
+    format: Literal["collapsed", "pstats"] = "collapsed",
+) -> Response:
+    """Sample the process in a worker thread, leaving the event loop serving requests."""
+    if not _sampling.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="A profile is already being sampled"
+        )
+    try:
+        samples = await asyncio.to_thread(sample_stacks, seconds, interval)
+    finally:
+        _sampling.release()
+
+    if format == "pstats":
+        return Response(
+            content=to_pstats(samples, interval),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": 'attachment; filename="profile.pstats"'},
+        )
+    return Response(content=to_collapsed(samples), media_type="text/plain; charset=utf-8")
+
+
+@router.get(
+    "/profile/jobs/{job_id}",
+    response_class=Response,
+    summary="Get the profile of a push job",
+    description="The pstats file of a job run with profiling. Requires X-Admin-Token.",
+    responses={
+        200: {"description": "pstats file"},
+        **_ADMIN_RESPONSES,
+    },
+)
+async def job_profile(
+    job_id: Annotated[int, Path(description="The ID of the profiled push job")],
+    profiler: JobProfilerDep,
+) -> Response:
+    """Stored cProfile output of a push job."""
+    content = profiler.load(job_id)
+    if content is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"No profile for job {job_id}"
+        )
+    return Response(
+        content=content,
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="job-{job_id}.pstats"'},
+    )
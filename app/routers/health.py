@@ -1,6 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Response, status
 
-from app.schemas import HealthResponse
+from app.dependencies import get_readiness_service
+from app.schemas import HealthResponse, ReadinessCheckResponse, ReadinessResponse
+from app.services import ReadinessService
 
 router = APIRouter(tags=["Health"])
 
@@ -14,3 +16,33 @@ router = APIRouter(tags=["Health"])
 async def health() -> HealthResponse:
     """Health check endpoint."""
     return HealthResponse(status="ok")
+
+
+@router.get(
+    "/health/ready",
+    response_model=ReadinessResponse,
+    responses={503: {"model": ReadinessResponse, "description": "The pod should shed load"}},
+    summary="Readiness check",
+    description=(
+        "Check that the database answers in time and that the job backlog, database pool "
+        "and CRM rate limit are within their thresholds. Answers 503 when they are not."
+    ),
+)
+async def ready(
+    response: Response,
+    readiness_service: ReadinessService = Depends(get_readiness_service),
+) -> ReadinessResponse:
+    """Readiness check endpoint, for load balancers."""
+    checks = await readiness_service.check()
+    ready = all(check.ok for check in checks)
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return ReadinessResponse(
+        status="ready" if ready else "not_ready",
+        checks={
+            check.name: ReadinessCheckResponse(
+                ok=check.ok, value=check.value, threshold=check.threshold, message=check.message
+            )
+            for check in checks
+        },
+    )
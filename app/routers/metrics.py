@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app.infrastructure.metrics import CONTENT_TYPE, REGISTRY
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get(
+    "/metrics",
+    response_class=Response,
+    summary="Prometheus metrics",
+    description="Jobs, task queue, CRM calls, database pool and HTTP metrics in Prometheus text format.",
+)
+async def metrics() -> Response:
+    """Prometheus scrape endpoint."""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
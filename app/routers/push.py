@@ -1,12 +1,16 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Path, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, status
+from fastapi.concurrency import run_in_threadpool
 
-from app.dependencies import get_job_executor, get_push_service
+from app.dependencies import get_job_executor, get_push_service, is_admin
 from app.domain import JobNotFoundError
+from app.infrastructure import ExecutorShutdownError
+from app.infrastructure.tracing import get_tracer
 from app.schemas import (
     ErrorResponse,
     JobStatus,
+    JobTimingsResponse,
     PushJobCreatedResponse,
     PushJobStatusResponse,
     PushProfilesRequest,
@@ -15,6 +19,8 @@ from app.services import JobExecutorService, PushService
 
 router = APIRouter(prefix="/push", tags=["Push"])
 
+_tracer = get_tracer(__name__)
+
 
 # Type aliases for dependency injection
 PushServiceDep = Annotated[PushService, Depends(get_push_service)]
@@ -30,12 +36,18 @@ JobExecutorDep = Annotated[JobExecutorService, Depends(get_job_executor)]
     responses={
         201: {"description": "Job created successfully"},
         422: {"description": "Validation error", "model": ErrorResponse},
+        503: {"description": "Server is shutting down", "model": ErrorResponse},
     },
 )
 async def push_profiles(
     request: PushProfilesRequest,
     service: PushServiceDep,
     job_executor: JobExecutorDep,
+    x_profile_job: Annotated[
+        bool,
+        Header(description="Run the job under the profiler; needs X-Admin-Token"),
+    ] = False,
+    x_admin_token: Annotated[str | None, Header()] = None,
 ) -> PushJobCreatedResponse:
     """
     Push profiles to HubSpot.
@@ -45,11 +57,25 @@ async def push_profiles(
     2. Update matched contacts
     3. Create new contacts for unmatched profiles
     """
-    push_job = service.create_push_job(
-        [profile.model_dump() for profile in request.profiles]
-    )
+    with _tracer.start_as_current_span(
+        "push_profiles", attributes={"profiles.count": len(request.profiles)}
+    ) as span:
+        # Database work runs in a worker thread, not on the event loop
+        push_job = await run_in_threadpool(
+            service.create_push_job, [profile.model_dump() for profile in request.profiles]
+        )
+        span.set_attribute("job.id", push_job.id)
 
-    job_executor.schedule_push_job(push_job.id)
+        try:
+            job_executor.schedule_push_job(
+                push_job.id, profile=x_profile_job and is_admin(x_admin_token)
+            )
+        except ExecutorShutdownError:
+            # The job stays pending and can be resumed by the next instance
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Server is shutting down. Job {push_job.id} was saved as pending.",
+            )
 
     return PushJobCreatedResponse(
         job_id=str(push_job.id),
@@ -60,6 +86,7 @@ async def push_profiles(
 @router.get(
     "/{job_id}",
     response_model=PushJobStatusResponse,
+    response_model_exclude_unset=True,
     summary="Get push job status",
     description="Get the current status of a push job.",
     responses={
@@ -88,14 +115,14 @@ async def get_push_status(
         )
 
     try:
-        job = service.get_job_status(job_id_int)
+        job = await run_in_threadpool(service.get_job_status, job_id_int)
     except JobNotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=e.message,
         )
 
-    return PushJobStatusResponse(
+    response = PushJobStatusResponse(
         job_id=job_id,
         status=JobStatus(job.status),
         created_at=job.created_at,
@@ -104,3 +131,10 @@ async def get_push_status(
         updated_count=job.updated_count if job.status == "completed" else None,
         error=job.error if job.status == "failed" else None,
     )
+    # Optional fields are only set when available, keeping the base contract unchanged
+    if job.status == "completed":
+        response.duplicate_count = job.duplicate_count or 0
+    if job.timings and job.status != "failed":
+        response.timings = JobTimingsResponse.model_validate(job.timings)
+
+    return response
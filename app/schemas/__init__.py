@@ -13,8 +13,11 @@ from app.schemas.requests import ProfileInput, PushProfilesRequest
 from app.schemas.responses import (
     ErrorResponse,
     HealthResponse,
+    JobTimingsResponse,
     PushJobCreatedResponse,
     PushJobStatusResponse,
+    ReadinessCheckResponse,
+    ReadinessResponse,
 )
 
 __all__ = [
@@ -26,8 +29,11 @@ __all__ = [
     # Responses
     "ErrorResponse",
     "HealthResponse",
+    "JobTimingsResponse",
     "PushJobCreatedResponse",
     "PushJobStatusResponse",
+    "ReadinessCheckResponse",
+    "ReadinessResponse",
     # Contact schemas
     "ContactCreate",
     "ContactResponse",
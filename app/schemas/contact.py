@@ -41,5 +41,8 @@ class ContactResponse(ContactBase):
     job_id: int
     hubspot_id: str | None = None
     status: str | None = None
+    email_norm: str | None = None
+    linkedin_norm: str | None = None
+    name_key: str | None = None
     created_at: datetime
     updated_at: datetime
@@ -21,6 +21,7 @@ class PushJobUpdate(BaseModel):
     error: str | None = None
     created_count: int | None = None
     updated_count: int | None = None
+    duplicate_count: int | None = None
 
 
 class PushJobResponse(PushJobBase):
@@ -32,5 +33,7 @@ class PushJobResponse(PushJobBase):
     error: str | None = None
     created_count: int | None = None
     updated_count: int | None = None
+    duplicate_count: int | None = None
+    timings: dict | None = None
     created_at: datetime
     updated_at: datetime
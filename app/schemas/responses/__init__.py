@@ -1,10 +1,21 @@
 from app.schemas.responses.error import ErrorResponse
-from app.schemas.responses.health import HealthResponse
-from app.schemas.responses.push import PushJobCreatedResponse, PushJobStatusResponse
+from app.schemas.responses.health import (
+    HealthResponse,
+    ReadinessCheckResponse,
+    ReadinessResponse,
+)
+from app.schemas.responses.push import (
+    JobTimingsResponse,
+    PushJobCreatedResponse,
+    PushJobStatusResponse,
+)
 
 __all__ = [
     "ErrorResponse",
     "HealthResponse",
+    "JobTimingsResponse",
     "PushJobCreatedResponse",
     "PushJobStatusResponse",
+    "ReadinessCheckResponse",
+    "ReadinessResponse",
 ]
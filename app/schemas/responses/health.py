@@ -8,3 +8,21 @@ class HealthResponse(BaseModel):
         default="ok",
         description="Health status",
     )
+
+
+class ReadinessCheckResponse(BaseModel):
+    """Outcome of one readiness check."""
+
+    ok: bool = Field(..., description="Whether this check passed")
+    value: float | None = Field(
+        default=None, description="Measured value: seconds, queued jobs or a share between 0 and 1"
+    )
+    threshold: float | None = Field(default=None, description="Limit the value is compared with")
+    message: str | None = Field(default=None, description="Why the check failed or was skipped")
+
+
+class ReadinessResponse(BaseModel):
+    """Response DTO for the readiness check."""
+
+    status: str = Field(..., description="ready, or not_ready when the pod should shed load")
+    checks: dict[str, ReadinessCheckResponse] = Field(..., description="Checks by name")
@@ -19,6 +19,25 @@ class PushJobCreatedResponse(BaseModel):
     )
 
 
+class JobTimingsResponse(BaseModel):
+    """Phase timings and call counts of the last run of a push job."""
+
+    fetch_seconds: float = Field(
+        ...,
+        description="Loading the job's contacts and fetching CRM contacts to match against",
+    )
+    match_seconds: float = Field(..., description="Matching contacts with CRM contacts")
+    update_seconds: float = Field(..., description="Updating matched contacts in the CRM")
+    create_seconds: float = Field(..., description="Creating unmatched contacts in the CRM")
+    persist_seconds: float = Field(..., description="Storing HubSpot IDs on local contacts")
+    total_seconds: float = Field(
+        ...,
+        description="Wall time of the run; phases overlap, so they can add up to more",
+    )
+    crm_calls: int = Field(..., description="CRM client calls made by the run")
+    db_statements: int = Field(..., description="SQL statements run by the run")
+
+
 class PushJobStatusResponse(BaseModel):
     """Response DTO for push job status."""
 
@@ -46,7 +65,15 @@ class PushJobStatusResponse(BaseModel):
         default=None,
         description="Number of contacts updated in HubSpot (only when completed)",
     )
+    duplicate_count: int | None = Field(
+        default=None,
+        description="Number of duplicate profiles merged into another one (only when completed)",
+    )
     error: str | None = Field(
         default=None,
         description="Error message (only when failed)",
     )
+    timings: JobTimingsResponse | None = Field(
+        default=None,
+        description="Where the time of the last run went (only once a run completed or stopped)",
+    )
@@ -1,10 +1,12 @@
 from app.services.contact_matching_service import ContactMatchingService
 from app.services.job_executor_service import JobExecutorService, get_job_executor_service
 from app.services.push_service import PushService
+from app.services.readiness_service import ReadinessService
 
 __all__ = [
     "ContactMatchingService",
     "JobExecutorService",
     "PushService",
+    "ReadinessService",
     "get_job_executor_service",
 ]
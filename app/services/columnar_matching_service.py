@@ -0,0 +1,193 @@
+from typing import Callable, Iterable
+
+from app.domain import (
+    HubSpotContact,
+    HubSpotContactProperties,
+    MatchResult,
+    make_name_key,
+    normalize_email,
+    normalize_linkedin_id,
+)
+from app.schemas import ContactResponse
+from app.services.contact_matching_service import ContactMatchingService, JobMatcher
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency, see the "numpy" extra
+    np = None
+
+# Position marking "no match" in position arrays
+_NO_MATCH = -1
+
+
+# Key of a local contact per tier, in priority order, preferring stored keys
+_LOCAL_TIER_KEYS: tuple[Callable[[ContactResponse], str | None], ...] = (
+    lambda c: c.linkedin_norm or normalize_linkedin_id(c.linkedin_id),
+    lambda c: c.email_norm or normalize_email(c.email),
+    lambda c: c.name_key or make_name_key(c.first_name, c.last_name),
+)
+# Key of a HubSpot contact's properties per tier, in priority order
+_HUBSPOT_TIER_KEYS: tuple[Callable[[HubSpotContactProperties], str | None], ...] = (
+    lambda p: normalize_linkedin_id(p.linkedin_id),
+    lambda p: normalize_email(p.email),
+    lambda p: make_name_key(p.firstname, p.lastname),
+)
+
+
+def _hash_keys(keys: list[str | None]) -> tuple["np.ndarray", "np.ndarray"]:
+    """
+    Hash a key column to int64, with a mask of the rows that have a key.
+
+    Uses the interpreter's string hash, which is cached on str objects and
+    consistent within a process; both sides are hashed in the same process.
+    """
+    hashes = np.fromiter((hash(key) if key else 0 for key in keys), dtype=np.int64, count=len(keys))
+    present = np.fromiter((bool(key) for key in keys), dtype=bool, count=len(keys))
+    return hashes, present
+
+
+class _HashedColumn:
+    """The HubSpot keys of one tier, hashed and sorted once for repeated lookups."""
+
+    def __init__(self, keys: list[str | None]):
+        self._keys = keys
+        self._key_array = np.asarray(keys, dtype=object)
+        self._first_by_key: dict[str, int] | None = None
+
+        hashes, present = _hash_keys(keys)
+        rows = np.flatnonzero(present)
+        # Sorted distinct hashes with the first HubSpot position of each: a
+        # stable sort keeps equal hashes in list order, np.unique returns the
+        # first index of each run
+        order = np.argsort(hashes[rows], kind="stable")
+        self._distinct_hashes, first_index = np.unique(hashes[rows][order], return_index=True)
+        self._first_position = rows[order[first_index]]
+
+    def lookup(self, local_keys: list[str | None]) -> "np.ndarray":
+        """
+        Look up local keys.
+
+        Returns:
+            For each local row, the position of the first HubSpot row with the
+            same key, or -1.
+        """
+        result = np.full(len(local_keys), _NO_MATCH, dtype=np.int64)
+        local_hashes, local_present = _hash_keys(local_keys)
+        local_rows = np.flatnonzero(local_present)
+        if not len(self._distinct_hashes) or not len(local_rows):
+            return result
+
+        wanted = local_hashes[local_rows]
+        slots = np.minimum(
+            np.searchsorted(self._distinct_hashes, wanted), len(self._distinct_hashes) - 1
+        )
+        hits = self._distinct_hashes[slots] == wanted
+        hit_rows = local_rows[hits]
+        candidates = self._first_position[slots[hits]]
+
+        # Confirm hash hits against the keys themselves
+        local_array = np.asarray(local_keys, dtype=object)
+        confirmed = local_array[hit_rows] == self._key_array[candidates]
+        result[hit_rows[confirmed]] = candidates[confirmed]
+
+        collided = hit_rows[~confirmed]
+        if len(collided):
+            # Hash collision: another key owns the slot, resolve with a dict
+            if self._first_by_key is None:
+                self._first_by_key = {}
+                for position, key in enumerate(self._keys):
+                    if key:
+                        self._first_by_key.setdefault(key, position)
+            for row in collided.tolist():
+                result[row] = self._first_by_key.get(local_keys[row], _NO_MATCH)
+
+        return result
+
+
+class _ColumnarJobMatcher:
+    """
+    Matches every partition of a job against the same hashed HubSpot columns.
+
+    The column of a tier is built the first time a partition has contacts
+    left to match at that tier, then reused.
+    """
+
+    def __init__(self, hubspot_contacts: list[HubSpotContact]):
+        self._hubspot_contacts = hubspot_contacts
+        self._columns: list[_HashedColumn | None] = [None] * len(_HUBSPOT_TIER_KEYS)
+
+    def match(self, local_contacts: list[ContactResponse]) -> MatchResult:
+        if not local_contacts:
+            return MatchResult(matched=[], unmatched=[])
+
+        positions = np.full(len(local_contacts), _NO_MATCH, dtype=np.int64)
+        for tier, local_key in enumerate(_LOCAL_TIER_KEYS):
+            pending = np.flatnonzero(positions == _NO_MATCH)
+            if not len(pending):
+                break
+            positions[pending] = self._column(tier).lookup(
+                [local_key(local_contacts[row]) for row in pending.tolist()]
+            )
+
+        matched: list[tuple[ContactResponse, HubSpotContact]] = []
+        unmatched: list[ContactResponse] = []
+        for local_contact, position in zip(local_contacts, positions.tolist()):
+            if position == _NO_MATCH:
+                unmatched.append(local_contact)
+            else:
+                matched.append((local_contact, self._hubspot_contacts[position]))
+        return MatchResult(matched=matched, unmatched=unmatched)
+
+    def close(self) -> None:
+        self._columns = [None] * len(_HUBSPOT_TIER_KEYS)
+
+    def _column(self, tier: int) -> _HashedColumn:
+        column = self._columns[tier]
+        if column is None:
+            hubspot_key = _HUBSPOT_TIER_KEYS[tier]
+            column = _HashedColumn([hubspot_key(c.properties) for c in self._hubspot_contacts])
+            self._columns[tier] = column
+        return column
+
+
+class NumpyContactMatchingService(ContactMatchingService):
+    """
+    Drop-in ContactMatchingService matching over columns of hashed keys.
+
+    Tiers are matched one at a time, in priority order, as int64 hash
+    columns: HubSpot hashes are sorted once per job, local hashes are
+    looked up with np.searchsorted, and hits are confirmed against the key
+    strings. Each tier only looks up the local contacts no earlier tier
+    matched. The working set is hashed key columns instead of dictionaries
+    holding every key.
+
+    Requires the optional "numpy" dependency.
+    """
+
+    def __init__(self):
+        if np is None:
+            raise ImportError(
+                "NumpyContactMatchingService requires numpy: install the 'numpy' extra"
+            )
+        super().__init__(workers=0)
+
+    def start_job(self, hubspot_contacts: Iterable[HubSpotContact]) -> JobMatcher:
+        """
+        Start matching the contacts of a job against HubSpot contacts.
+
+        The HubSpot key column of each tier is hashed and sorted once for
+        the whole job.
+        """
+        return _ColumnarJobMatcher(list(hubspot_contacts))
+
+    def match_contacts(
+        self,
+        local_contacts: list[ContactResponse],
+        hubspot_contacts: list[HubSpotContact],
+    ) -> MatchResult:
+        """
+        Match local contacts with HubSpot contacts.
+
+        Returns a MatchResult containing matched pairs and unmatched contacts.
+        """
+        return _ColumnarJobMatcher(hubspot_contacts).match(local_contacts)
@@ -0,0 +1,77 @@
+from app.domain import ContactGroup, DeduplicationResult, MatchKeys
+from app.schemas import ContactResponse
+
+_MERGED_FIELDS = ("first_name", "last_name", "email", "linkedin_id", "phone", "company")
+
+
+class ContactDeduplicationService:
+    """
+    Service responsible for collapsing duplicate profiles within one job.
+
+    Contacts sharing a normalized LinkedIn ID or email are grouped together,
+    so that each person gets a single CRM operation. Two contacts with
+    different LinkedIn IDs are never grouped, even if they share an email.
+    """
+
+    def deduplicate(self, contacts: list[ContactResponse]) -> DeduplicationResult:
+        """
+        Group contacts by normalized match key.
+
+        Groups keep the order in which their first member appears. Each
+        group's representative is its first member, filled in with the first
+        non-empty value of each field from the other members.
+        """
+        members: list[list[ContactResponse]] = []
+        group_linkedin: list[str | None] = []
+        by_linkedin: dict[str, int] = {}
+        by_email: dict[str, int] = {}
+
+        for contact in contacts:
+            keys = MatchKeys.of_contact(contact)
+            linkedin_key = keys.linkedin_id
+            email_key = keys.email
+
+            index = by_linkedin.get(linkedin_key) if linkedin_key else None
+            if index is None and email_key:
+                index = by_email.get(email_key)
+                if (
+                    index is not None
+                    and linkedin_key
+                    and group_linkedin[index] not in (None, linkedin_key)
+                ):
+                    index = None
+
+            if index is None:
+                index = len(members)
+                members.append([])
+                group_linkedin.append(None)
+
+            members[index].append(contact)
+            if linkedin_key:
+                group_linkedin[index] = group_linkedin[index] or linkedin_key
+                by_linkedin.setdefault(linkedin_key, index)
+            if email_key:
+                by_email.setdefault(email_key, index)
+
+        return DeduplicationResult(
+            groups=[
+                ContactGroup(representative=self._merge(group), members=group)
+                for group in members
+            ]
+        )
+
+    def _merge(self, group: list[ContactResponse]) -> ContactResponse:
+        """Fill the first contact's missing fields from the other members."""
+        first = group[0]
+        if len(group) == 1:
+            return first
+
+        update = {}
+        for field in _MERGED_FIELDS:
+            if getattr(first, field):
+                continue
+            value = next((getattr(c, field) for c in group[1:] if getattr(c, field)), None)
+            if value:
+                update[field] = value
+
+        return first.model_copy(update=update)
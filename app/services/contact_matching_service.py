@@ -1,6 +1,163 @@
-from app.domain import HubSpotContact, MatchResult
+import os
+import threading
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Protocol
+
+from app.domain import (
+    ContactIdMatchResult,
+    HubSpotContact,
+    MatchKeyFilter,
+    MatchKeys,
+    MatchResult,
+    UnitOfWork,
+    make_name_key,
+    normalize_email,
+    normalize_linkedin_id,
+)
 from app.schemas import ContactResponse
 
+# Worker processes used to match large inputs (0 or 1 disables parallel matching)
+MATCH_PROCESS_WORKERS = int(os.getenv("MATCH_PROCESS_WORKERS", "0"))
+# Local contacts per job from which it is matched at once, in worker processes
+MATCH_PARALLEL_MIN_CONTACTS = int(os.getenv("MATCH_PARALLEL_MIN_CONTACTS", "100000"))
+
+# Age after which a job refreshes the CRM mirror of the "sql" backend from the CRM
+MATCH_MIRROR_MAX_AGE_SECONDS = float(os.getenv("MATCH_MIRROR_MAX_AGE_SECONDS", "300"))
+
+# Key tiers in priority order, as positions in a key tuple
+_TIERS = ("linkedin_id", "email", "name")
+
+
+class MatchIndex(Protocol):
+    """Lookup of the HubSpot contact matching a set of keys."""
+
+    def find(self, keys: MatchKeys) -> HubSpotContact | None:
+        """Find the match for a set of keys, by priority order."""
+        ...
+
+
+class JobMatcher(Protocol):
+    """Matching state of one push job, shared by the partitions of its contacts."""
+
+    def match(self, local_contacts: list[ContactResponse]) -> MatchResult:
+        """Match a partition of the job's local contacts."""
+        ...
+
+    def close(self) -> None:
+        """Release the job's matching state."""
+        ...
+
+
+@dataclass
+class HubSpotMatchIndex:
+    """Lookup tables from normalized match key to the first HubSpot contact having it."""
+
+    by_linkedin_id: dict[str, HubSpotContact] = field(default_factory=dict)
+    by_email: dict[str, HubSpotContact] = field(default_factory=dict)
+    by_name: dict[str, HubSpotContact] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, hubspot_contacts: list[HubSpotContact]) -> "HubSpotMatchIndex":
+        """Index HubSpot contacts, keeping the first contact seen for each key."""
+        index = cls()
+        for hubspot_contact in hubspot_contacts:
+            keys = MatchKeys.of_hubspot(hubspot_contact)
+            if keys.linkedin_id:
+                index.by_linkedin_id.setdefault(keys.linkedin_id, hubspot_contact)
+            if keys.email:
+                index.by_email.setdefault(keys.email, hubspot_contact)
+            if keys.name:
+                index.by_name.setdefault(keys.name, hubspot_contact)
+        return index
+
+    def find(self, keys: MatchKeys) -> HubSpotContact | None:
+        """Find the match for a set of keys, by priority order."""
+        if keys.linkedin_id and keys.linkedin_id in self.by_linkedin_id:
+            return self.by_linkedin_id[keys.linkedin_id]
+        if keys.email and keys.email in self.by_email:
+            return self.by_email[keys.email]
+        if keys.name and keys.name in self.by_name:
+            return self.by_name[keys.name]
+        return None
+
+
+# Raw key fields of a contact: LinkedIn ID, email, stored name key, first and last name
+_KeyRow = tuple[str | None, str | None, str | None, str | None, str | None]
+# Keys of one partition per tier, as (list position, normalized key) pairs
+_TierKeys = list[list[tuple[int, str]]]
+
+
+def _bucket_keys(start: int, rows: list[_KeyRow], partitions: int) -> list[_TierKeys]:
+    """
+    Normalize a chunk of key rows and bucket the keys by partition and tier.
+    Runs in a worker process.
+    """
+    buckets: list[_TierKeys] = [[[] for _ in _TIERS] for _ in range(partitions)]
+    for position, (linkedin_id, email, name_key, first_name, last_name) in enumerate(rows, start):
+        keys = (
+            normalize_linkedin_id(linkedin_id),
+            normalize_email(email),
+            name_key or make_name_key(first_name, last_name),
+        )
+        for tier, key in enumerate(keys):
+            if key:
+                buckets[_partition_of(key, partitions)][tier].append((position, key))
+    return buckets
+
+
+def _match_key_partition(hubspot_keys: _TierKeys, local_keys: _TierKeys) -> list[tuple[int, int, int]]:
+    """
+    Match one partition of the key space. Runs in a worker process.
+
+    Returns:
+        (local position, tier, HubSpot position) for every local key found,
+        with the first HubSpot position having that key.
+    """
+    found: list[tuple[int, int, int]] = []
+    for tier, (hubspot_entries, local_entries) in enumerate(zip(hubspot_keys, local_keys)):
+        if not local_entries:
+            continue
+        first_position: dict[str, int] = {}
+        for position, key in hubspot_entries:
+            first_position.setdefault(key, position)
+        for local_position, key in local_entries:
+            hubspot_position = first_position.get(key)
+            if hubspot_position is not None:
+                found.append((local_position, tier, hubspot_position))
+    return found
+
+
+def _partition_of(key: str, partitions: int) -> int:
+    """Stable partition of a key, identical in every process."""
+    return zlib.crc32(key.encode()) % partitions
+
+
+class _IndexJobMatcher:
+    """Matches every partition of a job against one HubSpot index, built on first use."""
+
+    def __init__(self, service: "ContactMatchingService", hubspot_contacts: list[HubSpotContact]):
+        self._service = service
+        self._hubspot_contacts = hubspot_contacts
+        self._index: HubSpotMatchIndex | None = None
+
+    def match(self, local_contacts: list[ContactResponse]) -> MatchResult:
+        if self._service.matches_whole_job(len(local_contacts)):
+            return self._service.match_contacts(local_contacts, self._hubspot_contacts)
+
+        may_match = self._service._prefilter_contacts(local_contacts)
+        if not any(may_match):
+            return MatchResult(matched=[], unmatched=list(local_contacts))
+
+        if self._index is None:
+            self._index = HubSpotMatchIndex.build(self._hubspot_contacts)
+        return self._service._match_by_index(local_contacts, self._index, may_match)
+
+    def close(self) -> None:
+        self._index = None
+
 
 class ContactMatchingService:
     """
@@ -10,8 +167,46 @@ class ContactMatchingService:
     1. LinkedIn ID
     2. Email
     3. First name + Last name
+
+    Keys are compared in normalized form (trimmed, case-insensitive). When
+    several HubSpot contacts share a key, the first one in the list wins.
+
+    With workers > 1, calls with at least parallel_min_contacts local
+    contacts are matched in a process pool: the key space of each tier is
+    split into one partition per worker by a stable hash, and only keys and
+    list positions are sent to the workers. Results are identical to
+    in-process matching.
+
+    With a prefilter, local contacts whose keys are definitely absent from
+    the CRM go straight to unmatched, and the HubSpot index is only built
+    when some contact may match. The prefilter must cover every HubSpot
+    contact passed to match_contacts.
+
+    A push job matches its contacts partition by partition through the
+    JobMatcher returned by start_job, which builds the HubSpot index once
+    for the whole job. Jobs large enough for the process pool are matched
+    in a single partition instead (see matches_whole_job).
     """
 
+    def __init__(
+        self,
+        workers: int = MATCH_PROCESS_WORKERS,
+        parallel_min_contacts: int = MATCH_PARALLEL_MIN_CONTACTS,
+        prefilter: Callable[[], MatchKeyFilter | None] | None = None,
+    ):
+        self._workers = workers
+        self._parallel_min_contacts = parallel_min_contacts
+        self._prefilter = prefilter
+        self._pool: ProcessPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Shut down the worker processes, if any were started."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
     def match_contacts(
         self,
         local_contacts: list[ContactResponse],
@@ -22,11 +217,75 @@ class ContactMatchingService:
 
         Returns a MatchResult containing matched pairs and unmatched contacts.
         """
+        may_match = self._prefilter_contacts(local_contacts)
+        if not any(may_match):
+            return MatchResult(matched=[], unmatched=list(local_contacts))
+
+        if self.matches_whole_job(len(local_contacts)):
+            return self._match_in_processes(local_contacts, hubspot_contacts)
+
+        return self._match_by_index(
+            local_contacts, HubSpotMatchIndex.build(hubspot_contacts), may_match
+        )
+
+    def matches_whole_job(self, contact_count: int) -> bool:
+        """Whether a job with this many contacts to match is matched in a single partition."""
+        return self._workers > 1 and contact_count >= self._parallel_min_contacts
+
+    def start_job(self, hubspot_contacts: Iterable[HubSpotContact]) -> JobMatcher:
+        """
+        Start matching the contacts of a job against HubSpot contacts.
+
+        The HubSpot index is built on the first partition having a contact
+        that may match, then reused by every later partition.
+        """
+        return _IndexJobMatcher(self, list(hubspot_contacts))
+
+    def record_synced(self, hubspot_contacts: list[HubSpotContact]) -> None:
+        """
+        Record contacts a job created or updated in the CRM.
+
+        Nothing to do for backends matching each job against contacts
+        fetched from the CRM when it starts.
+        """
+
+    def match_with_index(
+        self,
+        local_contacts: list[ContactResponse],
+        index: MatchIndex,
+    ) -> MatchResult:
+        """
+        Match local contacts against a prebuilt index, such as a MatchIndexSnapshot.
+
+        Returns a MatchResult containing matched pairs and unmatched contacts.
+        """
+        may_match = self._prefilter_contacts(local_contacts)
+        if not any(may_match):
+            return MatchResult(matched=[], unmatched=list(local_contacts))
+
+        return self._match_by_index(local_contacts, index, may_match)
+
+    def _prefilter_contacts(self, local_contacts: list[ContactResponse]) -> list[bool]:
+        """Whether each contact may match, according to the prefilter if any."""
+        match_filter = self._prefilter() if self._prefilter else None
+        if match_filter is None:
+            return [True] * len(local_contacts)
+        return [
+            match_filter.might_match(MatchKeys.of_contact(local_contact))
+            for local_contact in local_contacts
+        ]
+
+    def _match_by_index(
+        self,
+        local_contacts: list[ContactResponse],
+        index: MatchIndex,
+        may_match: list[bool],
+    ) -> MatchResult:
         matched: list[tuple[ContactResponse, HubSpotContact]] = []
         unmatched: list[ContactResponse] = []
 
-        for local_contact in local_contacts:
-            hubspot_match = self._find_match(local_contact, hubspot_contacts)
+        for local_contact, might_match in zip(local_contacts, may_match):
+            hubspot_match = index.find(MatchKeys.of_contact(local_contact)) if might_match else None
 
             if hubspot_match:
                 matched.append((local_contact, hubspot_match))
@@ -35,59 +294,206 @@ class ContactMatchingService:
 
         return MatchResult(matched=matched, unmatched=unmatched)
 
-    def _find_match(
+    def _match_in_processes(
         self,
-        local_contact: ContactResponse,
+        local_contacts: list[ContactResponse],
         hubspot_contacts: list[HubSpotContact],
-    ) -> HubSpotContact | None:
-        """Find a matching HubSpot contact for a local contact."""
-        for hubspot_contact in hubspot_contacts:
-            if self._matches_by_linkedin_id(local_contact, hubspot_contact):
-                return hubspot_contact
+    ) -> MatchResult:
+        """
+        Match in the process pool, in two rounds.
 
-            if self._matches_by_email(local_contact, hubspot_contact):
-                return hubspot_contact
+        Workers first normalize chunks of raw keys and bucket them by
+        partition, then each worker matches one partition of the key space.
+        Only tuples of strings and list positions cross process boundaries.
+        """
+        partitions = self._workers
+        pool = self._get_pool()
 
-            if self._matches_by_name(local_contact, hubspot_contact):
-                return hubspot_contact
+        hubspot_rows = [
+            (p.linkedin_id, p.email, None, p.firstname, p.lastname)
+            for p in (hubspot_contact.properties for hubspot_contact in hubspot_contacts)
+        ]
+        local_rows = [
+            (
+                c.linkedin_norm or c.linkedin_id,
+                c.email_norm or c.email,
+                c.name_key,
+                c.first_name,
+                c.last_name,
+            )
+            for c in local_contacts
+        ]
+        hubspot_buckets = self._bucket_in_processes(pool, hubspot_rows, partitions)
+        local_buckets = self._bucket_in_processes(pool, local_rows, partitions)
 
-        return None
+        # Best (tier, HubSpot position) per local contact; min() makes the
+        # merge independent of the order in which partitions complete
+        best: dict[int, tuple[int, int]] = {}
+        for found in pool.map(_match_key_partition, hubspot_buckets, local_buckets):
+            for local_position, tier, hubspot_position in found:
+                candidate = (tier, hubspot_position)
+                current = best.get(local_position)
+                if current is None or candidate < current:
+                    best[local_position] = candidate
+
+        matched: list[tuple[ContactResponse, HubSpotContact]] = []
+        unmatched: list[ContactResponse] = []
+        for position, local_contact in enumerate(local_contacts):
+            if position in best:
+                matched.append((local_contact, hubspot_contacts[best[position][1]]))
+            else:
+                unmatched.append(local_contact)
+        return MatchResult(matched=matched, unmatched=unmatched)
+
+    def _bucket_in_processes(
+        self, pool: ProcessPoolExecutor, rows: list[_KeyRow], partitions: int
+    ) -> list[_TierKeys]:
+        """Normalize and bucket key rows in chunks, concatenated in row order."""
+        chunk_size = max(1, -(-len(rows) // partitions))
+        starts = range(0, len(rows), chunk_size)
+        merged: list[_TierKeys] = [[[] for _ in _TIERS] for _ in range(partitions)]
+        for buckets in pool.map(
+            _bucket_keys,
+            starts,
+            [rows[start:start + chunk_size] for start in starts],
+            [partitions] * len(starts),
+        ):
+            for partition, tiers in enumerate(buckets):
+                for tier, entries in enumerate(tiers):
+                    merged[partition][tier].extend(entries)
+        return merged
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Get the process pool, starting it on first use."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self._workers)
+            return self._pool
 
-    def _matches_by_linkedin_id(
-        self,
-        local_contact: ContactResponse,
-        hubspot_contact: HubSpotContact,
-    ) -> bool:
-        """Check if contacts match by LinkedIn ID."""
-        if not local_contact.linkedin_id:
-            return False
 
-        return hubspot_contact.properties.linkedin_id == local_contact.linkedin_id
+class _SqlJobMatcher:
+    """Matches each partition of a job against the CRM mirror, in the database."""
 
-    def _matches_by_email(
+    def __init__(self, service: "SqlContactMatchingService"):
+        self._service = service
+
+    def match(self, local_contacts: list[ContactResponse]) -> MatchResult:
+        if not local_contacts:
+            return MatchResult(matched=[], unmatched=[])
+
+        id_result, hubspot_contacts = self._service.match_contacts_in_database(
+            local_contacts[0].job_id, [contact.id for contact in local_contacts]
+        )
+        hubspot_by_id = {contact.id: contact for contact in hubspot_contacts}
+        hubspot_id_by_contact = dict(id_result.matched)
+
+        matched: list[tuple[ContactResponse, HubSpotContact]] = []
+        unmatched: list[ContactResponse] = []
+        for local_contact in local_contacts:
+            hubspot_contact = hubspot_by_id.get(hubspot_id_by_contact.get(local_contact.id))
+            if hubspot_contact is None:
+                unmatched.append(local_contact)
+            else:
+                matched.append((local_contact, hubspot_contact))
+        return MatchResult(matched=matched, unmatched=unmatched)
+
+    def close(self) -> None:
+        pass
+
+
+class SqlContactMatchingService(ContactMatchingService):
+    """
+    Matching backend running in the database, next to the data.
+
+    Matches a job's stored contacts against the local mirror of CRM contacts
+    (the crm_contacts table) in one set-based query, with the same priority
+    and first-match semantics as ContactMatchingService. Results are IDs
+    only, so no contact is loaded into Python to be matched.
+
+    The mirror is refreshed from the CRM by the first job started once it is
+    older than max_age_seconds; other jobs do not fetch the CRM at all.
+    Contacts written to the CRM by jobs are upserted into the mirror when
+    each job finishes, so later jobs match them before the next refresh.
+    Every call uses its own unit of work from uow_factory, so matching
+    never shares the session of the calling job.
+    """
+
+    def __init__(
         self,
-        local_contact: ContactResponse,
-        hubspot_contact: HubSpotContact,
-    ) -> bool:
-        """Check if contacts match by email."""
-        if not local_contact.email:
-            return False
+        uow_factory: Callable[[], UnitOfWork],
+        max_age_seconds: float = MATCH_MIRROR_MAX_AGE_SECONDS,
+    ):
+        super().__init__(workers=0)
+        self._uow_factory = uow_factory
+        self._max_age_seconds = max_age_seconds
+        self._refreshed_at: float | None = None
+        self._refresh_lock = threading.Lock()
+
+    def start_job(self, hubspot_contacts: Iterable[HubSpotContact]) -> JobMatcher:
+        """
+        Start matching the contacts of a job against the CRM mirror.
 
-        return hubspot_contact.properties.email == local_contact.email
+        The HubSpot contacts are only read when the mirror is due for a refresh.
+        """
+        with self._refresh_lock:
+            now = time.monotonic()
+            if self._refreshed_at is None or now - self._refreshed_at >= self._max_age_seconds:
+                self.mirror_crm_contacts(hubspot_contacts)
+                self._refreshed_at = now
+        return _SqlJobMatcher(self)
 
-    def _matches_by_name(
+    def match_contacts(
         self,
-        local_contact: ContactResponse,
-        hubspot_contact: HubSpotContact,
-    ) -> bool:
-        """Check if contacts match by first name + last name."""
-        if not local_contact.first_name or not local_contact.last_name:
-            return False
-
-        hubspot_first = (hubspot_contact.properties.firstname or "").lower()
-        hubspot_last = (hubspot_contact.properties.lastname or "").lower()
-
-        return (
-            hubspot_first == local_contact.first_name.lower()
-            and hubspot_last == local_contact.last_name.lower()
-        )
+        local_contacts: list[ContactResponse],
+        hubspot_contacts: list[HubSpotContact],
+    ) -> MatchResult:
+        """
+        Match stored local contacts with HubSpot contacts, mirroring them first.
+
+        Returns a MatchResult containing matched pairs and unmatched contacts.
+        """
+        self.mirror_crm_contacts(hubspot_contacts)
+        return _SqlJobMatcher(self).match(local_contacts)
+
+    def mirror_crm_contacts(self, hubspot_contacts: Iterable[HubSpotContact]) -> None:
+        """Make the mirror a copy of the CRM contact list, dropping contacts no longer in it."""
+        hubspot_contacts = list(hubspot_contacts)
+        with self._uow_factory() as uow:
+            uow.crm_contacts.upsert_many(hubspot_contacts)
+            uow.crm_contacts.delete_missing({contact.id for contact in hubspot_contacts})
+
+    def refresh_crm_contacts(self, hubspot_contacts: list[HubSpotContact]) -> None:
+        """Insert or update CRM contacts in the mirror, in CRM list order."""
+        with self._uow_factory() as uow:
+            uow.crm_contacts.upsert_many(hubspot_contacts)
+
+    def record_synced(self, hubspot_contacts: list[HubSpotContact]) -> None:
+        """Upsert contacts a job created or updated in the CRM into the mirror."""
+        self.refresh_crm_contacts(hubspot_contacts)
+
+    def match_job(
+        self, job_id: int, contact_ids: list[int] | None = None
+    ) -> ContactIdMatchResult:
+        """
+        Match the contacts of a job against the CRM mirror.
+
+        Args:
+            job_id: The job whose contacts are matched.
+            contact_ids: Restrict matching to these contacts of the job.
+
+        Returns:
+            Matched (contact ID, HubSpot ID) pairs and unmatched contact IDs.
+        """
+        with self._uow_factory() as uow:
+            return uow.crm_contacts.match_job_contacts(job_id, contact_ids)
+
+    def match_contacts_in_database(
+        self, job_id: int, contact_ids: list[int]
+    ) -> tuple[ContactIdMatchResult, list[HubSpotContact]]:
+        """Match contacts of a job like match_job, also loading the matched CRM contacts."""
+        with self._uow_factory() as uow:
+            result = uow.crm_contacts.match_job_contacts(job_id, contact_ids)
+            hubspot_contacts = uow.crm_contacts.get_by_hubspot_ids(
+                sorted({hubspot_id for _, hubspot_id in result.matched})
+            )
+        return result, hubspot_contacts
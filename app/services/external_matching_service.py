@@ -0,0 +1,299 @@
+import heapq
+import json
+import logging
+import os
+import struct
+import tempfile
+import time
+from array import array
+from dataclasses import dataclass
+from typing import BinaryIO, Iterable, Iterator
+
+from app.domain import HubSpotContact, MatchKeys, MatchResult
+from app.schemas import ContactResponse
+from app.services.contact_matching_service import ContactMatchingService, JobMatcher
+
+logger = logging.getLogger(__name__)
+
+# Memory for buffered sort keys before they are spilled to a sorted run file
+MATCH_EXTERNAL_MEMORY_LIMIT_MB = float(os.getenv("MATCH_EXTERNAL_MEMORY_LIMIT_MB", "64"))
+# Directory for run files (the system temporary directory when unset)
+MATCH_SPILL_DIR = os.getenv("MATCH_SPILL_DIR") or None
+
+# Key tiers in priority order, as MatchKeys attributes
+_TIERS = ("linkedin_id", "email", "name")
+
+# Estimated in-memory cost of a buffered record, on top of its key's length
+_RECORD_OVERHEAD = 120
+
+# Run record: key length, list position, offset in the contact data file
+_RECORD_HEADER = struct.Struct("<Iqq")
+
+_NO_MATCH = -1
+
+
+@dataclass(frozen=True)
+class ExternalMatchStats:
+    """Cost of an external merge match."""
+
+    run_files: int
+    spill_bytes: int
+    spill_seconds: float
+    merge_seconds: float
+
+
+_Record = tuple[str, int, int]
+
+
+class _RunWriter:
+    """Buffers (key, position, offset) records per tier and spills them as sorted runs."""
+
+    def __init__(self, directory: str, side: str, memory_limit: int):
+        self._directory = directory
+        self._side = side
+        self._memory_limit = memory_limit
+        self._buffers: list[list[_Record]] = [[] for _ in _TIERS]
+        self._buffered_bytes = 0
+        self.runs: list[list[str]] = [[] for _ in _TIERS]
+        self.spill_bytes = 0
+
+    def add(self, keys: MatchKeys, position: int, offset: int = -1) -> None:
+        for tier, name in enumerate(_TIERS):
+            key = getattr(keys, name)
+            if key:
+                self._buffers[tier].append((key, position, offset))
+                self._buffered_bytes += len(key) + _RECORD_OVERHEAD
+        if self._buffered_bytes >= self._memory_limit:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write every non-empty buffer as a sorted run file."""
+        for tier, buffer in enumerate(self._buffers):
+            if not buffer:
+                continue
+            buffer.sort()
+            path = os.path.join(
+                self._directory, f"{self._side}-{_TIERS[tier]}-{len(self.runs[tier])}.run"
+            )
+            with open(path, "wb", buffering=1 << 20) as f:
+                for key, position, offset in buffer:
+                    encoded = key.encode()
+                    f.write(_RECORD_HEADER.pack(len(encoded), position, offset))
+                    f.write(encoded)
+            self.runs[tier].append(path)
+            self.spill_bytes += os.path.getsize(path)
+            buffer.clear()
+        self._buffered_bytes = 0
+
+
+def _read_run(path: str) -> Iterator[_Record]:
+    """Stream the records of a run file, in their sorted order."""
+    with open(path, "rb", buffering=1 << 20) as f:
+        while header := f.read(_RECORD_HEADER.size):
+            length, position, offset = _RECORD_HEADER.unpack(header)
+            yield f.read(length).decode(), position, offset
+
+
+def _merge_runs(paths: list[str]) -> Iterator[_Record]:
+    """K-way merge of sorted run files."""
+    return heapq.merge(*(_read_run(path) for path in paths))
+
+
+def _merge_join(
+    local_records: Iterator[_Record], hubspot_records: Iterator[_Record]
+) -> Iterator[tuple[int, int, int]]:
+    """
+    Join two key-sorted record streams.
+
+    Yields:
+        (local position, HubSpot position, HubSpot data offset) for every
+        local record, paired with the first HubSpot record having its key.
+    """
+    hubspot = next(hubspot_records, None)
+    for key, local_position, _ in local_records:
+        while hubspot is not None and hubspot[0] < key:
+            hubspot = next(hubspot_records, None)
+        if hubspot is None:
+            return
+        if hubspot[0] == key:
+            # Records are sorted by (key, position): this is the first contact
+            yield local_position, hubspot[1], hubspot[2]
+
+
+class _ExternalJobMatcher:
+    """
+    Matches a job against HubSpot contacts spilled to disk once.
+
+    The HubSpot stream is consumed when the matcher is created: each contact
+    is written to a data file and its keys to sorted runs, which are kept
+    in a temporary directory until the matcher is closed.
+    """
+
+    def __init__(
+        self,
+        hubspot_contacts: Iterable[HubSpotContact],
+        memory_limit: int,
+        spill_dir: str | None,
+    ):
+        self._directory = tempfile.TemporaryDirectory(prefix="match-", dir=spill_dir)
+        # Both sides share the memory limit
+        self._memory_limit = memory_limit // 2
+        self._local_spills = 0
+        try:
+            spill_start = time.perf_counter()
+            self._hubspot_runs = _RunWriter(self._directory.name, "hubspot", self._memory_limit)
+            self._data_path = os.path.join(self._directory.name, "hubspot.jsonl")
+            with open(self._data_path, "wb", buffering=1 << 20) as data:
+                for position, hubspot_contact in enumerate(hubspot_contacts):
+                    offset = data.tell()
+                    data.write(json.dumps(hubspot_contact.to_dict()).encode() + b"\n")
+                    self._hubspot_runs.add(MatchKeys.of_hubspot(hubspot_contact), position, offset)
+            self._hubspot_runs.flush()
+            self._hubspot_spill_seconds = time.perf_counter() - spill_start
+        except BaseException:
+            self._directory.cleanup()
+            raise
+
+    def match(self, local_contacts: list[ContactResponse]) -> MatchResult:
+        return self.match_with_stats(local_contacts)[0]
+
+    def match_with_stats(
+        self, local_contacts: list[ContactResponse]
+    ) -> tuple[MatchResult, ExternalMatchStats]:
+        """Match like match, also returning spill and merge statistics."""
+        if not local_contacts:
+            return MatchResult(matched=[], unmatched=[]), ExternalMatchStats(0, 0, 0.0, 0.0)
+
+        spill_start = time.perf_counter()
+        local_runs = _RunWriter(
+            self._directory.name, f"local{self._local_spills}", self._memory_limit
+        )
+        self._local_spills += 1
+        for position, local_contact in enumerate(local_contacts):
+            local_runs.add(MatchKeys.of_contact(local_contact), position)
+        local_runs.flush()
+        spill_seconds = self._hubspot_spill_seconds + time.perf_counter() - spill_start
+
+        merge_start = time.perf_counter()
+        best_offsets = array("q", [_NO_MATCH]) * len(local_contacts)
+        for tier in range(len(_TIERS)):
+            if not local_runs.runs[tier] or not self._hubspot_runs.runs[tier]:
+                continue
+            joined = _merge_join(
+                _merge_runs(local_runs.runs[tier]),
+                _merge_runs(self._hubspot_runs.runs[tier]),
+            )
+            for local_position, _, offset in joined:
+                if best_offsets[local_position] == _NO_MATCH:
+                    best_offsets[local_position] = offset
+
+        with open(self._data_path, "rb") as data:
+            by_offset = self._read_contacts(data, set(best_offsets) - {_NO_MATCH})
+        merge_seconds = time.perf_counter() - merge_start
+
+        local_run_files = [path for runs in local_runs.runs for path in runs]
+        stats = ExternalMatchStats(
+            run_files=len(local_run_files) + sum(len(runs) for runs in self._hubspot_runs.runs),
+            spill_bytes=(
+                local_runs.spill_bytes
+                + self._hubspot_runs.spill_bytes
+                + os.path.getsize(self._data_path)
+            ),
+            spill_seconds=spill_seconds,
+            merge_seconds=merge_seconds,
+        )
+        for path in local_run_files:
+            os.remove(path)
+        logger.info(
+            "External match of %d contacts: %d run files, %d bytes spilled in %.3fs,"
+            " merged in %.3fs",
+            len(local_contacts),
+            stats.run_files,
+            stats.spill_bytes,
+            stats.spill_seconds,
+            stats.merge_seconds,
+        )
+
+        matched: list[tuple[ContactResponse, HubSpotContact]] = []
+        unmatched: list[ContactResponse] = []
+        for local_contact, offset in zip(local_contacts, best_offsets):
+            if offset == _NO_MATCH:
+                unmatched.append(local_contact)
+            else:
+                matched.append((local_contact, by_offset[offset]))
+        return MatchResult(matched=matched, unmatched=unmatched), stats
+
+    def close(self) -> None:
+        self._directory.cleanup()
+
+    def _read_contacts(self, data: BinaryIO, offsets: set[int]) -> dict[int, HubSpotContact]:
+        """Read the HubSpot contacts stored at the given offsets, in file order."""
+        contacts: dict[int, HubSpotContact] = {}
+        for offset in sorted(offsets):
+            data.seek(offset)
+            contacts[offset] = HubSpotContact.from_dict(json.loads(data.readline()))
+        return contacts
+
+
+class ExternalMergeMatchingService(ContactMatchingService):
+    """
+    ContactMatchingService for portals too large to index in memory.
+
+    HubSpot contacts are consumed as a stream: each is written once to a
+    data file, and its match keys, per tier, are buffered and spilled to
+    sorted run files whenever the buffers reach the memory limit. Local
+    keys are spilled the same way. Each tier is then matched with a k-way
+    merge of its runs on both sides and a merge join, in priority order.
+    Only matched HubSpot contacts are read back from the data file.
+
+    Local contacts stay referenced in memory, as they are part of the
+    result; per local contact, only the best match so far is kept.
+
+    Push jobs are matched whole: the CRM is streamed page by page into the
+    spill files when the job starts, and merged once with all the job's
+    contacts.
+    """
+
+    def __init__(
+        self,
+        memory_limit_bytes: int = int(MATCH_EXTERNAL_MEMORY_LIMIT_MB * 1024 * 1024),
+        spill_dir: str | None = MATCH_SPILL_DIR,
+    ):
+        super().__init__(workers=0)
+        self._memory_limit = memory_limit_bytes
+        self._spill_dir = spill_dir
+
+    def matches_whole_job(self, contact_count: int) -> bool:
+        """Whether a job with this many contacts to match is matched in a single partition."""
+        return True
+
+    def start_job(self, hubspot_contacts: Iterable[HubSpotContact]) -> JobMatcher:
+        """Start matching the contacts of a job, spilling the HubSpot stream to disk."""
+        return _ExternalJobMatcher(hubspot_contacts, self._memory_limit, self._spill_dir)
+
+    def match_contacts(
+        self,
+        local_contacts: list[ContactResponse],
+        hubspot_contacts: Iterable[HubSpotContact],
+    ) -> MatchResult:
+        """
+        Match local contacts with HubSpot contacts.
+
+        Returns a MatchResult containing matched pairs and unmatched contacts.
+        """
+        return self.match_contacts_with_stats(local_contacts, hubspot_contacts)[0]
+
+    def match_contacts_with_stats(
+        self,
+        local_contacts: list[ContactResponse],
+        hubspot_contacts: Iterable[HubSpotContact],
+    ) -> tuple[MatchResult, ExternalMatchStats]:
+        """Match like match_contacts, also returning spill and merge statistics."""
+        if not local_contacts:
+            return MatchResult(matched=[], unmatched=[]), ExternalMatchStats(0, 0, 0.0, 0.0)
+
+        job_matcher = _ExternalJobMatcher(hubspot_contacts, self._memory_limit, self._spill_dir)
+        try:
+            return job_matcher.match_with_stats(local_contacts)
+        finally:
+            job_matcher.close()
@@ -1,4 +1,22 @@
-from app.infrastructure import AsyncTaskExecutor
+import logging
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+from app.domain import JobInterruptedError
+from app.infrastructure import AsyncTaskExecutor, report_queries, track_queries
+from app.infrastructure.metrics.instruments import PUSH_JOB_DURATION, PUSH_JOBS
+from app.infrastructure.profiling import JobProfiler
+from app.infrastructure.tracing import get_tracer
+
+logger = logging.getLogger(__name__)
+_tracer = get_tracer(__name__)
+
+# Seconds in-flight jobs get to finish on shutdown before being asked to checkpoint
+JOB_SHUTDOWN_GRACE_PERIOD = float(os.getenv("JOB_SHUTDOWN_GRACE_PERIOD", "30"))
+# Seconds jobs get to checkpoint once asked to stop
+JOB_SHUTDOWN_CHECKPOINT_TIMEOUT = float(os.getenv("JOB_SHUTDOWN_CHECKPOINT_TIMEOUT", "5"))
 
 
 class JobExecutorService:
@@ -7,41 +25,134 @@ class JobExecutorService:
 
     This service abstracts the job execution infrastructure from the rest
     of the application, following the Single Responsibility Principle.
+
+    On shutdown, no new jobs are accepted and in-flight jobs get a grace period
+    to finish. Jobs still running after that are asked to checkpoint: contacts
+    synced so far are committed and the job stays pending. Jobs that had not
+    started yet are released and also stay pending, so they can be resumed.
     """
 
-    def __init__(self, task_executor: AsyncTaskExecutor | None = None):
+    def __init__(
+        self,
+        task_executor: AsyncTaskExecutor | None = None,
+        grace_period: float = JOB_SHUTDOWN_GRACE_PERIOD,
+        checkpoint_timeout: float = JOB_SHUTDOWN_CHECKPOINT_TIMEOUT,
+        profiler: JobProfiler | None = None,
+    ):
         self._executor = task_executor or AsyncTaskExecutor()
+        self.profiler = profiler or JobProfiler()
+        self._grace_period = grace_period
+        self._checkpoint_timeout = checkpoint_timeout
+        self._stop_requested = threading.Event()
+        # Jobs that stopped at a checkpoint and were left pending
+        self._interrupted: set[int] = set()
         self._register_tasks()
 
+    @property
+    def accepting_jobs(self) -> bool:
+        """Whether jobs can still be scheduled; False once shutdown began."""
+        return self._executor.accepting
+
+    @property
+    def queued_jobs(self) -> int:
+        """Jobs scheduled and still waiting for a worker thread."""
+        return self._executor.queued
+
     def _register_tasks(self) -> None:
         """Register all background task handlers."""
         self._executor.add_task("process_push_job", self._process_push_job)
 
-    def _process_push_job(self, job_id: str) -> None:
+    def _process_push_job(self, job_id: str, profile: bool = False) -> None:
         """Execute push job processing in background."""
         # Import inside method to avoid circular imports
-        from app.dependencies.services import (
-            get_crm_client,
-            get_matching_service,
-            get_unit_of_work,
-        )
-        from app.services.push_service import PushService
-
-        service = PushService(
-            uow=get_unit_of_work(),
-            crm_client=get_crm_client(),
-            matching_service=get_matching_service(),
-        )
-        service.process_job(int(job_id))
-
-    def schedule_push_job(self, job_id: int) -> None:
+        from app.dependencies.services import get_push_service
+
+        service = get_push_service()
+        status = "failed"
+        start = time.perf_counter()
+        # The job has its own statement count, apart from the request that scheduled it
+        with track_queries(inherit=False) as queries, (
+            self.profiler.profile(int(job_id)) if profile else nullcontext()
+        ):
+            try:
+                service.process_job(int(job_id), should_stop=self._stop_requested.is_set)
+                status = "completed"
+            except JobInterruptedError:
+                status = "interrupted"
+                self._interrupted.add(int(job_id))
+                logger.info("Push job %s checkpointed and left pending", job_id)
+            finally:
+                PUSH_JOBS.labels(status).inc()
+                PUSH_JOB_DURATION.labels(status).observe(time.perf_counter() - start)
+                report_queries(queries, "job", f"Push job {job_id}")
+
+    def schedule_push_job(self, job_id: int, profile: bool = False) -> None:
         """
         Schedule a push job for background execution.
 
         Args:
             job_id: The ID of the job to process.
+            profile: Run the job under the profiler. Other jobs are
+                profiled at the profiler's sample rate.
+
+        Raises:
+            ExecutorShutdownError: If the executor is shutting down.
+        """
+        with _tracer.start_as_current_span("schedule_push_job", attributes={"job.id": job_id}):
+            # Unprofiled jobs are scheduled exactly as without a profiler
+            options = {"profile": True} if self.profiler.should_profile(profile) else {}
+            self._executor.execute("process_push_job", str(job_id), **options)
+
+    def resume_pending_jobs(self) -> list[int]:
+        """
+        Schedule every job still pending in the database.
+
+        Used at startup to pick up jobs released or checkpointed by a previous
+        process. Only safe when no other instance is processing the same jobs.
+
+        Returns:
+            The IDs of the scheduled jobs.
+        """
+        # Import inside method to avoid circular imports
+        from app.dependencies.services import get_unit_of_work
+
+        uow = get_unit_of_work()
+        with uow:
+            job_ids = [job.id for job in uow.push_jobs.get_pending_jobs()]
+
+        for job_id in job_ids:
+            self.schedule_push_job(job_id)
+
+        return job_ids
+
+    async def shutdown(self) -> list[int]:
+        """
+        Stop accepting jobs and drain the ones in flight.
+
+        Returns:
+            The IDs of jobs that did not complete and remain pending.
         """
-        self._executor.execute("process_push_job", str(job_id))
+        unfinished = await self._executor.shutdown(self._grace_period)
+
+        still_running: list = []
+        if any(task.started for task in unfinished):
+            self._stop_requested.set()
+            still_running = await self._executor.shutdown(self._checkpoint_timeout)
+            if still_running:
+                logger.warning(
+                    "Push jobs did not checkpoint in time, their transaction will be rolled back: %s",
+                    [int(task.args[0]) for task in still_running],
+                )
+
+        # Jobs asked to checkpoint may still have completed or failed meanwhile
+        job_ids = [
+            int(task.args[0])
+            for task in unfinished
+            if task.released or task in still_running or int(task.args[0]) in self._interrupted
+        ]
+        if job_ids:
+            logger.warning("Push jobs left pending on shutdown: %s", job_ids)
+        return job_ids
 
 
 # Singleton instance
@@ -1,12 +1,90 @@
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
 from app.domain import (
     CrmClient,
     HubSpotContact,
+    HubSpotContactProperties,
+    JobInterruptedError,
+    JobTimings,
     JobNotFoundError,
+    MatchKeys,
     SyncResult,
     UnitOfWork,
 )
+from app.infrastructure.tracing import get_tracer
 from app.schemas import ContactCreate, ContactResponse, PushJobResponse
-from app.services.contact_matching_service import ContactMatchingService
+from app.services.contact_deduplication_service import ContactDeduplicationService
+from app.services.contact_matching_service import ContactMatchingService, JobMatcher
+from app.services.sync_pipeline import PipelineConfig, SyncPipeline
+
+logger = logging.getLogger(__name__)
+_tracer = get_tracer(__name__)
+
+# Resolve contacts against HubSpot IDs recorded by earlier jobs before matching
+SYNC_HISTORY_LOOKUP = os.getenv("SYNC_HISTORY_LOOKUP", "true").lower() == "true"
+# Check that HubSpot IDs found in history still exist in the CRM
+SYNC_HISTORY_VERIFY = os.getenv("SYNC_HISTORY_VERIFY", "true").lower() == "true"
+
+
+@dataclass(frozen=True)
+class _CrmOperation:
+    """A CRM write to perform: update when hubspot_contact is set, else create."""
+
+    local_contact: ContactResponse
+    hubspot_contact: HubSpotContact | None
+
+
+@dataclass(frozen=True)
+class _CrmWrite:
+    """The outcome of a CRM write, to be persisted on the local contact."""
+
+    local_contact: ContactResponse
+    hubspot_id: str
+    contact_data: dict
+    created: bool
+
+
+class _JobClock:
+    """Phase times and CRM calls of one job run, reported from every pipeline thread."""
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._seconds = dict.fromkeys(("fetch", "match", "update", "create", "persist"), 0.0)
+        self._crm_calls = 0
+
+    @contextmanager
+    def phase(self, name: str, crm_calls: int = 0) -> Iterator[None]:
+        """Add the time spent in the block to a phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start, crm_calls)
+
+    def add(self, name: str, seconds: float, crm_calls: int = 0) -> None:
+        with self._lock:
+            self._seconds[name] += seconds
+            self._crm_calls += crm_calls
+
+    def timings(self, db_statements: int) -> JobTimings:
+        with self._lock:
+            return JobTimings(
+                fetch_seconds=self._seconds["fetch"],
+                match_seconds=self._seconds["match"],
+                update_seconds=self._seconds["update"],
+                create_seconds=self._seconds["create"],
+                persist_seconds=self._seconds["persist"],
+                total_seconds=time.perf_counter() - self._started,
+                crm_calls=self._crm_calls,
+                db_statements=db_statements,
+            )
 
 
 class PushService:
@@ -30,10 +108,18 @@ class PushService:
         uow: UnitOfWork,
         crm_client: CrmClient,
         matching_service: ContactMatchingService,
+        pipeline_config: PipelineConfig | None = None,
+        deduplication_service: ContactDeduplicationService | None = None,
+        history_lookup: bool = SYNC_HISTORY_LOOKUP,
+        verify_history: bool = SYNC_HISTORY_VERIFY,
     ):
         self._uow = uow
         self._crm_client = crm_client
         self._matching_service = matching_service
+        self._deduplication_service = deduplication_service or ContactDeduplicationService()
+        self._history_lookup = history_lookup
+        self._verify_history = verify_history
+        self._pipeline = SyncPipeline(pipeline_config)
 
     def create_push_job(self, profiles: list[dict]) -> PushJobResponse:
         """
@@ -45,8 +131,11 @@ class PushService:
         Returns:
             The created PushJob.
         """
-        with self._uow:
+        with _tracer.start_as_current_span(
+            "create_push_job", attributes={"profiles.count": len(profiles)}
+        ) as span, self._uow:
             push_job = self._uow.push_jobs.create_pending_job()
+            span.set_attribute("job.id", push_job.id)
 
             contact_schemas = [
                 ContactCreate(
@@ -64,45 +153,95 @@ class PushService:
 
             return push_job
 
-    def process_job(self, job_id: int) -> SyncResult:
+    def process_job(
+        self,
+        job_id: int,
+        should_stop: Callable[[], bool] | None = None,
+    ) -> SyncResult:
         """
         Process a push job by syncing all its contacts with HubSpot.
 
+        Contacts already completed by an earlier, interrupted run are skipped,
+        and the counts saved at that checkpoint are carried over. The phase
+        timings of the run are saved on the job, when it completes or stops.
+
         Args:
             job_id: The ID of the job to process.
+            should_stop: Optional callable polled between contacts. When it
+                returns True, the work done so far is committed, the job stays
+                pending and JobInterruptedError is raised.
 
         Returns:
             SyncResult with counts of created and updated contacts.
 
         Raises:
             JobNotFoundError: If the job is not found.
+            JobInterruptedError: If the job was stopped at a checkpoint.
         """
-        with self._uow:
-            push_job = self._uow.push_jobs.get_by_id(job_id)
-            if not push_job:
-                raise JobNotFoundError(job_id)
+        with _tracer.start_as_current_span("process_job", attributes={"job.id": job_id}):
+            should_stop = should_stop or (lambda: False)
+            clock = _JobClock()
 
+            synced: list[HubSpotContact] = []
             try:
-                result = self._sync_contacts(job_id)
-
-                self._uow.push_jobs.mark_as_completed(
-                    job_id=job_id,
-                    created_count=result.created_count,
-                    updated_count=result.updated_count,
-                )
-
-                return result
-
-            except Exception as exc:
-                # UnitOfWork will rollback automatically on exception
-                # We need a new transaction to mark the job as failed
-                error = exc
-
-        # Mark as failed in a separate transaction
-        with self._uow:
-            self._uow.push_jobs.mark_as_failed(job_id, str(error))
-
-        raise error
+                with self._uow:
+                    push_job = self._uow.push_jobs.get_by_id(job_id)
+                    if not push_job:
+                        raise JobNotFoundError(job_id)
+
+                    try:
+                        result = self._sync_contacts(job_id, should_stop, clock, synced)
+                        result = SyncResult(
+                            created_count=(push_job.created_count or 0) + result.created_count,
+                            updated_count=(push_job.updated_count or 0) + result.updated_count,
+                            duplicate_count=(push_job.duplicate_count or 0) + result.duplicate_count,
+                            stages=result.stages,
+                            timings=clock.timings(self._uow.statement_count),
+                        )
+
+                        self._uow.push_jobs.mark_as_completed(
+                            job_id=job_id,
+                            created_count=result.created_count,
+                            updated_count=result.updated_count,
+                            duplicate_count=result.duplicate_count,
+                        )
+                        self._uow.push_jobs.save_timings(job_id, result.timings.to_dict())
+
+                        return result
+
+                    except JobInterruptedError as exc:
+                        # Keep the contacts synced so far and leave the job pending
+                        self._uow.push_jobs.save_progress(
+                            job_id=job_id,
+                            created_count=(push_job.created_count or 0) + exc.created_count,
+                            updated_count=(push_job.updated_count or 0) + exc.updated_count,
+                            duplicate_count=(push_job.duplicate_count or 0) + exc.duplicate_count,
+                        )
+                        self._uow.push_jobs.save_timings(
+                            job_id, clock.timings(self._uow.statement_count).to_dict()
+                        )
+                        interruption = exc
+                        error = None
+
+                    except Exception as exc:
+                        # UnitOfWork will rollback automatically on exception
+                        # We need a new transaction to mark the job as failed
+                        interruption = None
+                        error = exc
+            finally:
+                # Once the job's transaction is over, so that a backend writing to
+                # the database does not wait on it
+                if synced:
+                    self._matching_service.record_synced(synced)
+
+            if interruption is not None:
+                raise interruption
+
+            # Mark as failed in a separate transaction
+            with self._uow:
+                self._uow.push_jobs.mark_as_failed(job_id, str(error))
+
+            raise error
 
     def get_job_status(self, job_id: int) -> PushJobResponse:
         """
@@ -123,69 +262,280 @@ class PushService:
                 raise JobNotFoundError(job_id)
             return job
 
-    def _sync_contacts(self, job_id: int) -> SyncResult:
-        """Sync all contacts for a job with HubSpot."""
-        job_contacts = self._uow.contacts.get_by_job_id(job_id)
-        hubspot_contacts = self._crm_client.get_all_contacts()
+    def _sync_contacts(
+        self,
+        job_id: int,
+        should_stop: Callable[[], bool],
+        clock: _JobClock,
+        synced: list[HubSpotContact],
+    ) -> SyncResult:
+        """
+        Sync all contacts for a job with HubSpot.
+
+        Duplicate profiles within the job are collapsed first, so each person
+        gets a single CRM operation whose HubSpot ID is then stored on every
+        duplicate. Created and updated counts are counts of CRM operations.
+
+        Contacts whose email or LinkedIn ID was synced by an earlier job reuse
+        that HubSpot ID and go straight to update. Only the others are matched
+        against the CRM, which is not fetched at all if none are left.
+
+        Matching, CRM writes and local persistence run as pipeline stages,
+        so their latencies overlap instead of adding up for every contact.
+        The partitions of the job share one JobMatcher, so the HubSpot side
+        of matching is prepared once per job; backends that match a whole job
+        at once get a single partition. The contacts written to the CRM are
+        added to synced, for the caller to record with the matching service
+        once the job's transaction is over, for backends that keep a copy of
+        the CRM across jobs.
+        """
+        with clock.phase("fetch"):
+            job_contacts = [
+                contact
+                for contact in self._uow.contacts.get_by_job_id(job_id)
+                if contact.status != "completed"
+            ]
+            deduplication = self._deduplication_service.deduplicate(job_contacts)
+            members_by_id = {
+                group.representative.id: group.members for group in deduplication.groups
+            }
 
-        match_result = self._matching_service.match_contacts(
-            local_contacts=job_contacts,
-            hubspot_contacts=hubspot_contacts,
-        )
+            history_matched, to_match = self._resolve_from_history(
+                job_id, deduplication.representatives, clock
+            )
+            if history_matched and not to_match:
+                job_matcher = None
+                partitions = []
+            else:
+                job_matcher = self._matching_service.start_job(
+                    self._fetch_hubspot_contacts(clock)
+                )
+                if self._matching_service.matches_whole_job(len(to_match)):
+                    partitions = [to_match]
+                else:
+                    partitions = self._pipeline.partition(to_match)
+
+        counts = {"created": 0, "updated": 0, "duplicates": 0}
+
+        def persist(write: _CrmWrite) -> None:
+            members = members_by_id.get(write.local_contact.id, [write.local_contact])
+            for member in members:
+                self._persist_crm_write(member.id, write)
+            counts["created" if write.created else "updated"] += 1
+            counts["duplicates"] += len(members) - 1
+            synced.append(self._synced_to_hubspot(write))
+
+        try:
+            run = self._pipeline.run(
+                partitions=partitions,
+                match=lambda partition: self._match_partition(partition, job_matcher),
+                write=lambda operation: self._write_to_crm(operation, clock),
+                persist=persist,
+                should_stop=should_stop,
+                prematched=[
+                    _CrmOperation(local_contact=local_contact, hubspot_contact=hubspot_contact)
+                    for local_contact, hubspot_contact in history_matched
+                ],
+            )
+        finally:
+            if job_matcher is not None:
+                job_matcher.close()
+
+        for stage in run.stages:
+            if stage.name in ("match", "persist"):
+                clock.add(stage.name, stage.busy_seconds)
+            logger.info(
+                "Job %s stage %s: %d items in %.3fs busy (%.1f items/s)",
+                job_id, stage.name, stage.items, stage.busy_seconds, stage.throughput,
+            )
 
-        updated_count = self._update_matched_contacts(match_result.matched)
-        created_count = self._create_new_contacts(match_result.unmatched)
+        if not run.completed:
+            raise JobInterruptedError(
+                job_id,
+                created_count=counts["created"],
+                updated_count=counts["updated"],
+                duplicate_count=counts["duplicates"],
+            )
 
-        return SyncResult(created_count=created_count, updated_count=updated_count)
+        return SyncResult(
+            created_count=counts["created"],
+            updated_count=counts["updated"],
+            duplicate_count=counts["duplicates"],
+            stages=run.stages,
+        )
 
-    def _update_matched_contacts(
+    def _fetch_hubspot_contacts(self, clock: _JobClock) -> Iterator[HubSpotContact]:
+        """Stream the CRM contacts page by page, counting one CRM call per page."""
+        contacts, after = self._crm_client.get_contacts_page()
+        clock.add("fetch", 0.0, crm_calls=1)
+        yield from contacts
+        while after is not None:
+            contacts, after = self._crm_client.get_contacts_page(after)
+            clock.add("fetch", 0.0, crm_calls=1)
+            yield from contacts
+
+    def _resolve_from_history(
         self,
-        matched_contacts: list[tuple[ContactResponse, HubSpotContact]],
-    ) -> int:
-        """Update contacts that matched with existing HubSpot contacts."""
-        updated_count = 0
+        job_id: int,
+        contacts: list[ContactResponse],
+        clock: _JobClock,
+    ) -> tuple[list[tuple[ContactResponse, HubSpotContact]], list[ContactResponse]]:
+        """
+        History stage: reuse HubSpot IDs that earlier jobs stored for the same
+        LinkedIn ID or email, in that priority order.
 
-        for local_contact, hubspot_contact in matched_contacts:
-            contact_data = self._merge_contact_data(local_contact, hubspot_contact)
+        Returns the resolved (local, HubSpot) pairs and the contacts left to match.
+        """
+        if not self._history_lookup or not contacts:
+            return [], contacts
+
+        keys = {contact.id: MatchKeys.of_contact(contact) for contact in contacts}
+        history = self._uow.contacts.get_latest_synced_by_keys(
+            emails=sorted({k.email for k in keys.values() if k.email}),
+            linkedin_ids=sorted({k.linkedin_id for k in keys.values() if k.linkedin_id}),
+            exclude_job_id=job_id,
+        )
+        if not history:
+            return [], contacts
+
+        # Rows are most recent first, so the first row seen for a key wins
+        by_linkedin: dict[str, ContactResponse] = {}
+        by_email: dict[str, ContactResponse] = {}
+        for row in history:
+            row_keys = MatchKeys.of_contact(row)
+            if row_keys.linkedin_id:
+                by_linkedin.setdefault(row_keys.linkedin_id, row)
+            if row_keys.email:
+                by_email.setdefault(row_keys.email, row)
+
+        resolved: list[tuple[ContactResponse, ContactResponse]] = []
+        remaining: list[ContactResponse] = []
+        for contact in contacts:
+            contact_keys = keys[contact.id]
+            row = by_linkedin.get(contact_keys.linkedin_id) or by_email.get(contact_keys.email)
+            if row is None:
+                remaining.append(contact)
+            else:
+                resolved.append((contact, row))
+
+        if self._verify_history and resolved:
+            existing = {
+                hubspot_contact.id: hubspot_contact
+                for hubspot_contact in self._crm_client.get_contacts_by_ids(
+                    sorted({row.hubspot_id for _, row in resolved})
+                )
+            }
+            clock.add("fetch", 0.0, crm_calls=1)
+        else:
+            existing = {row.hubspot_id: self._history_to_hubspot(row) for _, row in resolved}
+
+        matched: list[tuple[ContactResponse, HubSpotContact]] = []
+        for contact, row in resolved:
+            hubspot_contact = existing.get(row.hubspot_id)
+            if hubspot_contact is None:
+                remaining.append(contact)
+            else:
+                matched.append((contact, hubspot_contact))
+
+        return matched, remaining
+
+    def _history_to_hubspot(self, row: ContactResponse) -> HubSpotContact:
+        """Build the HubSpot contact last synced from a local history row."""
+        return HubSpotContact(
+            id=row.hubspot_id,
+            properties=HubSpotContactProperties(
+                firstname=row.first_name,
+                lastname=row.last_name,
+                email=row.email,
+                linkedin_id=row.linkedin_id,
+                phone=row.phone,
+                company=row.company,
+            ),
+        )
 
-            self._crm_client.update_contact(hubspot_contact.id, contact_data)
+    def _synced_to_hubspot(self, write: _CrmWrite) -> HubSpotContact:
+        """Build the HubSpot contact as a CRM write left it."""
+        data = write.contact_data
+        return HubSpotContact(
+            id=write.hubspot_id,
+            properties=HubSpotContactProperties(
+                firstname=data["first_name"],
+                lastname=data["last_name"],
+                email=data["email"],
+                linkedin_id=data["linkedin_id"],
+                phone=data["phone"],
+                company=data["company"],
+            ),
+        )
 
-            self._uow.contacts.update_with_hubspot_data(
-                contact_id=local_contact.id,
-                hubspot_id=hubspot_contact.id,
-                **contact_data,
-            )
-            updated_count += 1
+    def _match_partition(
+        self,
+        partition: list[ContactResponse],
+        job_matcher: JobMatcher,
+    ) -> list[_CrmOperation]:
+        """Match stage: turn a partition of local contacts into CRM operations."""
+        match_result = job_matcher.match(partition)
+
+        operations = [
+            _CrmOperation(local_contact=local_contact, hubspot_contact=hubspot_contact)
+            for local_contact, hubspot_contact in match_result.matched
+        ]
+        operations.extend(
+            _CrmOperation(local_contact=local_contact, hubspot_contact=None)
+            for local_contact in match_result.unmatched
+        )
+        return operations
 
-        return updated_count
+    def _write_to_crm(self, operation: _CrmOperation, clock: _JobClock) -> _CrmWrite:
+        """
+        CRM stage: update the matched HubSpot contact or create a new one.
 
-    def _create_new_contacts(
-        self,
-        unmatched_contacts: list[ContactResponse],
-    ) -> int:
-        """Create new contacts in HubSpot for unmatched local contacts."""
-        created_count = 0
-
-        for local_contact in unmatched_contacts:
-            contact_data = {
-                "first_name": local_contact.first_name,
-                "last_name": local_contact.last_name,
-                "email": local_contact.email,
-                "linkedin_id": local_contact.linkedin_id,
-                "phone": local_contact.phone,
-                "company": local_contact.company,
-            }
+        Updates only carry the local values: the CRM keeps its current value
+        for fields left empty, so a matched snapshot that went stale, or
+        another job's queued update, never overrides local data.
+        """
+        local_contact = operation.local_contact
+        contact_data = self._local_contact_data(local_contact)
+
+        if operation.hubspot_contact is not None:
+            with clock.phase("update", crm_calls=1):
+                updated_contact = self._crm_client.update_contact(
+                    operation.hubspot_contact.id, contact_data
+                )
+            return _CrmWrite(
+                local_contact=local_contact,
+                hubspot_id=operation.hubspot_contact.id,
+                contact_data=self._merge_contact_data(local_contact, updated_contact),
+                created=False,
+            )
 
+        with clock.phase("create", crm_calls=1):
             hubspot_contact = self._crm_client.create_contact(contact_data)
+        return _CrmWrite(
+            local_contact=local_contact,
+            hubspot_id=hubspot_contact.id,
+            contact_data=contact_data,
+            created=True,
+        )
 
-            self._uow.contacts.update_with_hubspot_data(
-                contact_id=local_contact.id,
-                hubspot_id=hubspot_contact.id,
-                **contact_data,
-            )
-            created_count += 1
+    def _persist_crm_write(self, contact_id: int, write: _CrmWrite) -> None:
+        """Persist stage: store the HubSpot ID and synced data on a local contact."""
+        self._uow.contacts.update_with_hubspot_data(
+            contact_id=contact_id,
+            hubspot_id=write.hubspot_id,
+            **write.contact_data,
+        )
 
-        return created_count
+    def _local_contact_data(self, local_contact: ContactResponse) -> dict:
+        """Contact data of a local contact, as sent to the CRM."""
+        return {
+            "first_name": local_contact.first_name,
+            "last_name": local_contact.last_name,
+            "email": local_contact.email,
+            "linkedin_id": local_contact.linkedin_id,
+            "phone": local_contact.phone,
+            "company": local_contact.company,
+        }
 
     def _merge_contact_data(
         self,
@@ -0,0 +1,128 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+
+from app.services.job_executor_service import JobExecutorService
+
+# Seconds the database gets to answer a readiness probe
+READINESS_DB_TIMEOUT_SECONDS = float(os.getenv("READINESS_DB_TIMEOUT_SECONDS", "1"))
+# Jobs waiting for a worker thread beyond which the pod sheds load
+READINESS_MAX_QUEUED_JOBS = int(os.getenv("READINESS_MAX_QUEUED_JOBS", "100"))
+# Share of the database pool checked out beyond which the pod sheds load
+READINESS_MAX_POOL_UTILIZATION = float(os.getenv("READINESS_MAX_POOL_UTILIZATION", "0.9"))
+# Share of the CRM rate limit burst below which the pod sheds load
+READINESS_MIN_CRM_HEADROOM = float(os.getenv("READINESS_MIN_CRM_HEADROOM", "0.1"))
+
+
+@dataclass(frozen=True)
+class ReadinessCheck:
+    """Outcome of one readiness check; value and threshold are None when not applicable."""
+
+    name: str
+    ok: bool
+    value: float | None = None
+    threshold: float | None = None
+    message: str | None = None
+
+
+class ReadinessService:
+    """
+    Decides whether the pod should receive traffic.
+
+    The database probe runs on a dedicated thread, so it is not queued
+    behind jobs, and at most one probe runs at a time: while the database
+    hangs, each poll reports the probe still pending instead of starting
+    another. The other checks read counters and cost next to nothing.
+    """
+
+    def __init__(
+        self,
+        job_executor: JobExecutorService,
+        ping: Callable[[], None],
+        pool_utilization: Callable[[], float | None],
+        crm_headroom: Callable[[], float] | None = None,
+        db_timeout: float = READINESS_DB_TIMEOUT_SECONDS,
+        max_queued_jobs: int = READINESS_MAX_QUEUED_JOBS,
+        max_pool_utilization: float = READINESS_MAX_POOL_UTILIZATION,
+        min_crm_headroom: float = READINESS_MIN_CRM_HEADROOM,
+    ):
+        self._job_executor = job_executor
+        self._ping = ping
+        self._pool_utilization = pool_utilization
+        self._crm_headroom = crm_headroom
+        self._db_timeout = db_timeout
+        self._max_queued_jobs = max_queued_jobs
+        self._max_pool_utilization = max_pool_utilization
+        self._min_crm_headroom = min_crm_headroom
+        self._probe_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="readiness")
+        self._probe: asyncio.Future | None = None
+        self._probe_started = 0.0
+
+    async def check(self) -> list[ReadinessCheck]:
+        """Run every check; the pod is ready when all of them are ok."""
+        return [
+            await self._check_database(),
+            self._check_job_queue(),
+            self._check_pool(),
+            self._check_crm_headroom(),
+        ]
+
+    async def _check_database(self) -> ReadinessCheck:
+        if self._probe is not None and not self._probe.done():
+            return ReadinessCheck(
+                "database", ok=False, value=time.perf_counter() - self._probe_started,
+                threshold=self._db_timeout, message="Previous probe still running",
+            )
+        self._probe_started = time.perf_counter()
+        self._probe = asyncio.get_running_loop().run_in_executor(self._probe_thread, self._ping)
+        # Nobody awaits a probe outliving its poll: mark its error as retrieved
+        self._probe.add_done_callback(lambda probe: probe.cancelled() or probe.exception())
+        try:
+            await asyncio.wait_for(asyncio.shield(self._probe), self._db_timeout)
+        except asyncio.TimeoutError:
+            return ReadinessCheck(
+                "database", ok=False, value=time.perf_counter() - self._probe_started,
+                threshold=self._db_timeout, message=f"No answer within {self._db_timeout}s",
+            )
+        except Exception as exc:
+            return ReadinessCheck(
+                "database", ok=False, threshold=self._db_timeout,
+                message=f"{type(exc).__name__}: {exc}",
+            )
+        return ReadinessCheck(
+            "database", ok=True, value=time.perf_counter() - self._probe_started,
+            threshold=self._db_timeout,
+        )
+
+    def _check_job_queue(self) -> ReadinessCheck:
+        queued = self._job_executor.queued_jobs
+        if not self._job_executor.accepting_jobs:
+            return ReadinessCheck(
+                "job_queue", ok=False, value=queued, threshold=self._max_queued_jobs,
+                message="Shutting down, no new jobs accepted",
+            )
+        return ReadinessCheck(
+            "job_queue", ok=queued <= self._max_queued_jobs, value=queued,
+            threshold=self._max_queued_jobs,
+        )
+
+    def _check_pool(self) -> ReadinessCheck:
+        utilization = self._pool_utilization()
+        if utilization is None:
+            return ReadinessCheck("db_pool", ok=True, message="Pool has no fixed capacity")
+        return ReadinessCheck(
+            "db_pool", ok=utilization <= self._max_pool_utilization, value=utilization,
+            threshold=self._max_pool_utilization,
+        )
+
+    def _check_crm_headroom(self) -> ReadinessCheck:
+        if self._crm_headroom is None:
+            return ReadinessCheck("crm_rate_limit", ok=True, message="No client-side rate limit")
+        headroom = self._crm_headroom()
+        return ReadinessCheck(
+            "crm_rate_limit", ok=headroom >= self._min_crm_headroom, value=headroom,
+            threshold=self._min_crm_headroom,
+        )
@@ -0,0 +1,80 @@
+import os
+import tempfile
+import threading
+import time
+from typing import Iterable
+
+from app.domain import HubSpotContact, MatchResult
+from app.infrastructure.index import MatchIndexSnapshot
+from app.schemas import ContactResponse
+from app.services.contact_matching_service import ContactMatchingService, JobMatcher
+
+# Match index snapshot file of the "snapshot" backend, shared by the app's processes
+MATCH_SNAPSHOT_PATH = os.getenv("MATCH_SNAPSHOT_PATH") or os.path.join(
+    tempfile.gettempdir(), "crm-match-index.mix"
+)
+# Age after which a job rewrites the snapshot from the CRM
+MATCH_SNAPSHOT_MAX_AGE_SECONDS = float(os.getenv("MATCH_SNAPSHOT_MAX_AGE_SECONDS", "300"))
+
+
+class _SnapshotJobMatcher:
+    """Matches every partition of a job against one opened snapshot."""
+
+    def __init__(self, service: ContactMatchingService, snapshot: MatchIndexSnapshot):
+        self._service = service
+        self._snapshot = snapshot
+
+    def match(self, local_contacts: list[ContactResponse]) -> MatchResult:
+        return self._service.match_with_index(local_contacts, self._snapshot)
+
+    def close(self) -> None:
+        self._snapshot.close()
+
+
+class SnapshotContactMatchingService(ContactMatchingService):
+    """
+    ContactMatchingService matching against a memory-mapped MatchIndexSnapshot.
+
+    A job starting once the snapshot is missing or older than
+    max_age_seconds rewrites it from the CRM; other jobs only map the file,
+    without fetching the CRM. Contacts written to the CRM by jobs are
+    appended to the snapshot's delta, so later jobs match them before the
+    next rewrite. Contacts created in the CRM by anything else are only
+    seen after that rewrite.
+    """
+
+    def __init__(
+        self,
+        path: str = MATCH_SNAPSHOT_PATH,
+        max_age_seconds: float = MATCH_SNAPSHOT_MAX_AGE_SECONDS,
+    ):
+        super().__init__(workers=0)
+        self._path = path
+        self._max_age_seconds = max_age_seconds
+        # Serializes rewrites of this process; the snapshot's file lock covers other processes
+        self._lock = threading.Lock()
+
+    def start_job(self, hubspot_contacts: Iterable[HubSpotContact]) -> JobMatcher:
+        """
+        Start matching the contacts of a job against the snapshot.
+
+        The HubSpot contacts are only read when the snapshot is due for a rewrite.
+        """
+        with self._lock:
+            if self._is_stale():
+                MatchIndexSnapshot.write(self._path, hubspot_contacts)
+            snapshot = MatchIndexSnapshot(self._path)
+        return _SnapshotJobMatcher(self, snapshot)
+
+    def record_synced(self, hubspot_contacts: list[HubSpotContact]) -> None:
+        """Append contacts a job wrote to the CRM to the snapshot's delta."""
+        with self._lock:
+            if os.path.exists(self._path):
+                MatchIndexSnapshot.append_delta(self._path, hubspot_contacts)
+
+    def _is_stale(self) -> bool:
+        try:
+            modified = os.path.getmtime(self._path)
+        except FileNotFoundError:
+            return True
+        return time.time() - modified >= self._max_age_seconds
@@ -0,0 +1,267 @@
+import contextvars
+import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+from app.domain import StageStats
+
+# Number of local contacts matched per partition
+SYNC_PARTITION_SIZE = int(os.getenv("SYNC_PARTITION_SIZE", "200"))
+# Bounded queue between the match and CRM stages
+SYNC_CRM_QUEUE_SIZE = int(os.getenv("SYNC_CRM_QUEUE_SIZE", "500"))
+# Bounded queue between the CRM and persist stages
+SYNC_PERSIST_QUEUE_SIZE = int(os.getenv("SYNC_PERSIST_QUEUE_SIZE", "500"))
+# CRM writes a single job keeps in flight; at least a batch when writes are aggregated
+SYNC_CRM_CONCURRENCY = int(os.getenv("SYNC_CRM_CONCURRENCY", "1"))
+
+# How often blocked stages re-check whether the pipeline was halted
+_POLL_INTERVAL = 0.05
+
+_DONE = object()
+_HALTED = object()
+
+
+@dataclass(frozen=True)
+class PipelineConfig:
+    """Sizing of the sync pipeline."""
+
+    partition_size: int = SYNC_PARTITION_SIZE
+    crm_queue_size: int = SYNC_CRM_QUEUE_SIZE
+    persist_queue_size: int = SYNC_PERSIST_QUEUE_SIZE
+    crm_concurrency: int = SYNC_CRM_CONCURRENCY
+
+
+@dataclass
+class _StageTimer:
+    """Mutable counters for one stage, turned into StageStats at the end."""
+
+    name: str
+    items: int = 0
+    busy_seconds: float = 0.0
+    started_at: float = field(default_factory=time.perf_counter)
+
+    def to_stats(self) -> StageStats:
+        return StageStats(
+            name=self.name,
+            items=self.items,
+            busy_seconds=self.busy_seconds,
+            wall_seconds=time.perf_counter() - self.started_at,
+        )
+
+
+@dataclass(frozen=True)
+class PipelineRun:
+    """Outcome of a pipeline run."""
+
+    completed: bool
+    stages: tuple[StageStats, ...]
+
+
+class SyncPipeline:
+    """
+    Three-stage pipeline: match -> CRM write -> persist.
+
+    Matching and CRM calls run in their own worker threads, connected by
+    bounded queues, so matching of the next partition, CRM calls and local
+    persistence overlap. The CRM stage keeps up to crm_concurrency writes in
+    flight. The persist stage runs in the calling thread, which keeps all
+    database access on the thread that owns the session.
+
+    When should_stop returns True, or a stage fails, no new partitions are
+    matched and no new CRM calls are made, but every CRM write that succeeded
+    is still persisted before the run returns or raises. Only a failure of
+    the persist stage itself drops the writes still queued for it.
+    """
+
+    def __init__(self, config: PipelineConfig | None = None):
+        self._config = config or PipelineConfig()
+
+    def partition(self, items: list) -> list[list]:
+        """Split items into partitions. Always returns at least one partition."""
+        size = self._config.partition_size
+        return [items[i:i + size] for i in range(0, len(items), size)] or [items]
+
+    def run(
+        self,
+        partitions: Iterable[list],
+        match: Callable[[list], Iterable],
+        write: Callable[[object], object],
+        persist: Callable[[object], None],
+        should_stop: Callable[[], bool],
+        prematched: Iterable = (),
+    ) -> PipelineRun:
+        """
+        Run the pipeline to completion, interruption or failure.
+
+        Args:
+            partitions: Lists of items to match, one stage call each.
+            match: Turns a partition into CRM operations.
+            write: Performs one CRM operation and returns what to persist.
+            persist: Persists one CRM write result.
+            should_stop: Polled to decide whether to stop early.
+            prematched: CRM operations resolved without matching, sent to the
+                CRM stage before any partition is matched.
+
+        Returns:
+            Whether all work completed, and per-stage statistics.
+
+        Raises:
+            Exception: The first error raised by any stage.
+        """
+        crm_queue: queue.Queue = queue.Queue(maxsize=self._config.crm_queue_size)
+        persist_queue: queue.Queue = queue.Queue(maxsize=self._config.persist_queue_size)
+        failed = threading.Event()
+        persist_failed = threading.Event()
+        interrupted = threading.Event()
+        errors: list[BaseException] = []
+
+        def halted() -> bool:
+            return failed.is_set() or should_stop()
+
+        match_timer = _StageTimer("match")
+        write_timer = _StageTimer("crm_write")
+        persist_timer = _StageTimer("persist")
+
+        def match_stage() -> None:
+            try:
+                for operation in prematched:
+                    if not _put(crm_queue, operation, halted):
+                        interrupted.set()
+                        return
+                for partition in partitions:
+                    if halted():
+                        interrupted.set()
+                        return
+                    start = time.perf_counter()
+                    operations = list(match(partition))
+                    match_timer.busy_seconds += time.perf_counter() - start
+                    match_timer.items += len(partition)
+                    for operation in operations:
+                        if not _put(crm_queue, operation, halted):
+                            interrupted.set()
+                            return
+                _put(crm_queue, _DONE, halted)
+            except BaseException as exc:
+                errors.append(exc)
+                failed.set()
+
+        def write_stage() -> None:
+            in_flight: set[Future] = set()
+            executor = ThreadPoolExecutor(
+                max_workers=self._config.crm_concurrency,
+                thread_name_prefix="sync-crm-call",
+            )
+
+            def forward(done: set[Future]) -> None:
+                # A failed write must not keep the others of the set from being persisted
+                for future in done:
+                    try:
+                        result, seconds = future.result()
+                    except BaseException as exc:
+                        errors.append(exc)
+                        failed.set()
+                        continue
+                    write_timer.busy_seconds += seconds
+                    write_timer.items += 1
+                    _put(persist_queue, result, persist_failed.is_set)
+
+            try:
+                while True:
+                    ready = {future for future in in_flight if future.done()}
+                    in_flight -= ready
+                    forward(ready)
+
+                    operation = _get(crm_queue, halted)
+                    if operation is _DONE:
+                        break
+                    if operation is _HALTED or halted():
+                        interrupted.set()
+                        break
+
+                    in_flight.add(executor.submit(
+                        contextvars.copy_context().run, _timed, write, operation
+                    ))
+                    if len(in_flight) >= self._config.crm_concurrency:
+                        ready, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        forward(ready)
+            except BaseException as exc:
+                errors.append(exc)
+                failed.set()
+            finally:
+                # Writes already sent to the CRM must reach the persist stage, even on error
+                ready, in_flight = wait(in_flight)
+                forward(ready)
+                executor.shutdown(wait=True)
+                _put(persist_queue, _DONE, persist_failed.is_set)
+
+        # Stages run in copies of the caller's context, to stay in its trace
+        write_worker = threading.Thread(
+            target=contextvars.copy_context().run, args=(write_stage,),
+            name="sync-crm-write", daemon=True,
+        )
+        workers = [
+            threading.Thread(
+                target=contextvars.copy_context().run, args=(match_stage,),
+                name="sync-match", daemon=True,
+            ),
+            write_worker,
+        ]
+        for worker in workers:
+            worker.start()
+
+        try:
+            # Drains the CRM stage's results even once another stage failed
+            while True:
+                result = _get(persist_queue, lambda: not write_worker.is_alive())
+                if result is _DONE or result is _HALTED:
+                    break
+                start = time.perf_counter()
+                persist(result)
+                persist_timer.busy_seconds += time.perf_counter() - start
+                persist_timer.items += 1
+        except BaseException as exc:
+            errors.append(exc)
+            persist_failed.set()
+            failed.set()
+        finally:
+            for worker in workers:
+                worker.join()
+
+        if errors:
+            raise errors[0]
+
+        return PipelineRun(
+            completed=not interrupted.is_set(),
+            stages=(match_timer.to_stats(), write_timer.to_stats(), persist_timer.to_stats()),
+        )
+
+
+def _timed(func: Callable[[object], object], item: object) -> tuple[object, float]:
+    """Call func on item and return its result with the elapsed seconds."""
+    start = time.perf_counter()
+    return func(item), time.perf_counter() - start
+
+
+def _put(target: queue.Queue, item: object, halted: Callable[[], bool]) -> bool:
+    """Put an item on a bounded queue, giving up if the pipeline is halted."""
+    while True:
+        try:
+            target.put(item, timeout=_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            if halted():
+                return False
+
+
+def _get(source: queue.Queue, halted: Callable[[], bool]) -> object:
+    """Get an item from a queue, returning _HALTED if it stays empty once halted."""
+    while True:
+        try:
+            return source.get(timeout=_POLL_INTERVAL)
+        except queue.Empty:
+            if halted():
+                return _HALTED
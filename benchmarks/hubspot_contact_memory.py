@@ -0,0 +1,122 @@
+"""
+Memory and construction benchmark for HubSpotContact.
+
+Compares the slotted HubSpotContact and HubSpotContactProperties with the
+previous dict-backed dataclasses, on a synthetic portal.
+
+Usage:
+    uv run python -m benchmarks.hubspot_contact_memory --contacts 2000000
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass
+
+from app.domain import HubSpotContact, HubSpotContactProperties
+
+
+@dataclass(frozen=True)
+class DictHubSpotContactProperties:
+    """HubSpotContactProperties as it was before slots."""
+
+    firstname: str | None = None
+    lastname: str | None = None
+    email: str | None = None
+    linkedin_id: str | None = None
+    phone: str | None = None
+    company: str | None = None
+
+
+@dataclass(frozen=True)
+class DictHubSpotContact:
+    """HubSpotContact as it was before slots."""
+
+    id: str
+    properties: DictHubSpotContactProperties
+
+
+def _rows(count: int) -> list[tuple]:
+    """Synthetic contact fields, created up front so they are not measured."""
+    return [
+        (
+            f"hubspot_{i}",
+            f"First{i % 5000}",
+            f"Last{i}",
+            f"user{i}@example.com",
+            f"in-user-{i}" if i % 2 else None,
+            f"+1555{i:07d}" if i % 3 else None,
+            f"Company {i % 1000}",
+        )
+        for i in range(count)
+    ]
+
+
+def _build(contact_class, properties_class, rows: list[tuple]) -> list:
+    return [
+        contact_class(
+            id=hubspot_id,
+            properties=properties_class(
+                firstname=firstname,
+                lastname=lastname,
+                email=email,
+                linkedin_id=linkedin_id,
+                phone=phone,
+                company=company,
+            ),
+        )
+        for hubspot_id, firstname, lastname, email, linkedin_id, phone, company in rows
+    ]
+
+
+def measure(contact_class, properties_class, rows: list[tuple]) -> dict:
+    """Construction time and retained memory of one contact per row."""
+    # Timed without tracing, which slows allocation down
+    gc.collect()
+    start = time.perf_counter()
+    contacts = _build(contact_class, properties_class, rows)
+    seconds = time.perf_counter() - start
+    del contacts
+
+    gc.collect()
+    tracemalloc.start()
+    contacts = _build(contact_class, properties_class, rows)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del contacts
+    return {
+        "construction_seconds": seconds,
+        "retained_bytes": retained,
+        "bytes_per_contact": retained / len(rows),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--contacts", type=int, default=2_000_000)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    rows = _rows(args.contacts)
+    results = {
+        "dict": measure(DictHubSpotContact, DictHubSpotContactProperties, rows),
+        "slots": measure(HubSpotContact, HubSpotContactProperties, rows),
+    }
+
+    print(f"{args.contacts:,} contacts (field strings excluded)")
+    for name, result in results.items():
+        print(
+            f"  {name:5}  {result['construction_seconds']:7.2f} s"
+            f"  {result['retained_bytes'] / 1024 / 1024:9.1f} MiB"
+            f"  {result['bytes_per_contact']:6.1f} B/contact"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"contacts": args.contacts, **results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""
+Benchmark suite for the matching, repository and sync hot paths.
+
+Each benchmark runs at several data scales on deterministic synthetic data,
+against in-memory SQLite and the in-memory HubSpot client. Results are
+written as JSON; compare two result files to flag regressions.
+
+Usage:
+    uv run python -m benchmarks.suite run --output benchmarks/baselines/local.json
+    uv run python -m benchmarks.suite run --only matching --quick --compare benchmarks/baselines/reference.json
+    uv run python -m benchmarks.suite compare benchmarks/baselines/reference.json current.json --threshold 0.15
+
+compare (and run --compare) exits with status 1 when a benchmark's time,
+by default its fastest repetition, grew by more than the threshold.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.infrastructure import Base, HubSpotClient, PushJob, SqlAlchemyUnitOfWork
+from app.repositories import ContactRepository
+from app.schemas import ContactCreate, ContactResponse, PushProfilesRequest
+from app.services import PushService
+from app.services.contact_matching_service import ContactMatchingService
+
+# Prepares one repetition at a scale, returning the call to time
+Prepare = Callable[[int], Callable[[], object]]
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    scales: tuple[int, ...]
+    prepare: Prepare
+
+
+BENCHMARKS: list[Benchmark] = []
+
+
+def benchmark(name: str, scales: tuple[int, ...]) -> Callable[[Prepare], Prepare]:
+    """Register a benchmark."""
+
+    def register(prepare: Prepare) -> Prepare:
+        BENCHMARKS.append(Benchmark(name, scales, prepare))
+        return prepare
+
+    return register
+
+
+# =============================================================================
+# Synthetic data
+# =============================================================================
+
+
+def _profiles(count: int, seed: int = 0) -> list[dict]:
+    """Profile dicts as sent to POST /push, the same for a given count and seed."""
+    rng = random.Random(seed)
+    profiles = []
+    for i in range(count):
+        profile = {
+            "first_name": f"First{rng.randrange(count)}",
+            "last_name": f"Last{i}",
+            "email": f"user{i}@example.com",
+        }
+        if i % 2:
+            profile["linkedin_id"] = f"in-user-{i}"
+        if i % 3:
+            profile["phone"] = f"+1555{i:07d}"
+            profile["company"] = f"Company {i % 100}"
+        profiles.append(profile)
+    return profiles
+
+
+def _session_factory() -> sessionmaker:
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+def _hubspot_client(profiles: list[dict]) -> HubSpotClient:
+    client = HubSpotClient()
+    client.batch_create_contacts(profiles)
+    return client
+
+
+def _contact_responses(profiles: list[dict]) -> list[ContactResponse]:
+    now = datetime.now()
+    return [
+        ContactResponse(id=i + 1, job_id=1, created_at=now, updated_at=now, **profile)
+        for i, profile in enumerate(profiles)
+    ]
+
+
+# =============================================================================
+# Benchmarks
+# =============================================================================
+
+
+@benchmark("matching.match_contacts", scales=(1_000, 10_000, 100_000))
+def _match_contacts(scale: int) -> Callable[[], object]:
+    """Half the local contacts exist in a portal of the same size."""
+    profiles = _profiles(scale)
+    local_contacts = _contact_responses(profiles)
+    hubspot_contacts = _hubspot_client(
+        profiles[: scale // 2] + _profiles(scale - scale // 2, seed=1)
+    ).get_all_contacts()
+    service = ContactMatchingService(workers=0)
+    return lambda: service.match_contacts(local_contacts, hubspot_contacts)
+
+
+@benchmark("repository.bulk_create", scales=(100, 1_000, 10_000))
+def _bulk_create(scale: int) -> Callable[[], object]:
+    session = _session_factory()()
+    job = PushJob(status="pending")
+    session.add(job)
+    session.flush()
+    schemas = [ContactCreate(job_id=job.id, **profile) for profile in _profiles(scale)]
+    repository = ContactRepository(session)
+    return lambda: repository.bulk_create(schemas)
+
+
+@benchmark("repository.update_with_hubspot_data", scales=(100, 1_000, 10_000))
+def _update_with_hubspot_data(scale: int) -> Callable[[], object]:
+    """One update per contact of a job, as the sync does."""
+    session = _session_factory()()
+    job = PushJob(status="pending")
+    session.add(job)
+    session.flush()
+    profiles = _profiles(scale)
+    repository = ContactRepository(session)
+    contacts = repository.bulk_create(
+        [ContactCreate(job_id=job.id, **profile) for profile in profiles]
+    )
+
+    def run() -> None:
+        for contact, profile in zip(contacts, profiles):
+            repository.update_with_hubspot_data(
+                contact.id, hubspot_id=f"hubspot_{contact.id}", **profile
+            )
+        session.flush()
+
+    return run
+
+
+@benchmark("push.process_job", scales=(100, 1_000, 5_000))
+def _process_job(scale: int) -> Callable[[], object]:
+    """A job half of whose profiles already exist in the CRM."""
+    profiles = _profiles(scale)
+    service = PushService(
+        uow=SqlAlchemyUnitOfWork(_session_factory()),
+        crm_client=_hubspot_client(profiles[: scale // 2]),
+        matching_service=ContactMatchingService(workers=0),
+    )
+    job = service.create_push_job(profiles)
+    return lambda: service.process_job(job.id)
+
+
+@benchmark("schemas.push_profiles_request", scales=(10, 100, 1_000))
+def _push_profiles_request(scale: int) -> Callable[[], object]:
+    payload = {"profiles": _profiles(scale)}
+    return lambda: PushProfilesRequest.model_validate(payload)
+
+
+# =============================================================================
+# Runner
+# =============================================================================
+
+
+def _time(prepare: Prepare, scale: int, repeat: int) -> list[float]:
+    """Seconds taken by each repetition, each freshly prepared, after a warm-up."""
+    prepare(min(scale, 10))()
+    timings = []
+    for _ in range(repeat):
+        call = prepare(scale)
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            call()
+            timings.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return timings
+
+
+def _metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def run(only: list[str], quick: bool, repeat: int) -> dict:
+    results = {}
+    for bench in BENCHMARKS:
+        if only and not any(bench.name.startswith(prefix) for prefix in only):
+            continue
+        for scale in bench.scales[:2] if quick else bench.scales:
+            timings = _time(bench.prepare, scale, repeat)
+            key = f"{bench.name}[{scale}]"
+            results[key] = {
+                "benchmark": bench.name,
+                "scale": scale,
+                "repeat": repeat,
+                "min": min(timings),
+                "median": statistics.median(timings),
+                "mean": statistics.mean(timings),
+                "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+            }
+            print(
+                f"{key:<50} median {results[key]['median'] * 1000:10.2f} ms"
+                f"   min {results[key]['min'] * 1000:10.2f} ms",
+                flush=True,
+            )
+    return {"metadata": _metadata(), "results": results}
+
+
+def compare(baseline: dict, current: dict, threshold: float, statistic: str = "min") -> list[str]:
+    """
+    Print the time ratio of every benchmark present in both results.
+
+    Args:
+        statistic: "min", the least sensitive to noise from other processes,
+            "median" or "mean".
+
+    Returns:
+        The benchmarks whose time grew by more than threshold.
+    """
+    regressions = []
+    for key, result in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            print(f"{key:<50} (no baseline)")
+            continue
+        ratio = result[statistic] / base[statistic]
+        if ratio > 1 + threshold:
+            verdict = "REGRESSION"
+            regressions.append(key)
+        elif ratio < 1 - threshold:
+            verdict = "improved"
+        else:
+            verdict = ""
+        print(
+            f"{key:<50} {base[statistic] * 1000:10.2f} ms -> {result[statistic] * 1000:10.2f} ms"
+            f"  x{ratio:5.2f}  {verdict}"
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Hot-path benchmark suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--only", action="append", default=[],
+                            help="run benchmarks whose name starts with this (repeatable)")
+    run_parser.add_argument("--quick", action="store_true", help="only the two smallest scales")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--output", help="write the results to this JSON file")
+    run_parser.add_argument("--compare", metavar="BASELINE", help="compare with a baseline")
+    run_parser.add_argument("--threshold", type=float, default=0.20,
+                            help="relative slowdown flagged as a regression")
+    run_parser.add_argument("--statistic", choices=("min", "median", "mean"), default="min")
+
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.20,
+                                help="relative slowdown flagged as a regression")
+    compare_parser.add_argument("--statistic", choices=("min", "median", "mean"), default="min")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        current = run(args.only, args.quick, args.repeat)
+        if args.output:
+            os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+            with open(args.output, "w") as f:
+                json.dump(current, f, indent=2)
+        if not args.compare:
+            return
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    else:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+
+    regressions = compare(baseline, current, args.threshold, args.statistic)
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,14 @@ from datetime import datetime
 from unittest.mock import Mock
 
 import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from app.domain import HubSpotContact, HubSpotContactProperties, MatchResult
 from app.schemas import ContactResponse, PushJobResponse
+from app.infrastructure import Base
+from app.infrastructure.external.fake_hubspot_server import FakeHubSpotConfig, FakeHubSpotServer
 from app.services.contact_matching_service import ContactMatchingService
 
 
@@ -83,6 +88,7 @@ def make_push_job():
         error: str | None = None,
         created_count: int = 0,
         updated_count: int = 0,
+        timings: dict | None = None,
     ) -> PushJobResponse:
         return PushJobResponse(
             id=id,
@@ -90,6 +96,7 @@ def make_push_job():
             error=error,
             created_count=created_count,
             updated_count=updated_count,
+            timings=timings,
             created_at=datetime.now(),
             updated_at=datetime.now(),
         )
@@ -97,6 +104,54 @@ def make_push_job():
     return _make
 
 
+# =============================================================================
+# Database
+# =============================================================================
+
+
+@pytest.fixture
+def session_factory():
+    """Session factory bound to a fresh in-memory SQLite database."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(session_factory):
+    """SQLAlchemy session on an in-memory SQLite database."""
+    session = session_factory()
+    yield session
+    session.close()
+
+
+# =============================================================================
+# Fake HubSpot
+# =============================================================================
+
+
+@pytest.fixture
+def fake_hubspot():
+    """Factory starting FakeHubSpotServers, stopped after the test."""
+    servers: list[FakeHubSpotServer] = []
+
+    def _start(**config) -> FakeHubSpotServer:
+        config.setdefault("latency_ms", 0)
+        config.setdefault("retry_after_seconds", 0)
+        server = FakeHubSpotServer(FakeHubSpotConfig(**config)).start()
+        servers.append(server)
+        return server
+
+    yield _start
+    for server in servers:
+        server.stop()
+
+
 # =============================================================================
 # Mocks
 # =============================================================================
@@ -113,11 +168,13 @@ def mock_uow(make_push_job) -> Mock:
     mock.push_jobs.get_by_id.return_value = make_push_job()
     mock.push_jobs.mark_as_completed.return_value = None
     mock.push_jobs.mark_as_failed.return_value = None
+    mock.statement_count = 0
 
     # Mock contacts repository
     mock.contacts = Mock()
     mock.contacts.bulk_create.return_value = []
     mock.contacts.get_by_job_id.return_value = []
+    mock.contacts.get_latest_synced_by_keys.return_value = []
     mock.contacts.update_with_hubspot_data.return_value = None
 
     # Context manager support
@@ -132,6 +189,8 @@ def mock_crm_client(make_hubspot_contact) -> Mock:
     """Mock CRM client (HubSpot implementation)."""
     mock = Mock()
     mock.get_all_contacts.return_value = []
+    mock.get_contacts_page.return_value = ([], None)
+    mock.get_contacts_by_ids.return_value = []
     mock.create_contact.return_value = make_hubspot_contact(id="hubspot_new")
     mock.update_contact.return_value = make_hubspot_contact(id="hubspot_1")
     return mock
@@ -139,7 +198,18 @@ def mock_crm_client(make_hubspot_contact) -> Mock:
 
 @pytest.fixture
 def mock_matching_service() -> Mock:
-    """Mock ContactMatchingService."""
+    """Mock ContactMatchingService, whose job matchers call match_contacts per partition."""
     mock = Mock(spec=ContactMatchingService)
     mock.match_contacts.return_value = MatchResult(matched=[], unmatched=[])
+    mock.matches_whole_job.return_value = False
+
+    def start_job(hubspot_contacts):
+        hubspot_contacts = list(hubspot_contacts)
+        return Mock(
+            match=lambda local_contacts: mock.match_contacts(
+                local_contacts=local_contacts, hubspot_contacts=hubspot_contacts
+            )
+        )
+
+    mock.start_job.side_effect = start_job
     return mock
@@ -0,0 +1,149 @@
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from app.domain import ContactNotFoundError, HubSpotApiError
+from app.infrastructure import BatchingCrmClient, HubSpotClient
+
+
+class TestBatchingCrmClient:
+    """Tests for BatchingCrmClient."""
+
+    @pytest.fixture
+    def crm_client(self) -> Mock:
+        return Mock(wraps=HubSpotClient())
+
+    def _run_concurrently(self, func, count: int) -> list:
+        results = [None] * count
+
+        def call(i):
+            results[i] = func(i)
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_batches_creates_from_concurrent_callers(self, crm_client: Mock):
+        """Should send creates from several callers as one full batch."""
+        client = BatchingCrmClient(crm_client, batch_size=5, max_wait_ms=5000)
+
+        results = self._run_concurrently(
+            lambda i: client.create_contact({"email": f"user{i}@example.com"}), 5
+        )
+        client.close()
+
+        crm_client.batch_create_contacts.assert_called_once()
+        assert [contact.properties.email for contact in results] == [
+            f"user{i}@example.com" for i in range(5)
+        ]
+
+    def test_flushes_partial_batch_after_max_wait(self, crm_client: Mock):
+        """Should flush an under-filled batch once the oldest write times out."""
+        client = BatchingCrmClient(crm_client, batch_size=100, max_wait_ms=10)
+
+        contact = client.update_contact("hubspot_1", {"company": "New Co"})
+        client.close()
+
+        crm_client.batch_update_contacts.assert_called_once_with(
+            [("hubspot_1", {"company": "New Co"})]
+        )
+        assert contact.properties.company == "New Co"
+
+    def test_routes_update_errors_to_their_caller(self, crm_client: Mock):
+        """Should only fail the caller whose update was rejected."""
+        client = BatchingCrmClient(crm_client, batch_size=2, max_wait_ms=5000)
+        updates = [("hubspot_1", {"company": "A"}), ("missing", {"company": "B"})]
+
+        def update(i):
+            try:
+                return client.update_contact(*updates[i])
+            except ContactNotFoundError as exc:
+                return exc
+
+        results = self._run_concurrently(update, 2)
+        client.close()
+
+        assert results[0].properties.company == "A"
+        assert isinstance(results[1], ContactNotFoundError)
+
+    def test_coalesces_updates_to_the_same_contact(self, crm_client: Mock):
+        """Should write queued updates of one contact once, combined in order."""
+        client = BatchingCrmClient(crm_client, batch_size=100, max_wait_ms=60000)
+
+        first = client.submit_update("hubspot_2", {"company": "Old Co", "phone": "111"})
+        second = client.submit_update("hubspot_2", {"company": "New Co", "phone": None})
+        client.close()
+
+        crm_client.batch_update_contacts.assert_called_once_with(
+            [("hubspot_2", {"company": "New Co", "phone": "111"})]
+        )
+        assert first.result() is second.result()
+        assert first.result().properties.company == "New Co"
+        assert client.coalesced_updates == 1
+
+    def test_routes_coalesced_update_errors_to_every_caller(self, crm_client: Mock):
+        """Should fail every caller that contributed to a rejected update."""
+        client = BatchingCrmClient(crm_client, batch_size=100, max_wait_ms=60000)
+
+        futures = [client.submit_update("missing", {"company": "A"}) for _ in range(2)]
+        client.close()
+
+        for future in futures:
+            with pytest.raises(ContactNotFoundError):
+                future.result()
+
+    def test_routes_update_results_by_contact_id(self, crm_client: Mock):
+        """Should give each caller its own contact, whatever the result order."""
+        crm_client.batch_update_contacts.side_effect = lambda updates: list(
+            reversed(HubSpotClient().batch_update_contacts(updates))
+        )
+        client = BatchingCrmClient(crm_client, batch_size=100, max_wait_ms=60000)
+
+        first = client.submit_update("hubspot_1", {"company": "A"})
+        second = client.submit_update("hubspot_2", {"company": "B"})
+        client.close()
+
+        assert first.result(timeout=1).id == "hubspot_1"
+        assert second.result(timeout=1).id == "hubspot_2"
+
+    def test_fails_writes_missing_from_a_short_response(self, crm_client: Mock):
+        """Should fail callers left without a result instead of blocking them."""
+        crm_client.batch_create_contacts.side_effect = lambda data: (
+            HubSpotClient().batch_create_contacts(data)[:-1]
+        )
+        crm_client.batch_update_contacts.side_effect = lambda updates: (
+            HubSpotClient().batch_update_contacts(updates)[:-1]
+        )
+        client = BatchingCrmClient(crm_client, batch_size=100, max_wait_ms=60000)
+
+        creates = [client.submit_create({"email": f"u{i}@example.com"}) for i in range(3)]
+        updates = [client.submit_update(f"hubspot_{i}", {"company": "A"}) for i in (1, 2)]
+        client.close()
+
+        for future in creates:
+            with pytest.raises(HubSpotApiError, match="returned 2"):
+                future.result(timeout=1)
+        assert updates[0].result(timeout=1).id == "hubspot_1"
+        with pytest.raises(HubSpotApiError, match="hubspot_2"):
+            updates[1].result(timeout=1)
+
+    def test_close_flushes_pending_writes(self, crm_client: Mock):
+        """Should flush queued writes when closed before they are due."""
+        client = BatchingCrmClient(crm_client, batch_size=100, max_wait_ms=60000)
+
+        future = client.submit_create({"email": "late@example.com"})
+        client.close()
+
+        assert future.result(timeout=1).properties.email == "late@example.com"
+
+    def test_rejects_writes_after_close(self, crm_client: Mock):
+        """Should refuse new writes once closed."""
+        client = BatchingCrmClient(crm_client)
+        client.close()
+
+        with pytest.raises(RuntimeError):
+            client.create_contact({"email": "late@example.com"})
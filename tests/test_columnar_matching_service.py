@@ -0,0 +1,103 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+import numpy as np
+
+from app.services import columnar_matching_service
+from app.services.columnar_matching_service import NumpyContactMatchingService
+from app.services.contact_matching_service import ContactMatchingService
+
+
+class TestNumpyContactMatchingService:
+    """Tests for NumpyContactMatchingService."""
+
+    @pytest.fixture
+    def service(self) -> NumpyContactMatchingService:
+        return NumpyContactMatchingService()
+
+    @pytest.fixture
+    def contacts(self, make_contact, make_hubspot_contact):
+        hubspot_contacts = [
+            make_hubspot_contact(
+                id=f"hs_{i}",
+                email=f"user{i % 17}@example.com" if i % 2 else None,
+                linkedin_id=f"in-{i % 11}" if i % 3 == 0 else None,
+                firstname=f"First{i % 13}",
+                lastname="Last",
+            )
+            for i in range(200)
+        ]
+        local_contacts = [
+            make_contact(
+                id=i,
+                email=f"USER{i % 23}@example.com" if i % 3 else None,
+                linkedin_id=f"IN-{i % 15}" if i % 4 == 0 else None,
+                first_name=f"first{i % 19}" if i % 5 else None,
+                last_name="last",
+            )
+            for i in range(300)
+        ]
+        return local_contacts, hubspot_contacts
+
+    def _ids(self, result):
+        return (
+            [(local.id, hubspot.id) for local, hubspot in result.matched],
+            [local.id for local in result.unmatched],
+        )
+
+    def test_agrees_with_dictionary_matching(self, service, contacts):
+        """Should return exactly the dictionary-based result, in the same order."""
+        local_contacts, hubspot_contacts = contacts
+
+        expected = ContactMatchingService().match_contacts(local_contacts, hubspot_contacts)
+        result = service.match_contacts(local_contacts, hubspot_contacts)
+
+        assert self._ids(result) == self._ids(expected)
+
+    def test_confirms_hash_hits_against_keys(self, service, contacts, monkeypatch):
+        """Should match correctly even when every key hashes to the same value."""
+        local_contacts, hubspot_contacts = contacts
+        expected = ContactMatchingService().match_contacts(local_contacts, hubspot_contacts)
+
+        def colliding_hash(keys):
+            present = np.array([bool(key) for key in keys], dtype=bool)
+            return np.zeros(len(keys), dtype=np.int64), present
+
+        monkeypatch.setattr(columnar_matching_service, "_hash_keys", colliding_hash)
+        result = service.match_contacts(local_contacts, hubspot_contacts)
+
+        assert self._ids(result) == self._ids(expected)
+
+    def test_job_matcher_hashes_hubspot_columns_once(self, service, contacts, monkeypatch):
+        """Should hash each HubSpot column once per job, whatever the partitions."""
+        local_contacts, hubspot_contacts = contacts
+        expected = ContactMatchingService().match_contacts(local_contacts, hubspot_contacts)
+        hashed_columns = []
+        hashed_column = columnar_matching_service._HashedColumn
+        monkeypatch.setattr(
+            columnar_matching_service,
+            "_HashedColumn",
+            lambda keys: hashed_columns.append(keys) or hashed_column(keys),
+        )
+
+        job_matcher = service.start_job(hubspot_contacts)
+        results = [
+            job_matcher.match(local_contacts[start:start + 50])
+            for start in range(0, len(local_contacts), 50)
+        ]
+        job_matcher.close()
+
+        assert len(hashed_columns) == 3
+        assert [pair for result in results for pair in self._ids(result)[0]] == (
+            self._ids(expected)[0]
+        )
+
+    def test_empty_lists(self, service, make_contact):
+        """Should handle empty inputs on either side."""
+        assert service.match_contacts([], []).matched == []
+
+        result = service.match_contacts([make_contact(email="a@example.com")], [])
+
+        assert result.matched == []
+        assert len(result.unmatched) == 1
@@ -0,0 +1,108 @@
+import pytest
+
+from app.domain import DeduplicationResult
+from app.services.contact_deduplication_service import ContactDeduplicationService
+
+
+class TestContactDeduplicationService:
+    """Tests for ContactDeduplicationService."""
+
+    @pytest.fixture
+    def service(self) -> ContactDeduplicationService:
+        return ContactDeduplicationService()
+
+    @pytest.mark.parametrize(
+        "contacts,expected_groups",
+        [
+            # Same email, different case and whitespace
+            (
+                [{"email": "John@Example.com"}, {"email": " john@example.com "}],
+                [[1, 2]],
+            ),
+            # Same LinkedIn ID
+            (
+                [{"linkedin_id": "john-doe"}, {"linkedin_id": "JOHN-DOE"}],
+                [[1, 2]],
+            ),
+            # Linked through email, then LinkedIn ID
+            (
+                [
+                    {"email": "a@example.com", "linkedin_id": "li_1"},
+                    {"email": "a@example.com"},
+                    {"linkedin_id": "li_1"},
+                ],
+                [[1, 2, 3]],
+            ),
+            # Same email but conflicting LinkedIn IDs
+            (
+                [
+                    {"email": "a@example.com", "linkedin_id": "li_1"},
+                    {"email": "a@example.com", "linkedin_id": "li_2"},
+                ],
+                [[1], [2]],
+            ),
+            # Same name only is not a duplicate
+            (
+                [
+                    {"first_name": "John", "last_name": "Doe"},
+                    {"first_name": "John", "last_name": "Doe"},
+                ],
+                [[1], [2]],
+            ),
+        ],
+        ids=["email", "linkedin_id", "transitive", "conflicting_linkedin", "name_only"],
+    )
+    def test_groups_by_match_key(
+        self,
+        service: ContactDeduplicationService,
+        make_contact,
+        contacts: list,
+        expected_groups: list,
+    ):
+        """Should group contacts sharing a normalized email or LinkedIn ID."""
+        local = [make_contact(id=i + 1, **attrs) for i, attrs in enumerate(contacts)]
+
+        result = service.deduplicate(local)
+
+        assert [[c.id for c in group.members] for group in result.groups] == expected_groups
+
+    def test_merges_representative_data(
+        self, service: ContactDeduplicationService, make_contact
+    ):
+        """Should fill the first member's missing fields from the others."""
+        local = [
+            make_contact(id=1, email="a@example.com", first_name="Ann"),
+            make_contact(id=2, email="a@example.com", first_name="Anna", last_name="Lee"),
+        ]
+
+        result = service.deduplicate(local)
+
+        representative = result.groups[0].representative
+        assert representative.id == 1
+        assert representative.first_name == "Ann"
+        assert representative.last_name == "Lee"
+
+    def test_counts_duplicates(self, service: ContactDeduplicationService, make_contact):
+        """Should report how many contacts were collapsed."""
+        local = [
+            make_contact(id=1, email="a@example.com"),
+            make_contact(id=2, email="a@example.com"),
+            make_contact(id=3, email="a@example.com"),
+            make_contact(id=4, email="b@example.com"),
+        ]
+
+        result = service.deduplicate(local)
+
+        assert isinstance(result, DeduplicationResult)
+        assert len(result.representatives) == 2
+        assert result.duplicate_count == 2
+
+    def test_keeps_unique_contacts_unchanged(
+        self, service: ContactDeduplicationService, make_contact
+    ):
+        """Should return the original contact when it has no duplicate."""
+        contact = make_contact(id=1, email="a@example.com")
+
+        result = service.deduplicate([contact])
+
+        assert result.representatives[0] is contact
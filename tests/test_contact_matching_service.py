@@ -1,7 +1,19 @@
+from unittest.mock import Mock
+
 import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
 
-from app.domain import HubSpotContact, MatchResult
-from app.services.contact_matching_service import ContactMatchingService
+from app.domain import BloomFilter, HubSpotContact, MatchKeyFilter, MatchKeys, MatchResult
+from app.infrastructure import Base, HubSpotClient, SqlAlchemyUnitOfWork
+from app.repositories import crm_contact_repository
+from app.schemas import ContactCreate
+from app.services import PushService
+from app.services.contact_matching_service import (
+    ContactMatchingService,
+    HubSpotMatchIndex,
+    SqlContactMatchingService,
+)
 
 
 class TestContactMatchingService:
@@ -42,8 +54,27 @@ class TestContactMatchingService:
                 {"firstname": "john", "lastname": "doe"},
                 "full_name_case_insensitive",
             ),
+            # Email matching ignores case and surrounding whitespace
+            (
+                {"email": "Test@Example.com"},
+                {"email": " test@example.com "},
+                "email_normalized",
+            ),
+            # LinkedIn ID matching ignores case
+            (
+                {"linkedin_id": "John-Doe"},
+                {"linkedin_id": "john-doe"},
+                "linkedin_id_normalized",
+            ),
+        ],
+        ids=[
+            "linkedin_id",
+            "email",
+            "full_name",
+            "full_name_case_insensitive",
+            "email_normalized",
+            "linkedin_id_normalized",
         ],
-        ids=["linkedin_id", "email", "full_name", "full_name_case_insensitive"],
     )
     def test_match_contacts_by_criteria(
         self,
@@ -155,6 +186,43 @@ class TestContactMatchingService:
         assert len(result.matched) == 1
         assert result.matched[0][1].id == "hs_email"
 
+    def test_linkedin_priority_regardless_of_hubspot_order(
+        self, service: ContactMatchingService, make_contact, make_hubspot_contact
+    ):
+        """A LinkedIn ID match should win even if an email match comes first."""
+        local = make_contact(linkedin_id="linkedin_123", email="test@example.com")
+        hubspot_email = make_hubspot_contact(id="hs_email", email="test@example.com")
+        hubspot_linkedin = make_hubspot_contact(id="hs_linkedin", linkedin_id="linkedin_123")
+
+        result = service.match_contacts([local], [hubspot_email, hubspot_linkedin])
+
+        assert result.matched[0][1].id == "hs_linkedin"
+
+    def test_first_hubspot_contact_wins_for_shared_key(
+        self, service: ContactMatchingService, make_contact, make_hubspot_contact
+    ):
+        """Should pick the first HubSpot contact when several share a key."""
+        local = make_contact(email="test@example.com")
+        first = make_hubspot_contact(id="hs_first", email="test@example.com")
+        second = make_hubspot_contact(id="hs_second", email="test@example.com")
+
+        result = service.match_contacts([local], [first, second])
+
+        assert result.matched[0][1].id == "hs_first"
+
+    def test_uses_stored_normalized_keys(
+        self, service: ContactMatchingService, make_contact, make_hubspot_contact
+    ):
+        """Should use the normalized columns stored on local contacts."""
+        local = make_contact(email="Test@Example.com").model_copy(
+            update={"email_norm": "test@example.com"}
+        )
+        hubspot = make_hubspot_contact(email="TEST@example.com")
+
+        result = service.match_contacts([local], [hubspot])
+
+        assert len(result.matched) == 1
+
     # =========================================================================
     # Edge cases (parametrized)
     # =========================================================================
@@ -225,3 +293,358 @@ class TestContactMatchingService:
         assert isinstance(result, MatchResult)
         assert hasattr(result, "matched")
         assert hasattr(result, "unmatched")
+
+
+class TestJobMatcher:
+    """Tests for matching a job partition by partition."""
+
+    def test_builds_index_once_per_job(self, make_contact, make_hubspot_contact, monkeypatch):
+        """Should reuse the index built for the first partition."""
+        builds = []
+        build = HubSpotMatchIndex.build
+        monkeypatch.setattr(
+            HubSpotMatchIndex,
+            "build",
+            classmethod(lambda cls, contacts: builds.append(1) or build(contacts)),
+        )
+        hubspot_contact = make_hubspot_contact(email="a@example.com")
+        job_matcher = ContactMatchingService().start_job([hubspot_contact])
+
+        first = job_matcher.match([make_contact(id=1, email="a@example.com")])
+        second = job_matcher.match([make_contact(id=2, email="b@example.com")])
+        job_matcher.close()
+
+        assert len(builds) == 1
+        assert [(local.id, hs.id) for local, hs in first.matched] == [(1, hubspot_contact.id)]
+        assert [c.id for c in second.unmatched] == [2]
+
+    def test_skips_index_when_no_contact_may_match(
+        self, make_contact, make_hubspot_contact, monkeypatch
+    ):
+        """Should not build the index for partitions the prefilter rules out."""
+        match_filter = MatchKeyFilter.create(capacity=100)
+        match_filter.add(MatchKeys(email="known@example.com"))
+        service = ContactMatchingService(prefilter=lambda: match_filter)
+        monkeypatch.setattr(HubSpotMatchIndex, "build", None)
+
+        job_matcher = service.start_job([make_hubspot_contact(email="known@example.com")])
+        result = job_matcher.match([make_contact(id=1, email="new@example.com")])
+
+        assert [c.id for c in result.unmatched] == [1]
+
+
+class TestSqlContactMatchingService:
+    """Tests for SqlContactMatchingService against SQLite."""
+
+    @pytest.fixture
+    def uow(self, session_factory) -> SqlAlchemyUnitOfWork:
+        return SqlAlchemyUnitOfWork(session_factory)
+
+    @pytest.fixture
+    def service(self, session_factory) -> SqlContactMatchingService:
+        return SqlContactMatchingService(lambda: SqlAlchemyUnitOfWork(session_factory))
+
+    @pytest.fixture
+    def store_contacts(self, uow):
+        """Store a job with the given contacts, returning the job ID and contacts."""
+
+        def _store(*contacts: dict):
+            with uow:
+                job_id = uow.push_jobs.create_pending_job().id
+                stored = uow.contacts.bulk_create(
+                    [ContactCreate(job_id=job_id, **attrs) for attrs in contacts]
+                )
+            return job_id, stored
+
+        return _store
+
+    def test_matches_by_priority(self, service, store_contacts, make_hubspot_contact):
+        """Should keep the best tier per contact, then the first CRM contact."""
+        service.refresh_crm_contacts(
+            [
+                make_hubspot_contact(id="by_name", firstname="ann", lastname="lee"),
+                make_hubspot_contact(id="by_email", email="ANN@example.com"),
+                make_hubspot_contact(id="by_email_later", email="ann@example.com"),
+                make_hubspot_contact(id="by_linkedin", linkedin_id="ann-lee"),
+            ]
+        )
+        job_id, (linkedin, email, name, none) = store_contacts(
+            {"linkedin_id": "Ann-Lee", "email": "ann@example.com"},
+            {"email": "ann@example.com", "first_name": "Ann", "last_name": "Lee"},
+            {"first_name": "Ann", "last_name": "Lee"},
+            {"email": "bob@example.com"},
+        )
+
+        result = service.match_job(job_id)
+
+        assert result.matched == [
+            (linkedin.id, "by_linkedin"),
+            (email.id, "by_email"),
+            (name.id, "by_name"),
+        ]
+        assert result.unmatched == [none.id]
+
+    def test_restricts_to_job_and_contact_ids(
+        self, service, store_contacts, make_hubspot_contact
+    ):
+        """Should only match the requested contacts of the requested job."""
+        service.refresh_crm_contacts([make_hubspot_contact(id="hs_1", email="a@example.com")])
+        other_job_id, _ = store_contacts({"email": "a@example.com"})
+        job_id, (first, second) = store_contacts(
+            {"email": "a@example.com"}, {"email": "b@example.com"}
+        )
+
+        result = service.match_job(job_id, contact_ids=[second.id])
+
+        assert result.matched == []
+        assert result.unmatched == [second.id]
+        assert service.match_job(job_id, contact_ids=[]).unmatched == []
+
+    def test_refresh_updates_in_place(self, service, uow, store_contacts, make_hubspot_contact):
+        """Should update mirrored contacts by HubSpot ID, keeping their position."""
+        service.refresh_crm_contacts(
+            [
+                make_hubspot_contact(id="hs_1", email="old@example.com"),
+                make_hubspot_contact(id="hs_2", email="new@example.com"),
+            ]
+        )
+        service.refresh_crm_contacts([make_hubspot_contact(id="hs_1", email="new@example.com")])
+        job_id, (contact,) = store_contacts({"email": "new@example.com"})
+
+        assert service.match_job(job_id).matched == [(contact.id, "hs_1")]
+        with uow:
+            mirrored = uow.crm_contacts.get_by_hubspot_ids(["hs_2", "hs_1", "unknown"])
+        assert [c.id for c in mirrored] == ["hs_1", "hs_2"]
+
+    def test_agrees_with_in_memory_matching(
+        self, service, store_contacts, make_hubspot_contact
+    ):
+        """Should return the same matches as ContactMatchingService."""
+        hubspot_contacts = [
+            make_hubspot_contact(
+                id=f"hs_{i}",
+                email=f"user{i % 7}@example.com" if i % 2 else None,
+                linkedin_id=f"in-{i % 5}" if i % 3 == 0 else None,
+                firstname=f"First{i % 4}",
+                lastname="Last",
+            )
+            for i in range(30)
+        ]
+        service.refresh_crm_contacts(hubspot_contacts)
+        job_id, local_contacts = store_contacts(
+            *(
+                {
+                    "email": f"USER{i % 9}@example.com" if i % 3 else None,
+                    "linkedin_id": f"IN-{i % 6}" if i % 4 == 0 else None,
+                    "first_name": f"first{i % 6}" if i % 5 else None,
+                    "last_name": "last",
+                }
+                for i in range(40)
+            )
+        )
+
+        expected = ContactMatchingService().match_contacts(local_contacts, hubspot_contacts)
+        result = service.match_job(job_id)
+
+        assert result.matched == [(local.id, hs.id) for local, hs in expected.matched]
+        assert result.unmatched == [local.id for local in expected.unmatched]
+
+    def test_chunks_contact_ids(self, service, store_contacts, monkeypatch):
+        """Should match long contact ID lists in chunks, in contact ID order."""
+        monkeypatch.setattr(crm_contact_repository, "IN_CLAUSE_CHUNK_SIZE", 2)
+        job_id, contacts = store_contacts(*({"email": f"u{i}@example.com"} for i in range(5)))
+
+        result = service.match_job(job_id, contact_ids=[c.id for c in reversed(contacts)])
+
+        assert result.unmatched == [c.id for c in contacts]
+
+    def test_push_jobs_refresh_the_mirror_when_stale(self, tmp_path, make_hubspot_contact):
+        """Should mirror the CRM for the first job only, and drop deleted contacts."""
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False}
+        )
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine)
+        crm_client = Mock(wraps=HubSpotClient())
+        crm_client.create_contact({"email": "known@example.com"})
+        service = SqlContactMatchingService(
+            lambda: SqlAlchemyUnitOfWork(session_factory), max_age_seconds=3600
+        )
+        with SqlAlchemyUnitOfWork(session_factory) as uow:
+            uow.crm_contacts.upsert_many([make_hubspot_contact(id="deleted")])
+        push_service = PushService(
+            uow=SqlAlchemyUnitOfWork(session_factory),
+            crm_client=crm_client,
+            matching_service=service,
+            history_lookup=False,
+        )
+
+        first = push_service.create_push_job([{"email": "known@example.com"}])
+        second = push_service.create_push_job([{"email": "KNOWN@example.com"}])
+        first_result = push_service.process_job(first.id)
+        second_result = push_service.process_job(second.id)
+
+        assert (first_result.updated_count, second_result.updated_count) == (1, 1)
+        assert crm_client.get_contacts_page.call_count == 1
+        with SqlAlchemyUnitOfWork(session_factory) as uow:
+            assert uow.crm_contacts.get_by_hubspot_ids(["deleted"]) == []
+        engine.dispose()
+
+    def test_back_to_back_jobs_match_contacts_created_by_the_first(self, tmp_path):
+        """Should find a contact created by a job in the mirror, without the history lookup."""
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False}
+        )
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine)
+        crm_client = HubSpotClient()
+        push_service = PushService(
+            uow=SqlAlchemyUnitOfWork(session_factory),
+            crm_client=crm_client,
+            matching_service=SqlContactMatchingService(
+                lambda: SqlAlchemyUnitOfWork(session_factory), max_age_seconds=3600
+            ),
+            history_lookup=False,
+        )
+
+        first = push_service.create_push_job([{"email": "new@example.com"}])
+        first_result = push_service.process_job(first.id)
+        second = push_service.create_push_job([{"email": "NEW@example.com", "phone": "555"}])
+        second_result = push_service.process_job(second.id)
+
+        assert (first_result.created_count, second_result.created_count) == (1, 0)
+        assert second_result.updated_count == 1
+        emails = [c.properties.email.lower() for c in crm_client.get_all_contacts()]
+        assert emails.count("new@example.com") == 1
+        engine.dispose()
+
+
+class TestParallelContactMatching:
+    """Tests for process-pool matching in ContactMatchingService."""
+
+    @pytest.fixture
+    def service(self):
+        service = ContactMatchingService(workers=3, parallel_min_contacts=10)
+        yield service
+        service.close()
+
+    @pytest.fixture
+    def contacts(self, make_contact, make_hubspot_contact):
+        hubspot_contacts = [
+            make_hubspot_contact(
+                id=f"hs_{i}",
+                email=f"user{i % 17}@example.com" if i % 2 else None,
+                linkedin_id=f"in-{i % 11}" if i % 3 == 0 else None,
+                firstname=f"First{i % 13}",
+                lastname="Last",
+            )
+            for i in range(200)
+        ]
+        local_contacts = [
+            make_contact(
+                id=i,
+                email=f"USER{i % 23}@example.com" if i % 3 else None,
+                linkedin_id=f"IN-{i % 15}" if i % 4 == 0 else None,
+                first_name=f"first{i % 19}" if i % 5 else None,
+                last_name="last",
+            )
+            for i in range(300)
+        ]
+        return local_contacts, hubspot_contacts
+
+    def test_agrees_with_in_process_matching(self, service, contacts):
+        """Should return exactly the in-process result, in the same order."""
+        local_contacts, hubspot_contacts = contacts
+
+        expected = ContactMatchingService().match_contacts(local_contacts, hubspot_contacts)
+        result = service.match_contacts(local_contacts, hubspot_contacts)
+
+        assert [(l.id, h.id) for l, h in result.matched] == [
+            (l.id, h.id) for l, h in expected.matched
+        ]
+        assert [c.id for c in result.unmatched] == [c.id for c in expected.unmatched]
+
+    def test_stays_in_process_below_threshold(self, service, contacts):
+        """Should not start worker processes for small inputs."""
+        local_contacts, hubspot_contacts = contacts
+
+        service.match_contacts(local_contacts[:9], hubspot_contacts)
+
+        assert service._pool is None
+
+    def test_job_matcher_matches_large_jobs_in_processes(self, service, contacts):
+        """Should match a job above the threshold in the process pool, at once."""
+        local_contacts, hubspot_contacts = contacts
+
+        expected = ContactMatchingService().match_contacts(local_contacts, hubspot_contacts)
+        job_matcher = service.start_job(hubspot_contacts)
+        result = job_matcher.match(local_contacts)
+        job_matcher.close()
+
+        assert service.matches_whole_job(len(local_contacts))
+        assert not service.matches_whole_job(9)
+        assert service._pool is not None
+        assert [(l.id, h.id) for l, h in result.matched] == [
+            (l.id, h.id) for l, h in expected.matched
+        ]
+
+
+class TestMatchKeyPrefilter:
+    """Tests for the Bloom-filter prefilter of ContactMatchingService."""
+
+    def test_filter_has_no_false_negatives(self):
+        """Should report every added key, with a low false-positive rate."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"user{i}@example.com")
+
+        assert all(f"user{i}@example.com" in bloom for i in range(1000))
+        false_positives = sum(f"other{i}@example.com" in bloom for i in range(10000))
+        assert false_positives < 300
+        assert 0 < bloom.false_positive_rate < 0.03
+
+    def test_filter_round_trips_through_bytes(self):
+        """Should give the same answers after serialization."""
+        match_filter = MatchKeyFilter.create(capacity=100)
+        match_filter.add(MatchKeys(linkedin_id="in-1", email="a@example.com"))
+
+        restored = MatchKeyFilter.from_bytes(match_filter.to_bytes())
+
+        assert restored.might_match(MatchKeys(email="a@example.com"))
+        assert restored.might_match(MatchKeys(linkedin_id="in-1"))
+        assert not restored.might_match(MatchKeys(email="b@example.com"))
+        assert restored.false_positive_rates == match_filter.false_positive_rates
+
+    def test_skips_index_when_no_contact_may_match(
+        self, make_contact, make_hubspot_contact, monkeypatch
+    ):
+        """Should send definite misses to unmatched without building the index."""
+        match_filter = MatchKeyFilter.create(capacity=100)
+        match_filter.add(MatchKeys(email="known@example.com"))
+        service = ContactMatchingService(prefilter=lambda: match_filter)
+        monkeypatch.setattr(HubSpotMatchIndex, "build", None)
+
+        result = service.match_contacts(
+            [make_contact(id=1, email="new@example.com")],
+            [make_hubspot_contact(email="known@example.com")],
+        )
+
+        assert result.matched == []
+        assert [c.id for c in result.unmatched] == [1]
+
+    def test_matches_contacts_that_may_match(self, make_contact, make_hubspot_contact):
+        """Should still match contacts the filter lets through."""
+        client = HubSpotClient()
+        created = client.create_contact({"email": "Known@example.com"})
+        service = ContactMatchingService(prefilter=client.get_match_filter)
+
+        result = service.match_contacts(
+            [
+                make_contact(id=1, email="known@example.com"),
+                make_contact(id=2, email="new@example.com"),
+            ],
+            client.get_all_contacts(),
+        )
+
+        assert [(local.id, hs.id) for local, hs in result.matched] == [(1, created.id)]
+        assert [c.id for c in result.unmatched] == [2]
@@ -0,0 +1,104 @@
+import pytest
+
+from app.repositories import ContactRepository, PushJobRepository
+from app.schemas import ContactCreate
+
+
+class TestContactRepository:
+    """Tests for ContactRepository against SQLite."""
+
+    @pytest.fixture
+    def repository(self, db_session) -> ContactRepository:
+        return ContactRepository(db_session)
+
+    @pytest.fixture
+    def job_ids(self, db_session) -> list[int]:
+        jobs = PushJobRepository(db_session)
+        return [jobs.create_pending_job().id for _ in range(2)]
+
+    def test_fills_match_keys_on_insert(self, repository: ContactRepository, job_ids):
+        """Should store normalized match keys when contacts are created."""
+        [contact] = repository.bulk_create(
+            [
+                ContactCreate(
+                    job_id=job_ids[0],
+                    email=" John@Example.com",
+                    linkedin_id="John-Doe",
+                    first_name="John",
+                    last_name="Doe",
+                )
+            ]
+        )
+
+        assert contact.email_norm == "john@example.com"
+        assert contact.linkedin_norm == "john-doe"
+        assert contact.name_key == "john|doe"
+
+    def test_refreshes_match_keys_on_update(self, repository: ContactRepository, job_ids):
+        """Should recompute match keys when synced data changes them."""
+        [contact] = repository.bulk_create([ContactCreate(job_id=job_ids[0], first_name="Ann")])
+
+        updated = repository.update_with_hubspot_data(
+            contact_id=contact.id,
+            hubspot_id="hs_1",
+            first_name="Ann",
+            last_name="Lee",
+            email="ANN@example.com",
+        )
+
+        assert updated.email_norm == "ann@example.com"
+        assert updated.name_key == "ann|lee"
+
+    def test_gets_by_normalized_email(self, repository: ContactRepository, job_ids):
+        """Should find a contact by email regardless of case."""
+        repository.bulk_create([ContactCreate(job_id=job_ids[0], email="ann@example.com")])
+
+        assert repository.get_by_email("ANN@example.com ") is not None
+
+    def test_gets_latest_synced_by_keys(self, repository: ContactRepository, job_ids):
+        """Should return synced rows of other jobs sharing a key, most recent first."""
+        older, newer, unsynced = repository.bulk_create(
+            [
+                ContactCreate(job_id=job_ids[0], email="ann@example.com"),
+                ContactCreate(job_id=job_ids[0], linkedin_id="ann-lee"),
+                ContactCreate(job_id=job_ids[0], email="bob@example.com"),
+            ]
+        )
+        [current] = repository.bulk_create(
+            [ContactCreate(job_id=job_ids[1], email="ann@example.com")]
+        )
+        for contact in (older, newer, current):
+            repository.update_with_hubspot_data(
+                contact_id=contact.id,
+                hubspot_id=f"hs_{contact.id}",
+                email=contact.email,
+                linkedin_id=contact.linkedin_id,
+            )
+
+        rows = repository.get_latest_synced_by_keys(
+            emails=["Ann@Example.com", "bob@example.com"],
+            linkedin_ids=["ANN-LEE"],
+            exclude_job_id=job_ids[1],
+        )
+
+        assert [row.id for row in rows] == [newer.id, older.id]
+
+    def test_gets_only_latest_synced_row_per_key(self, repository: ContactRepository, job_ids):
+        """Should skip older synced rows of a key once a newer one exists."""
+        first, second = repository.bulk_create(
+            [
+                ContactCreate(job_id=job_ids[0], email="ann@example.com"),
+                ContactCreate(job_id=job_ids[0], email="ANN@example.com"),
+            ]
+        )
+        for contact in (first, second):
+            repository.update_with_hubspot_data(
+                contact_id=contact.id,
+                hubspot_id=f"hs_{contact.id}",
+                email=contact.email,
+                linkedin_id=None,
+            )
+
+        rows = repository.get_latest_synced_by_keys(emails=["ann@example.com"], linkedin_ids=[])
+
+        assert [row.id for row in rows] == [second.id]
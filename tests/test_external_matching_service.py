@@ -0,0 +1,108 @@
+import pytest
+
+from app.infrastructure import HubSpotClient, SqlAlchemyUnitOfWork
+from app.services import PushService, external_matching_service
+from app.services.contact_matching_service import ContactMatchingService
+from app.services.external_matching_service import ExternalMergeMatchingService
+from app.services.sync_pipeline import PipelineConfig
+
+
+class TestExternalMergeMatchingService:
+    """Tests for ExternalMergeMatchingService."""
+
+    @pytest.fixture
+    def service(self, tmp_path) -> ExternalMergeMatchingService:
+        # A few records per run, so that every tier spills several runs
+        return ExternalMergeMatchingService(memory_limit_bytes=4096, spill_dir=str(tmp_path))
+
+    @pytest.fixture
+    def contacts(self, make_contact, make_hubspot_contact):
+        hubspot_contacts = [
+            make_hubspot_contact(
+                id=f"hs_{i}",
+                email=f"user{i % 17}@example.com" if i % 2 else None,
+                linkedin_id=f"in-{i % 11}" if i % 3 == 0 else None,
+                firstname=f"First{i % 13}",
+                lastname="Last",
+            )
+            for i in range(200)
+        ]
+        local_contacts = [
+            make_contact(
+                id=i,
+                email=f"USER{i % 23}@example.com" if i % 3 else None,
+                linkedin_id=f"IN-{i % 15}" if i % 4 == 0 else None,
+                first_name=f"first{i % 19}" if i % 5 else None,
+                last_name="last",
+            )
+            for i in range(300)
+        ]
+        return local_contacts, hubspot_contacts
+
+    def _ids(self, result):
+        return (
+            [(local.id, hubspot.id) for local, hubspot in result.matched],
+            [local.id for local in result.unmatched],
+        )
+
+    def test_agrees_with_in_memory_matching(self, service, contacts):
+        """Should return exactly the in-memory result, in the same order."""
+        local_contacts, hubspot_contacts = contacts
+
+        expected = ContactMatchingService().match_contacts(local_contacts, hubspot_contacts)
+        result = service.match_contacts(local_contacts, iter(hubspot_contacts))
+
+        assert self._ids(result) == self._ids(expected)
+        hubspot_by_id = {hs.id: hs for hs in hubspot_contacts}
+        assert all(hs == hubspot_by_id[hs.id] for _, hs in result.matched)
+
+    def test_reports_spill_and_merge(self, service, contacts, tmp_path, caplog):
+        """Should report and log spilled runs, and clean them up afterwards."""
+        local_contacts, hubspot_contacts = contacts
+
+        with caplog.at_level("INFO", logger=external_matching_service.__name__):
+            _, stats = service.match_contacts_with_stats(local_contacts, hubspot_contacts)
+
+        assert stats.run_files > 6
+        assert stats.spill_bytes > 0
+        assert stats.merge_seconds > 0
+        assert list(tmp_path.iterdir()) == []
+        assert f"{stats.run_files} run files, {stats.spill_bytes} bytes spilled" in caplog.text
+
+    def test_empty_lists(self, service, make_contact):
+        """Should handle empty inputs on either side."""
+        assert service.match_contacts([], []).matched == []
+
+        result = service.match_contacts([make_contact(email="a@example.com")], [])
+
+        assert result.unmatched[0].email == "a@example.com"
+
+    def test_push_job_streams_crm_pages_into_one_merge(
+        self, service, session_factory, tmp_path, monkeypatch
+    ):
+        """Should stream the CRM into the spill files and match the whole job at once."""
+        crm_client = HubSpotClient()
+        crm_client.create_contact({"email": "known@example.com"})
+        push_service = PushService(
+            uow=SqlAlchemyUnitOfWork(session_factory),
+            crm_client=crm_client,
+            matching_service=service,
+            pipeline_config=PipelineConfig(partition_size=2),
+            history_lookup=False,
+        )
+        job = push_service.create_push_job(
+            [{"email": f"new{i}@example.com"} for i in range(4)] + [{"email": "known@example.com"}]
+        )
+        merged = []
+        match_with_stats = external_matching_service._ExternalJobMatcher.match_with_stats
+        monkeypatch.setattr(
+            external_matching_service._ExternalJobMatcher,
+            "match_with_stats",
+            lambda self, local_contacts: merged.append(len(local_contacts))
+            or match_with_stats(self, local_contacts),
+        )
+        result = push_service.process_job(job.id)
+
+        assert merged == [5]
+        assert (result.created_count, result.updated_count) == (4, 1)
+        assert list(tmp_path.iterdir()) == []
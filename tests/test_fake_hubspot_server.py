@@ -0,0 +1,197 @@
+import json
+
+import httpx
+import pytest
+
+from app.domain import ContactNotFoundError, HubSpotApiError
+from app.infrastructure import HubSpotHttpClient
+
+
+def _client(server, **kwargs) -> HubSpotHttpClient:
+    kwargs.setdefault("retry_backoff_seconds", 0)
+    return HubSpotHttpClient(server.url, **kwargs)
+
+
+class TestFakeHubSpotServer:
+    def test_lists_seeded_portal_across_pages(self, fake_hubspot):
+        server = fake_hubspot(seed_contacts=250, page_size=100)
+        client = _client(server)
+
+        contacts = client.get_all_contacts()
+
+        # Two built-in contacts, then the seeded ones, in creation order
+        assert len(contacts) == 252
+        assert [c.id for c in contacts] == [c.id for c in server.store.get_all_contacts()]
+        assert server.stats[200] == 3
+
+    def test_seeded_portal_is_deterministic(self, fake_hubspot):
+        first = fake_hubspot(seed_contacts=20, random_seed=7)
+        second = fake_hubspot(seed_contacts=20, random_seed=7)
+
+        assert first.store.get_all_contacts() == second.store.get_all_contacts()
+
+    def test_create_update_and_read_back(self, fake_hubspot):
+        server = fake_hubspot()
+        client = _client(server)
+
+        created = client.create_contact({"first_name": "Ada", "email": "ada@example.com"})
+        updated = client.update_contact(created.id, {"company": "Analytical", "email": None})
+
+        assert updated.properties.email == "ada@example.com"
+        assert updated.properties.company == "Analytical"
+        assert client.get_contacts_by_ids([created.id, "missing"]) == [updated]
+
+    def test_batches_are_split_at_the_hubspot_limit(self, fake_hubspot):
+        server = fake_hubspot()
+        client = _client(server)
+
+        created = client.batch_create_contacts(
+            [{"email": f"user{i}@example.com"} for i in range(150)]
+        )
+        updated = client.batch_update_contacts([(c.id, {"company": "Acme"}) for c in created])
+
+        assert [c.properties.email for c in created] == [
+            f"user{i}@example.com" for i in range(150)
+        ]
+        assert all(c.properties.company == "Acme" for c in updated)
+        assert server.stats[201] == 2 and server.stats[200] == 2
+
+    def test_batch_results_are_returned_in_input_order(self, fake_hubspot):
+        server = fake_hubspot(shuffle_batch_results=True, random_seed=3)
+        client = _client(server)
+
+        emails = [f"user{i}@example.com" for i in range(50)]
+        created = client.batch_create_contacts([{"email": email} for email in emails])
+        ids = [c.id for c in reversed(created)]
+        updated = client.batch_update_contacts([(id_, {"company": "Acme"}) for id_ in ids])
+
+        assert [c.properties.email for c in created] == emails
+        assert [c.id for c in updated] == ids
+
+    def test_incomplete_batch_writes_raise(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            inputs = json.loads(request.content)["inputs"]
+            if request.url.path.endswith("/batch/create"):
+                results = [
+                    {"id": f"hubspot_{i}", "objectWriteTraceId": item["objectWriteTraceId"]}
+                    for i, item in enumerate(inputs[:-1])
+                ]
+                return httpx.Response(201, json={"status": "COMPLETE", "results": results})
+            return httpx.Response(207, json={
+                "status": "COMPLETE",
+                "results": [{"id": inputs[0]["id"]}],
+                "numErrors": 1,
+                "errors": [{"category": "VALIDATION_ERROR", "message": "Bad email"}],
+            })
+
+        client = HubSpotHttpClient("http://hubspot.test", max_retries=0)
+        client._http = httpx.Client(
+            base_url="http://hubspot.test", transport=httpx.MockTransport(handler)
+        )
+
+        with pytest.raises(HubSpotApiError, match="1 results for 2 inputs"):
+            client.batch_create_contacts([{"email": "a@example.com"}, {"email": "b@example.com"}])
+        with pytest.raises(HubSpotApiError, match="207: Bad email"):
+            client.batch_update_contacts([("hubspot_1", {}), ("hubspot_2", {})])
+
+    def test_update_of_unknown_contact_raises_not_found(self, fake_hubspot):
+        client = _client(fake_hubspot())
+
+        with pytest.raises(ContactNotFoundError):
+            client.update_contact("hubspot_missing", {"email": "x@example.com"})
+        with pytest.raises(ContactNotFoundError) as exc_info:
+            client.batch_update_contacts([("hubspot_1", {}), ("hubspot_missing", {})])
+        assert exc_info.value.contact_id == "hubspot_missing"
+
+    def test_search_filters(self, fake_hubspot):
+        server = fake_hubspot()
+        client = _client(server)
+
+        response = client._request(
+            "POST",
+            "/crm/v3/objects/contacts/search",
+            json={
+                "filterGroups": [
+                    {"filters": [{"propertyName": "email", "operator": "EQ",
+                                  "value": "JOHN.DOE@example.com"}]},
+                    {"filters": [{"propertyName": "linkedin_id", "operator": "IN",
+                                  "values": ["linkedin_2"]}]},
+                ]
+            },
+        ).json()
+
+        assert response["total"] == 2
+        assert [c["id"] for c in response["results"]] == ["hubspot_1", "hubspot_2"]
+
+    def test_injected_faults_are_retried(self, fake_hubspot):
+        server = fake_hubspot(throttle_rate=0.3, error_rate=0.3, random_seed=1)
+        client = _client(server, max_retries=20)
+
+        contacts = client.get_contacts_by_ids([f"hubspot_{i % 2 + 1}" for i in range(500)])
+
+        assert len(contacts) == 500
+        assert server.stats[429] > 0
+        assert server.stats[500] + server.stats[502] + server.stats[503] > 0
+        assert client.retries == sum(n for status, n in server.stats.items() if status >= 429)
+
+    def test_throttled_creates_are_retried(self, fake_hubspot):
+        server = fake_hubspot(throttle_rate=0.3, random_seed=1)
+        client = _client(server, max_retries=20)
+
+        contacts = client.batch_create_contacts([{"email": f"u{i}@example.com"} for i in range(500)])
+
+        assert len(contacts) == 500
+        assert client.retries == server.stats[429] > 0
+
+    def test_creates_are_not_retried_after_a_server_error(self, fake_hubspot):
+        server = fake_hubspot(error_rate=1)
+        client = _client(server)
+
+        with pytest.raises(HubSpotApiError, match="50"):
+            client.create_contact({"email": "new@example.com"})
+        with pytest.raises(HubSpotApiError, match="50"):
+            client.batch_create_contacts([{"email": "new@example.com"}])
+        assert client.retries == 0
+        assert sum(server.stats.values()) == 2
+
+    def test_creates_are_not_retried_after_a_read_timeout(self, fake_hubspot):
+        """The server may store the contact after the client gave up waiting."""
+        server = fake_hubspot(latency_ms=300, latency_sigma=0)
+        client = _client(server, timeout_seconds=0.05)
+
+        with pytest.raises(HubSpotApiError):
+            client.create_contact({"email": "new@example.com"})
+        assert client.retries == 0
+
+    def test_creates_are_retried_when_the_connection_fails(self):
+        client = HubSpotHttpClient("http://127.0.0.1:9", max_retries=2, retry_backoff_seconds=0)
+
+        with pytest.raises(HubSpotApiError):
+            client.create_contact({"email": "new@example.com"})
+        assert client.retries == 2
+
+    def test_rate_limit_rejects_requests_over_the_window(self, fake_hubspot):
+        server = fake_hubspot(rate_limit_per_second=3)
+        client = _client(server, max_retries=0)
+
+        with pytest.raises(HubSpotApiError, match="429"):
+            for _ in range(10):
+                client.get_contacts_by_ids(["hubspot_1"])
+        assert server.stats[200] == 3
+
+    def test_client_rate_limit_stays_under_the_server_limit(self, fake_hubspot):
+        server = fake_hubspot(rate_limit_per_second=20)
+        client = _client(server, max_retries=0, rate_limit_per_second=10, rate_limit_burst=5)
+
+        for _ in range(12):
+            client.get_contacts_by_ids(["hubspot_1"])
+
+        assert server.stats[200] == 12
+        assert 429 not in server.stats
+
+    def test_requires_configured_access_token(self, fake_hubspot):
+        server = fake_hubspot(access_token="secret")
+
+        with pytest.raises(HubSpotApiError, match="401"):
+            _client(server).get_all_contacts()
+        assert len(_client(server, access_token="secret").get_all_contacts()) == 2
@@ -0,0 +1,130 @@
+import sys
+import threading
+
+from app.domain import MatchKeys
+from app.infrastructure import HubSpotClient
+from app.infrastructure.external import hubspot_client
+
+
+def _run_concurrently(target, threads: int = 8) -> None:
+    barrier = threading.Barrier(threads)
+
+    def run(worker: int) -> None:
+        barrier.wait()
+        target(worker)
+
+    workers = [threading.Thread(target=run, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+class TestHubSpotClient:
+    """Tests for the in-memory HubSpotClient store."""
+
+    def test_concurrent_creates_get_unique_ids(self):
+        """Should never hand out the same ID twice."""
+        client = HubSpotClient()
+        created: list[str] = []
+
+        def create(worker: int) -> None:
+            for i in range(500):
+                created.append(client.create_contact({"email": f"{worker}-{i}@example.com"}).id)
+
+        _run_concurrently(create)
+
+        assert len(set(created)) == len(created) == 4000
+        assert len(client.get_all_contacts()) == 4002
+
+    def test_concurrent_updates_do_not_lose_fields(self):
+        """Should apply every update to a contact, each on top of the previous one."""
+        client = HubSpotClient()
+        contact = client.create_contact({"email": "a@example.com"})
+        fields = ["first_name", "last_name", "linkedin_id", "phone", "company", "email"]
+
+        def update(worker: int) -> None:
+            field = fields[worker % len(fields)]
+            for i in range(200):
+                client.update_contact(contact.id, {field: f"{field}-{i}"})
+
+        _run_concurrently(update, threads=len(fields))
+
+        properties = client.get_contacts_by_ids([contact.id])[0].properties
+        assert properties.firstname == "first_name-199"
+        assert properties.lastname == "last_name-199"
+        assert properties.linkedin_id == "linkedin_id-199"
+        assert properties.phone == "phone-199"
+        assert properties.company == "company-199"
+        assert properties.email == "email-199"
+
+    def test_reads_and_filter_rebuilds_race_with_creates(self, monkeypatch):
+        """Should copy the store safely under concurrent creates, in creation order."""
+        monkeypatch.setattr(hubspot_client, "_MATCH_FILTER_MIN_CAPACITY", 1)
+        client = HubSpotClient()
+        errors: list[Exception] = []
+        snapshots: list[list[str]] = []
+
+        def work(worker: int) -> None:
+            try:
+                for i in range(300):
+                    if worker == 0:
+                        snapshots.append([c.id for c in client.get_all_contacts()])
+                    else:
+                        client.create_contact({"email": f"{worker}-{i}@example.com"})
+            except Exception as exc:
+                errors.append(exc)
+
+        # Switch threads often, so that copies overlap with inserts
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            _run_concurrently(work)
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        assert errors == []
+        for ids in snapshots:
+            assert ids == sorted(ids, key=client._positions.__getitem__)
+        match_filter = client.get_match_filter()
+        assert all(
+            match_filter.might_match(MatchKeys.of_hubspot(contact))
+            for contact in client.get_all_contacts()
+        )
+
+    def test_reads_do_not_wait_for_writes_to_existing_contacts(self):
+        """Should list contacts while a write to an existing contact holds its stripe."""
+        client = HubSpotClient(stripes=4)
+        listed: list[int] = []
+        reader = threading.Thread(target=lambda: listed.append(len(client.get_all_contacts())))
+
+        with client._lock_for("hubspot_1"):
+            reader.start()
+            reader.join(timeout=5)
+            assert not reader.is_alive()
+
+        assert listed == [2]
+
+    def test_finds_by_keys_in_priority_order(self):
+        """Should prefer LinkedIn ID, then email, then the earliest contact."""
+        client = HubSpotClient()
+        first = client.create_contact({"email": "shared@example.com"})
+        client.create_contact({"email": "Shared@example.com"})
+        by_linkedin = client.create_contact({"linkedin_id": "In-1"})
+
+        assert client.find_by_keys(MatchKeys(email="shared@example.com")) == first
+        assert (
+            client.find_by_keys(MatchKeys(linkedin_id="in-1", email="shared@example.com"))
+            == by_linkedin
+        )
+        assert client.find_by_keys(MatchKeys(email="nobody@example.com")) is None
+
+    def test_updates_move_contacts_between_index_keys(self):
+        """Should find a contact by its new key only after an update."""
+        client = HubSpotClient()
+        contact = client.create_contact({"email": "old@example.com"})
+
+        client.update_contact(contact.id, {"email": "new@example.com"})
+
+        assert client.find_by_keys(MatchKeys(email="old@example.com")) is None
+        assert client.find_by_keys(MatchKeys(email="new@example.com")).id == contact.id
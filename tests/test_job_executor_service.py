@@ -0,0 +1,125 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.infrastructure import AsyncTaskExecutor, ExecutorShutdownError
+from app.services import JobExecutorService
+
+
+class TestAsyncTaskExecutor:
+    """Tests for AsyncTaskExecutor shutdown behaviour."""
+
+    def test_tracks_task_until_done(self):
+        """Should keep a task in flight until it finishes."""
+        release = threading.Event()
+
+        async def scenario():
+            executor = AsyncTaskExecutor()
+            executor.add_task("wait", release.wait)
+            executor.execute("wait")
+            assert len(executor.in_flight) == 1
+
+            await asyncio.sleep(0.05)
+            release.set()
+            unfinished = await executor.shutdown(grace_period=1)
+            return executor, unfinished
+
+        executor, unfinished = asyncio.run(scenario())
+
+        assert unfinished == []
+        assert executor.in_flight == []
+
+    def test_releases_tasks_not_started_before_shutdown(self):
+        """Should not run tasks still waiting for a thread when shutdown begins."""
+        calls = []
+
+        async def scenario():
+            executor = AsyncTaskExecutor()
+            executor.add_task("record", calls.append)
+            executor.execute("record", 1)
+            return await executor.shutdown(grace_period=1)
+
+        unfinished = asyncio.run(scenario())
+
+        assert calls == []
+        assert len(unfinished) == 1
+        assert unfinished[0].released
+
+    def test_rejects_work_after_shutdown(self):
+        """Should refuse new tasks once shutdown has started."""
+
+        async def scenario():
+            executor = AsyncTaskExecutor()
+            executor.add_task("noop", lambda: None)
+            await executor.shutdown(grace_period=0)
+            executor.execute("noop")
+
+        with pytest.raises(ExecutorShutdownError):
+            asyncio.run(scenario())
+
+    def test_returns_tasks_still_running_after_grace_period(self):
+        """Should report tasks that did not finish within the grace period."""
+        release = threading.Event()
+
+        async def scenario():
+            executor = AsyncTaskExecutor()
+            executor.add_task("wait", release.wait)
+            executor.execute("wait", 5)
+            await asyncio.sleep(0.05)
+            unfinished = await executor.shutdown(grace_period=0.05)
+            release.set()
+            return unfinished
+
+        unfinished = asyncio.run(scenario())
+
+        assert len(unfinished) == 1
+        assert unfinished[0].started
+        assert unfinished[0].args == (5,)
+
+
+class TestJobExecutorServiceShutdown:
+    """Tests for JobExecutorService draining."""
+
+    def test_asks_running_jobs_to_checkpoint(self):
+        """Should signal stop to jobs still running after the grace period."""
+        started = threading.Event()
+        stopped = []
+
+        class SlowJobExecutorService(JobExecutorService):
+            def _process_push_job(self, job_id: str) -> None:
+                started.set()
+                stopped.append(self._stop_requested.wait(timeout=5))
+                self._interrupted.add(int(job_id))
+
+        async def scenario():
+            service = SlowJobExecutorService(grace_period=0.05, checkpoint_timeout=1)
+            service.schedule_push_job(7)
+            await asyncio.to_thread(started.wait, 1)
+            return await service.shutdown()
+
+        job_ids = asyncio.run(scenario())
+
+        assert job_ids == [7]
+        assert stopped == [True]
+
+    def test_does_not_report_jobs_completed_while_checkpointing(self, caplog):
+        """Should only report jobs left pending, not those finishing after the stop request."""
+        started = threading.Event()
+
+        class FinishingJobExecutorService(JobExecutorService):
+            def _process_push_job(self, job_id: str) -> None:
+                started.set()
+                # Completes instead of checkpointing
+                self._stop_requested.wait(timeout=5)
+
+        async def scenario():
+            service = FinishingJobExecutorService(grace_period=0.05, checkpoint_timeout=1)
+            service.schedule_push_job(7)
+            await asyncio.to_thread(started.wait, 1)
+            return await service.shutdown()
+
+        job_ids = asyncio.run(scenario())
+
+        assert job_ids == []
+        assert "left pending" not in caplog.text
@@ -0,0 +1,104 @@
+import asyncio
+import time
+from unittest.mock import Mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.dependencies import get_job_executor, get_push_service
+from app.infrastructure import (
+    BlockingCallError,
+    BlockingCallGuardMiddleware,
+    EventLoopWatchdog,
+    HubSpotClient,
+    SqlAlchemyUnitOfWork,
+    install_blocking_guard,
+    uninstall_blocking_guard,
+)
+from app.infrastructure.metrics.instruments import EVENT_LOOP_LAG
+from app.routers import push_router
+from app.services import PushService
+from app.services.contact_matching_service import ContactMatchingService
+
+
+def _block_the_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+@pytest.fixture
+def blocking_guard():
+    install_blocking_guard()
+    yield
+    uninstall_blocking_guard()
+
+
+class TestEventLoopWatchdog:
+    def test_records_lag_and_blocking_stack(self):
+        watchdog = EventLoopWatchdog(interval=0.01, stall_threshold=0.05)
+        lag_count_before = EVENT_LOOP_LAG.labels().snapshot()[0][-1]
+
+        async def scenario():
+            await watchdog.start()
+            await asyncio.sleep(0.05)
+            _block_the_loop(0.3)
+            await asyncio.sleep(0.05)
+            await watchdog.stop()
+
+        asyncio.run(scenario())
+
+        assert EVENT_LOOP_LAG.labels().snapshot()[0][-1] > lag_count_before
+        (stall,) = watchdog.stalls
+        assert stall.blocked_seconds > 0.05
+        assert "_block_the_loop" in stall.stack
+
+
+class TestBlockingCallGuard:
+    @pytest.fixture
+    def app(self) -> FastAPI:
+        app = FastAPI()
+        app.add_middleware(BlockingCallGuardMiddleware)
+
+        @app.get("/async")
+        async def blocking_async_handler() -> dict:
+            time.sleep(0)
+            return {}
+
+        @app.get("/sync")
+        def sync_handler() -> dict:
+            time.sleep(0)
+            return {}
+
+        return app
+
+    def test_raises_on_blocking_call_in_async_handler(self, app, blocking_guard):
+        client = TestClient(app)
+
+        with pytest.raises(BlockingCallError, match="time.sleep"):
+            client.get("/async")
+        assert client.get("/sync").status_code == 200
+
+    def test_allows_blocking_calls_outside_requests(self, blocking_guard):
+        async def startup():
+            time.sleep(0)
+
+        asyncio.run(startup())
+
+    def test_push_routes_keep_database_work_off_the_loop(self, session_factory, blocking_guard):
+        app = FastAPI()
+        app.add_middleware(BlockingCallGuardMiddleware)
+        app.include_router(push_router)
+        service = PushService(
+            uow=SqlAlchemyUnitOfWork(session_factory),
+            crm_client=HubSpotClient(),
+            matching_service=ContactMatchingService(workers=0),
+        )
+        app.dependency_overrides[get_push_service] = lambda: service
+        app.dependency_overrides[get_job_executor] = lambda: Mock()
+        client = TestClient(app)
+
+        created = client.post("/push", json={"profiles": [{"email": "a@example.com"}]})
+        status = client.get(f"/push/{created.json()['job_id']}")
+
+        assert created.status_code == 201
+        assert status.json()["status"] == "pending"
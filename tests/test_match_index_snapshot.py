@@ -0,0 +1,215 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+from app.domain import MatchKeys
+from app.infrastructure import HubSpotClient, MatchIndexSnapshot, SqlAlchemyUnitOfWork
+from app.infrastructure.index import match_index_snapshot
+from app.services import PushService
+from app.services.contact_matching_service import ContactMatchingService, HubSpotMatchIndex
+from app.services.snapshot_matching_service import SnapshotContactMatchingService
+
+
+class TestMatchIndexSnapshot:
+    """Tests for MatchIndexSnapshot."""
+
+    @pytest.fixture
+    def hubspot_contacts(self, make_hubspot_contact):
+        return [
+            make_hubspot_contact(
+                id=f"hs_{i}",
+                email=f"User{i % 17}@example.com" if i % 2 else None,
+                linkedin_id=f"in-{i % 11}" if i % 3 == 0 else None,
+                firstname=f"First{i % 13}",
+                lastname="Last",
+            )
+            for i in range(200)
+        ]
+
+    @pytest.fixture
+    def path(self, tmp_path) -> str:
+        return str(tmp_path / "crm.mix")
+
+    @pytest.fixture
+    def all_keys(self):
+        return [
+            MatchKeys(
+                linkedin_id=f"in-{i % 15}" if i % 4 == 0 else None,
+                email=f"user{i % 23}@example.com" if i % 3 else None,
+                name=f"first{i % 19}|last" if i % 5 else None,
+            )
+            for i in range(300)
+        ]
+
+    def _find_ids(self, index, all_keys):
+        return [getattr(index.find(keys), "id", None) for keys in all_keys]
+
+    def test_agrees_with_in_memory_index(self, hubspot_contacts, path, all_keys):
+        """Should find the same contacts as HubSpotMatchIndex."""
+        MatchIndexSnapshot.write(path, hubspot_contacts)
+
+        with MatchIndexSnapshot(path) as snapshot:
+            assert len(snapshot) == 200
+            assert self._find_ids(snapshot, all_keys) == self._find_ids(
+                HubSpotMatchIndex.build(hubspot_contacts), all_keys
+            )
+            assert snapshot.get("hs_7") == hubspot_contacts[7]
+
+    def test_confirms_hash_hits_against_keys(
+        self, hubspot_contacts, path, all_keys, monkeypatch
+    ):
+        """Should stay correct when every key hashes to the same value."""
+        monkeypatch.setattr(match_index_snapshot, "_hash_key", lambda key: 42)
+        MatchIndexSnapshot.write(path, hubspot_contacts)
+
+        with MatchIndexSnapshot(path) as snapshot:
+            assert self._find_ids(snapshot, all_keys) == self._find_ids(
+                HubSpotMatchIndex.build(hubspot_contacts), all_keys
+            )
+
+    def test_applies_deltas_in_list_order(
+        self, hubspot_contacts, path, all_keys, make_hubspot_contact
+    ):
+        """Should treat updates as in-place and creates as appended contacts."""
+        MatchIndexSnapshot.write(path, hubspot_contacts)
+        updated = make_hubspot_contact(id="hs_1", email="moved@example.com")
+        created = make_hubspot_contact(id="hs_new", linkedin_id="in-14", email="user1@example.com")
+        MatchIndexSnapshot.append_delta(path, [updated])
+
+        current = [updated if c.id == "hs_1" else c for c in hubspot_contacts] + [created]
+        with MatchIndexSnapshot(path) as snapshot:
+            snapshot.apply([created])
+
+            assert len(snapshot) == 201
+            assert snapshot.get("hs_1") == updated
+            assert self._find_ids(snapshot, all_keys) == self._find_ids(
+                HubSpotMatchIndex.build(current), all_keys
+            )
+
+    def test_writing_snapshot_discards_deltas(self, hubspot_contacts, path, make_hubspot_contact):
+        """Should start from the new snapshot only."""
+        MatchIndexSnapshot.write(path, hubspot_contacts)
+        MatchIndexSnapshot.append_delta(path, [make_hubspot_contact(id="hs_new")])
+
+        MatchIndexSnapshot.write(path, hubspot_contacts[:10])
+
+        with MatchIndexSnapshot(path) as snapshot:
+            assert len(snapshot) == 10
+            assert snapshot.get("hs_new") is None
+
+    def test_keeps_deltas_appended_during_a_rewrite(
+        self, hubspot_contacts, path, make_hubspot_contact
+    ):
+        """Should keep deltas another process appended while the CRM was being read."""
+        MatchIndexSnapshot.write(path, hubspot_contacts)
+        MatchIndexSnapshot.append_delta(path, [make_hubspot_contact(id="hs_old")])
+        created = make_hubspot_contact(id="hs_new", email="new@example.com")
+
+        def fetch():
+            yield from hubspot_contacts[:10]
+            MatchIndexSnapshot.append_delta(path, [created])
+
+        MatchIndexSnapshot.write(path, fetch())
+
+        with MatchIndexSnapshot(path) as snapshot:
+            assert len(snapshot) == 11
+            assert snapshot.get("hs_old") is None
+            assert snapshot.get("hs_new") == created
+
+    def test_skips_unreadable_delta_lines(
+        self, hubspot_contacts, path, make_hubspot_contact, caplog
+    ):
+        """Should open a snapshot whose delta was cut off by a crash mid-append."""
+        MatchIndexSnapshot.write(path, hubspot_contacts[:10])
+        first = make_hubspot_contact(id="hs_first", email="first@example.com")
+        second = make_hubspot_contact(id="hs_second", email="second@example.com")
+        MatchIndexSnapshot.append_delta(path, [first])
+        with open(path + ".delta", "ab") as delta:
+            delta.write(b'{"id": "hs_torn", "proper')
+
+        with MatchIndexSnapshot(path) as snapshot:
+            assert snapshot.get("hs_first") == first
+            assert len(snapshot) == 11
+        assert "Skipping unreadable line 2" in caplog.text
+
+        caplog.clear()
+        MatchIndexSnapshot.append_delta(path, [second])
+
+        with MatchIndexSnapshot(path) as snapshot:
+            assert snapshot.get("hs_first") == first
+            assert snapshot.get("hs_second") == second
+        assert "Skipping" not in caplog.text
+
+    def test_concurrent_rewrites_leave_a_whole_snapshot(self, hubspot_contacts, path):
+        """Should replace the snapshot with one complete version when rewrites overlap."""
+        sizes = [50, 200, 100, 150]
+
+        def rewrite(size):
+            for _ in range(10):
+                MatchIndexSnapshot.write(path, hubspot_contacts[:size])
+
+        with ThreadPoolExecutor(len(sizes)) as executor:
+            list(executor.map(rewrite, sizes))
+
+        with MatchIndexSnapshot(path) as snapshot:
+            assert len(snapshot) in sizes
+            assert snapshot.get(f"hs_{len(snapshot) - 1}") == hubspot_contacts[len(snapshot) - 1]
+        assert sorted(os.listdir(os.path.dirname(path))) == ["crm.mix", "crm.mix.lock"]
+
+    def test_matching_service_uses_snapshot(self, hubspot_contacts, path, make_contact):
+        """Should match local contacts against a snapshot like against the list."""
+        MatchIndexSnapshot.write(path, hubspot_contacts)
+        local_contacts = [
+            make_contact(id=1, email="user3@example.com"),
+            make_contact(id=2, email="nobody@example.com"),
+        ]
+
+        with MatchIndexSnapshot(path) as snapshot:
+            result = ContactMatchingService().match_with_index(local_contacts, snapshot)
+
+        assert [(c.id, hs.id) for c, hs in result.matched] == [(1, "hs_3")]
+        assert [c.id for c in result.unmatched] == [2]
+
+
+class TestSnapshotContactMatchingService:
+    """Tests for matching push jobs against a snapshot."""
+
+    @pytest.fixture
+    def push_service(self, session_factory, tmp_path):
+        def _push_service(crm_client, max_age_seconds=3600):
+            return PushService(
+                uow=SqlAlchemyUnitOfWork(session_factory),
+                crm_client=crm_client,
+                matching_service=SnapshotContactMatchingService(
+                    str(tmp_path / "crm.mix"), max_age_seconds=max_age_seconds
+                ),
+                history_lookup=False,
+            )
+
+        return _push_service
+
+    def test_writes_snapshot_once_and_matches_contacts_synced_since(self, push_service):
+        """Should fetch the CRM for the first job only, then match its creations via the delta."""
+        crm_client = Mock(wraps=HubSpotClient())
+        service = push_service(crm_client)
+
+        first = service.create_push_job([{"email": "new@example.com"}])
+        second = service.create_push_job([{"email": "NEW@example.com", "phone": "555"}])
+        first_result = service.process_job(first.id)
+        second_result = service.process_job(second.id)
+
+        assert (first_result.created_count, second_result.updated_count) == (1, 1)
+        assert crm_client.get_contacts_page.call_count == 1
+        crm_client.create_contact.assert_called_once()
+
+    def test_rewrites_stale_snapshot(self, push_service):
+        """Should rewrite the snapshot from the CRM once it is older than the max age."""
+        crm_client = Mock(wraps=HubSpotClient())
+        service = push_service(crm_client, max_age_seconds=0)
+
+        for _ in range(2):
+            service.process_job(service.create_push_job([{"email": "a@example.com"}]).id)
+
+        assert crm_client.get_contacts_page.call_count == 2
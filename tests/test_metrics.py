@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.domain import ContactNotFoundError
+from app.infrastructure import AsyncTaskExecutor, HubSpotClient, InstrumentedCrmClient
+from app.infrastructure.database.pool import InstrumentedQueuePool
+from app.infrastructure.metrics import Counter, Gauge, Histogram, MetricsRegistry
+from app.infrastructure.metrics.instruments import (
+    CRM_REQUEST_DURATION,
+    CRM_REQUEST_ERRORS,
+    CRM_REQUESTS,
+    DB_POOL_CHECKOUTS,
+    TASK_QUEUE_WAIT,
+)
+
+
+def _histogram_count(histogram: Histogram, *labels: str) -> int:
+    return histogram.labels(*labels).snapshot()[0][-1]
+
+
+class TestMetricsRegistry:
+    def test_renders_prometheus_text_format(self):
+        registry = MetricsRegistry()
+        requests = registry.register(Counter("requests", "Requests served", ("route",)))
+        depth = registry.register(Gauge("depth", "Queue depth"))
+        latency = registry.register(Histogram("latency_seconds", "Latency", buckets=(0.1, 1.0)))
+
+        requests.labels('/a"b').inc(2)
+        depth.set(3)
+        latency.observe(0.05)
+        latency.observe(0.1)
+        latency.observe(5)
+
+        assert registry.render() == (
+            "# HELP requests_total Requests served\n"
+            "# TYPE requests_total counter\n"
+            'requests_total{route="/a\\"b"} 2\n'
+            "# HELP depth Queue depth\n"
+            "# TYPE depth gauge\n"
+            "depth 3\n"
+            "# HELP latency_seconds Latency\n"
+            "# TYPE latency_seconds histogram\n"
+            'latency_seconds_bucket{le="0.1"} 2\n'
+            'latency_seconds_bucket{le="1"} 2\n'
+            'latency_seconds_bucket{le="+Inf"} 3\n'
+            "latency_seconds_sum 5.15\n"
+            "latency_seconds_count 3\n"
+        )
+
+    def test_gauge_function_is_read_at_collection(self):
+        gauge = Gauge("connections", "Open connections")
+        values = iter([1, 2])
+        gauge.set_function(lambda: next(values))
+
+        assert "connections 1" in gauge.render()
+        assert "connections 2" in gauge.render()
+
+    def test_rejects_wrong_label_count_and_duplicates(self):
+        registry = MetricsRegistry()
+        counter = registry.register(Counter("calls", "Calls", ("operation",)))
+
+        with pytest.raises(ValueError):
+            counter.labels("a", "b")
+        with pytest.raises(ValueError):
+            registry.register(Counter("calls", "Calls again"))
+
+
+class TestInstrumentedCrmClient:
+    def test_counts_times_and_classifies_errors(self):
+        client = InstrumentedCrmClient(HubSpotClient())
+        calls_before = CRM_REQUESTS.labels("update_contact").value
+        errors_before = CRM_REQUEST_ERRORS.labels("update_contact", "ContactNotFoundError").value
+        timed_before = _histogram_count(CRM_REQUEST_DURATION, "update_contact")
+
+        client.update_contact("hubspot_1", {"company": "Acme"})
+        with pytest.raises(ContactNotFoundError):
+            client.update_contact("missing", {})
+
+        assert CRM_REQUESTS.labels("update_contact").value == calls_before + 2
+        assert (
+            CRM_REQUEST_ERRORS.labels("update_contact", "ContactNotFoundError").value
+            == errors_before + 1
+        )
+        assert _histogram_count(CRM_REQUEST_DURATION, "update_contact") == timed_before + 2
+
+
+class TestInfrastructureMetrics:
+    def test_pool_counts_checkouts(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool)
+        before = DB_POOL_CHECKOUTS.labels().value
+
+        for _ in range(3):
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+        engine.dispose()
+
+        assert DB_POOL_CHECKOUTS.labels().value == before + 3
+
+    def test_executor_observes_queue_wait(self):
+        before = _histogram_count(TASK_QUEUE_WAIT, "noop")
+
+        async def scenario():
+            executor = AsyncTaskExecutor()
+            executor.add_task("noop", lambda: None)
+            executor.execute("noop")
+            await asyncio.sleep(0.05)
+            await executor.shutdown(grace_period=1)
+
+        asyncio.run(scenario())
+
+        assert _histogram_count(TASK_QUEUE_WAIT, "noop") == before + 1
+
+    def test_metrics_endpoint_reports_requests_by_route_template(self):
+        from app.main import app
+
+        client = TestClient(app)
+        client.get("/push/not-a-number")
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert (
+            'http_request_duration_seconds_count{method="GET",route="/push/{job_id}",status="400"}'
+            in response.text
+        )
+        assert "# TYPE push_jobs_total counter" in response.text
@@ -0,0 +1,125 @@
+import io
+import pstats
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.dependencies.admin as admin
+from app.dependencies import get_job_profiler
+from app.infrastructure.profiling import JobProfiler, sample_stacks, to_collapsed, to_pstats
+from app.services import JobExecutorService
+
+
+def _spin(seconds: float) -> None:
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        sum(range(100))
+
+
+def _load_stats(content: bytes, tmp_path) -> pstats.Stats:
+    path = tmp_path / "loaded.pstats"
+    path.write_bytes(content)
+    return pstats.Stats(str(path), stream=io.StringIO())
+
+
+class TestSampler:
+    def test_samples_other_threads(self, tmp_path):
+        thread = threading.Thread(target=_spin, args=(0.3,), name="spinner")
+        thread.start()
+        samples = sample_stacks(0.1, interval=0.005)
+        thread.join()
+
+        collapsed = to_collapsed(samples)
+        assert any(
+            line.startswith("spinner;") and "_spin (" in line for line in collapsed.splitlines()
+        )
+        stats = _load_stats(to_pstats(samples, 0.005), tmp_path)
+        assert any(function[2] == "_spin" for function in stats.stats)
+
+
+class TestJobProfiler:
+    def test_profiles_only_selected_jobs(self, tmp_path):
+        profiler = JobProfiler(directory=str(tmp_path), sample_rate=0)
+
+        assert not profiler.should_profile()
+        assert profiler.should_profile(requested=True)
+        assert JobProfiler(directory=str(tmp_path), sample_rate=1).should_profile()
+
+    def test_stores_profile_by_job_id(self, tmp_path):
+        profiler = JobProfiler(directory=str(tmp_path))
+
+        with profiler.profile(42):
+            _spin(0.01)
+
+        stats = _load_stats(profiler.load(42), tmp_path)
+        assert any(function[2] == "_spin" for function in stats.stats)
+        assert profiler.load(43) is None
+
+    def test_schedules_unprofiled_jobs_unchanged(self, tmp_path):
+        task_executor = Mock()
+        service = JobExecutorService(
+            task_executor=task_executor, profiler=JobProfiler(str(tmp_path), sample_rate=0)
+        )
+
+        service.schedule_push_job(3, profile=True)
+        service.schedule_push_job(4)
+
+        assert task_executor.execute.call_args_list[-2:] == [
+            (("process_push_job", "3"), {"profile": True}),
+            (("process_push_job", "4"), {}),
+        ]
+
+
+class TestDebugEndpoints:
+    @pytest.fixture
+    def client(self, tmp_path, monkeypatch):
+        from app.main import app
+
+        monkeypatch.setattr(admin, "DEBUG_ADMIN_TOKEN", "secret")
+        profiler = JobProfiler(directory=str(tmp_path))
+        app.dependency_overrides[get_job_profiler] = lambda: profiler
+        yield TestClient(app), profiler
+        app.dependency_overrides.clear()
+
+    def test_disabled_without_admin_token(self, client, monkeypatch):
+        test_client, _ = client
+        monkeypatch.setattr(admin, "DEBUG_ADMIN_TOKEN", None)
+
+        assert test_client.get("/debug/profile").status_code == 404
+
+    def test_requires_admin_token(self, client):
+        test_client, _ = client
+
+        response = test_client.get("/debug/profile", headers={"X-Admin-Token": "wrong"})
+
+        assert response.status_code == 403
+
+    def test_returns_collapsed_stacks(self, client):
+        test_client, _ = client
+        thread = threading.Thread(target=_spin, args=(0.3,), name="spinner")
+        thread.start()
+
+        response = test_client.get(
+            "/debug/profile",
+            params={"seconds": 0.1, "interval": 0.005},
+            headers={"X-Admin-Token": "secret"},
+        )
+        thread.join()
+
+        assert response.status_code == 200
+        assert "spinner;" in response.text
+
+    def test_returns_job_profile(self, client, tmp_path):
+        test_client, profiler = client
+        with profiler.profile(7):
+            _spin(0.01)
+        headers = {"X-Admin-Token": "secret"}
+
+        response = test_client.get("/debug/profile/jobs/7", headers=headers)
+
+        assert response.status_code == 200
+        assert _load_stats(response.content, tmp_path).stats
+        assert test_client.get("/debug/profile/jobs/8", headers=headers).status_code == 404
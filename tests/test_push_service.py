@@ -1,8 +1,19 @@
+import threading
+import time
+from unittest.mock import Mock
+
 import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
 
-from app.domain import JobNotFoundError, MatchResult, SyncResult
+from app.dependencies import get_push_service
+from app.domain import JobInterruptedError, JobNotFoundError, MatchResult, SyncResult
+from app.infrastructure import Base, BatchingCrmClient, HubSpotClient, SqlAlchemyUnitOfWork
 from app.schemas import PushJobResponse
 from app.services import PushService
+from app.services.contact_matching_service import ContactMatchingService
+from app.services.sync_pipeline import PipelineConfig
 
 
 class TestPushService:
@@ -127,7 +138,7 @@ class TestPushService:
             """Should fetch all HubSpot contacts."""
             service.process_job(1)
 
-            mock_crm_client.get_all_contacts.assert_called_once()
+            mock_crm_client.get_contacts_page.assert_called_once()
 
         def test_uses_matching_service(
             self,
@@ -143,7 +154,7 @@ class TestPushService:
             hubspot_contacts = [make_hubspot_contact()]
 
             mock_uow.contacts.get_by_job_id.return_value = local_contacts
-            mock_crm_client.get_all_contacts.return_value = hubspot_contacts
+            mock_crm_client.get_contacts_page.return_value = (hubspot_contacts, None)
 
             service.process_job(1)
 
@@ -234,14 +245,14 @@ class TestPushService:
             service.process_job(1)
 
             mock_uow.push_jobs.mark_as_completed.assert_called_once_with(
-                job_id=1, created_count=0, updated_count=0
+                job_id=1, created_count=0, updated_count=0, duplicate_count=0
             )
 
         def test_marks_job_failed_on_error(
             self, service: PushService, mock_uow, mock_crm_client
         ):
             """Should mark job as failed on error."""
-            mock_crm_client.get_all_contacts.side_effect = Exception("API Error")
+            mock_crm_client.get_contacts_page.side_effect = Exception("API Error")
 
             with pytest.raises(Exception, match="API Error"):
                 service.process_job(1)
@@ -249,6 +260,135 @@ class TestPushService:
             mock_uow.push_jobs.mark_as_failed.assert_called_once()
             assert "API Error" in mock_uow.push_jobs.mark_as_failed.call_args[0][1]
 
+        def test_checkpoints_when_asked_to_stop(
+            self,
+            service: PushService,
+            mock_matching_service,
+            mock_uow,
+            mock_crm_client,
+            make_contact,
+        ):
+            """Should save progress and leave the job pending when stopped."""
+            mock_matching_service.match_contacts.return_value = MatchResult(
+                matched=[], unmatched=[make_contact(id=1), make_contact(id=2)]
+            )
+
+            with pytest.raises(JobInterruptedError):
+                service.process_job(
+                    1, should_stop=lambda: mock_crm_client.create_contact.call_count >= 1
+                )
+
+            mock_crm_client.create_contact.assert_called_once()
+            mock_uow.push_jobs.save_progress.assert_called_once_with(
+                job_id=1, created_count=1, updated_count=0, duplicate_count=0
+            )
+            mock_uow.push_jobs.mark_as_completed.assert_not_called()
+            mock_uow.push_jobs.mark_as_failed.assert_not_called()
+
+        def test_skips_contacts_completed_by_previous_run(
+            self,
+            service: PushService,
+            mock_matching_service,
+            mock_uow,
+            make_contact,
+        ):
+            """Should only match contacts not completed before a checkpoint."""
+            pending = make_contact(id=2)
+            mock_uow.contacts.get_by_job_id.return_value = [
+                make_contact(id=1, status="completed"),
+                pending,
+            ]
+
+            service.process_job(1)
+
+            call_kwargs = mock_matching_service.match_contacts.call_args[1]
+            assert call_kwargs["local_contacts"] == [pending]
+
+        def test_matches_contacts_by_partition(
+            self,
+            mock_uow,
+            mock_crm_client,
+            mock_matching_service,
+            make_contact,
+        ):
+            """Should match each partition of the job's contacts separately."""
+            service = PushService(
+                uow=mock_uow,
+                crm_client=mock_crm_client,
+                matching_service=mock_matching_service,
+                pipeline_config=PipelineConfig(partition_size=2),
+            )
+            mock_uow.contacts.get_by_job_id.return_value = [
+                make_contact(id=i) for i in range(5)
+            ]
+
+            result = service.process_job(1)
+
+            partitions = [
+                [c.id for c in call.kwargs["local_contacts"]]
+                for call in mock_matching_service.match_contacts.call_args_list
+            ]
+            assert partitions == [[0, 1], [2, 3], [4]]
+            mock_matching_service.start_job.assert_called_once()
+            assert [stage.name for stage in result.stages] == ["match", "crm_write", "persist"]
+
+        def test_matches_whole_job_when_the_backend_asks(
+            self,
+            mock_uow,
+            mock_crm_client,
+            mock_matching_service,
+            make_contact,
+        ):
+            """Should match the job in a single partition for whole-job backends."""
+            service = PushService(
+                uow=mock_uow,
+                crm_client=mock_crm_client,
+                matching_service=mock_matching_service,
+                pipeline_config=PipelineConfig(partition_size=2),
+            )
+            mock_matching_service.matches_whole_job.return_value = True
+            mock_uow.contacts.get_by_job_id.return_value = [
+                make_contact(id=i) for i in range(5)
+            ]
+
+            service.process_job(1)
+
+            mock_matching_service.matches_whole_job.assert_called_once_with(5)
+            [call] = mock_matching_service.match_contacts.call_args_list
+            assert [c.id for c in call.kwargs["local_contacts"]] == [0, 1, 2, 3, 4]
+
+        def test_fans_out_one_crm_create_to_duplicates(
+            self,
+            service: PushService,
+            mock_matching_service,
+            mock_uow,
+            mock_crm_client,
+            make_contact,
+        ):
+            """Should create duplicates once and store the HubSpot ID on each row."""
+            contacts = [
+                make_contact(id=1, email="dup@example.com"),
+                make_contact(id=2, email="DUP@example.com", first_name="Dup"),
+            ]
+            mock_uow.contacts.get_by_job_id.return_value = contacts
+            mock_matching_service.match_contacts.side_effect = (
+                lambda local_contacts, hubspot_contacts: MatchResult(
+                    matched=[], unmatched=local_contacts
+                )
+            )
+
+            result = service.process_job(1)
+
+            mock_crm_client.create_contact.assert_called_once()
+            assert mock_crm_client.create_contact.call_args[0][0]["first_name"] == "Dup"
+            persisted = [
+                (call.kwargs["contact_id"], call.kwargs["hubspot_id"])
+                for call in mock_uow.contacts.update_with_hubspot_data.call_args_list
+            ]
+            assert persisted == [(1, "hubspot_new"), (2, "hubspot_new")]
+            assert result.created_count == 1
+            assert result.duplicate_count == 1
+
         def test_returns_sync_result(self, service: PushService):
             """Should return SyncResult dataclass."""
             result = service.process_job(1)
@@ -280,6 +420,298 @@ class TestPushService:
             assert call_kwargs["contact_id"] == 42
             assert call_kwargs["hubspot_id"] == "hubspot_999"
 
+    # =========================================================================
+    # Timings tests
+    # =========================================================================
+
+    class TestTimings:
+        """Tests for the phase timings recorded on jobs."""
+
+        def test_records_phase_timings_and_call_counts(self, session_factory):
+            """Should save the timings of a run on the job."""
+            crm_client = HubSpotClient()
+            crm_client.create_contact({"email": "existing@example.com"})
+            service = PushService(
+                uow=SqlAlchemyUnitOfWork(session_factory),
+                crm_client=crm_client,
+                matching_service=ContactMatchingService(workers=0),
+            )
+            job = service.create_push_job(
+                [{"email": "existing@example.com"}, {"email": "new@example.com"}]
+            )
+
+            result = service.process_job(job.id)
+
+            timings = result.timings
+            # One fetch, one update and one create
+            assert timings.crm_calls == 3
+            assert timings.db_statements > 0
+            assert timings.update_seconds > 0
+            assert timings.create_seconds > 0
+            assert timings.total_seconds >= timings.fetch_seconds
+            assert service.get_job_status(job.id).timings == timings.to_dict()
+
+        def test_counts_one_crm_call_per_contacts_page(
+            self,
+            service: PushService,
+            mock_uow,
+            mock_crm_client,
+            make_contact,
+            make_hubspot_contact,
+        ):
+            """Should count every page of the CRM contact list as a call."""
+            mock_uow.contacts.get_by_job_id.return_value = [make_contact(id=1)]
+            pages = {
+                None: ([make_hubspot_contact(id="hs_1")], "page_2"),
+                "page_2": ([make_hubspot_contact(id="hs_2")], None),
+            }
+            mock_crm_client.get_contacts_page.side_effect = lambda after=None: pages[after]
+
+            result = service.process_job(1)
+
+            assert result.timings.crm_calls == 2
+            assert mock_crm_client.get_contacts_page.call_count == 2
+
+        def test_status_exposes_timings_only_when_recorded(self, mock_uow, make_push_job):
+            """Should leave timings out of the status until a run recorded them."""
+            from app.main import app
+
+            service = PushService(uow=mock_uow, crm_client=None, matching_service=None)
+            app.dependency_overrides[get_push_service] = lambda: service
+            try:
+                client = TestClient(app)
+                mock_uow.push_jobs.get_by_id.return_value = make_push_job(status="pending")
+                assert "timings" not in client.get("/push/1").json()
+
+                timings = {
+                    "fetch_seconds": 0.5, "match_seconds": 0.25, "update_seconds": 1.0,
+                    "create_seconds": 2.0, "persist_seconds": 0.125, "total_seconds": 3.0,
+                    "crm_calls": 4, "db_statements": 12,
+                }
+                mock_uow.push_jobs.get_by_id.return_value = make_push_job(
+                    status="completed", timings=timings
+                )
+                assert client.get("/push/1").json()["timings"] == timings
+            finally:
+                app.dependency_overrides.clear()
+
+    class TestCoalescedUpdates:
+        """Tests for updates of one contact by concurrent jobs through the write aggregator."""
+
+        def test_one_job_fills_a_batch(self, session_factory):
+            """Should keep a batch of writes in flight, so one job's batch is sent full."""
+            crm_client = Mock(wraps=HubSpotClient())
+            batching_client = BatchingCrmClient(crm_client, batch_size=5, max_wait_ms=60000)
+            service = PushService(
+                uow=SqlAlchemyUnitOfWork(session_factory),
+                crm_client=batching_client,
+                matching_service=ContactMatchingService(workers=0),
+                pipeline_config=PipelineConfig(crm_concurrency=batching_client.batch_size),
+            )
+            job = service.create_push_job([{"email": f"new{i}@example.com"} for i in range(5)])
+
+            start = time.monotonic()
+            result = service.process_job(job.id)
+            elapsed = time.monotonic() - start
+            batching_client.close()
+
+            assert result.created_count == 5
+            crm_client.batch_create_contacts.assert_called_once()
+            assert len(crm_client.batch_create_contacts.call_args.args[0]) == 5
+            # Sent as soon as it was full, not after the max wait
+            assert elapsed < 5
+
+        def test_local_values_win_over_stale_crm_values(self, tmp_path):
+            """Should keep a job's new value when a later job leaves that field empty."""
+            # Concurrent jobs need a connection each, unlike the shared in-memory database
+            engine = create_engine(
+                f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False}
+            )
+            Base.metadata.create_all(engine)
+            session_factory = sessionmaker(bind=engine)
+            crm_client = HubSpotClient()
+            queued = threading.Event()
+
+            class SignallingBatchingCrmClient(BatchingCrmClient):
+                def submit_update(self, contact_id, contact_data):
+                    future = super().submit_update(contact_id, contact_data)
+                    queued.set()
+                    return future
+
+            batching_client = SignallingBatchingCrmClient(crm_client, max_wait_ms=60000)
+
+            def service() -> PushService:
+                return PushService(
+                    uow=SqlAlchemyUnitOfWork(session_factory),
+                    crm_client=batching_client,
+                    matching_service=ContactMatchingService(workers=0),
+                    history_lookup=False,
+                )
+
+            # hubspot_1 is john.doe@example.com, with phone 1234567890
+            job_a = service().create_push_job([{"email": "john.doe@example.com", "phone": "555"}])
+            job_b = service().create_push_job([{"email": "john.doe@example.com"}])
+
+            first = threading.Thread(target=service().process_job, args=(job_a.id,))
+            first.start()
+            assert queued.wait(5)
+            second = threading.Thread(target=service().process_job, args=(job_b.id,))
+            second.start()
+            deadline = time.monotonic() + 5
+            while batching_client.coalesced_updates == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            batching_client.close()
+            first.join()
+            second.join()
+
+            assert batching_client.coalesced_updates == 1
+            assert crm_client.get_contacts_by_ids(["hubspot_1"])[0].properties.phone == "555"
+            assert service().get_job_status(job_b.id).status == "completed"
+            engine.dispose()
+
+    # =========================================================================
+    # History lookup tests
+    # =========================================================================
+
+    class TestHistoryLookup:
+        """Tests for reusing HubSpot IDs from earlier jobs."""
+
+        @pytest.fixture
+        def service(
+            self,
+            mock_uow,
+            mock_crm_client,
+            mock_matching_service,
+        ) -> PushService:
+            return PushService(
+                uow=mock_uow,
+                crm_client=mock_crm_client,
+                matching_service=mock_matching_service,
+                verify_history=False,
+            )
+
+        def test_updates_history_match_without_fetching_crm(
+            self,
+            service: PushService,
+            mock_uow,
+            mock_crm_client,
+            mock_matching_service,
+            make_contact,
+        ):
+            """Should update contacts found in history without matching."""
+            mock_uow.contacts.get_by_job_id.return_value = [
+                make_contact(id=10, job_id=2, email="known@example.com")
+            ]
+            mock_uow.contacts.get_latest_synced_by_keys.return_value = [
+                make_contact(
+                    id=1, email="known@example.com", first_name="Ann", hubspot_id="hs_old"
+                )
+            ]
+
+            result = service.process_job(2)
+
+            mock_crm_client.get_contacts_page.assert_not_called()
+            mock_matching_service.match_contacts.assert_not_called()
+            contact_id, contact_data = mock_crm_client.update_contact.call_args[0]
+            assert contact_id == "hs_old"
+            # Only local values are sent: the CRM keeps its own first name
+            assert contact_data["email"] == "known@example.com"
+            assert contact_data["first_name"] is None
+            assert result.updated_count == 1
+            assert mock_uow.contacts.get_latest_synced_by_keys.call_args.kwargs == {
+                "emails": ["known@example.com"],
+                "linkedin_ids": [],
+                "exclude_job_id": 2,
+            }
+
+        def test_prefers_linkedin_id_over_email(
+            self,
+            service: PushService,
+            mock_uow,
+            mock_crm_client,
+            make_contact,
+        ):
+            """Should resolve by LinkedIn ID before email."""
+            mock_uow.contacts.get_by_job_id.return_value = [
+                make_contact(id=10, email="a@example.com", linkedin_id="li_1")
+            ]
+            mock_uow.contacts.get_latest_synced_by_keys.return_value = [
+                make_contact(id=2, email="a@example.com", hubspot_id="hs_email"),
+                make_contact(id=1, linkedin_id="li_1", hubspot_id="hs_linkedin"),
+            ]
+
+            service.process_job(1)
+
+            assert mock_crm_client.update_contact.call_args[0][0] == "hs_linkedin"
+
+        def test_matches_contacts_missing_from_history(
+            self,
+            service: PushService,
+            mock_uow,
+            mock_matching_service,
+            make_contact,
+        ):
+            """Should only send contacts not found in history to matching."""
+            unknown = make_contact(id=11, email="new@example.com")
+            mock_uow.contacts.get_by_job_id.return_value = [
+                make_contact(id=10, email="known@example.com"),
+                unknown,
+            ]
+            mock_uow.contacts.get_latest_synced_by_keys.return_value = [
+                make_contact(id=1, email="known@example.com", hubspot_id="hs_old")
+            ]
+
+            service.process_job(1)
+
+            call_kwargs = mock_matching_service.match_contacts.call_args[1]
+            assert call_kwargs["local_contacts"] == [unknown]
+
+        def test_verification_drops_ids_missing_from_crm(
+            self,
+            mock_uow,
+            mock_crm_client,
+            mock_matching_service,
+            make_contact,
+        ):
+            """Should match again contacts whose HubSpot ID no longer exists."""
+            service = PushService(
+                uow=mock_uow,
+                crm_client=mock_crm_client,
+                matching_service=mock_matching_service,
+                verify_history=True,
+            )
+            contact = make_contact(id=10, email="known@example.com")
+            mock_uow.contacts.get_by_job_id.return_value = [contact]
+            mock_uow.contacts.get_latest_synced_by_keys.return_value = [
+                make_contact(id=1, email="known@example.com", hubspot_id="hs_deleted")
+            ]
+
+            service.process_job(1)
+
+            mock_crm_client.get_contacts_by_ids.assert_called_once_with(["hs_deleted"])
+            call_kwargs = mock_matching_service.match_contacts.call_args[1]
+            assert call_kwargs["local_contacts"] == [contact]
+
+        def test_lookup_can_be_disabled(
+            self,
+            mock_uow,
+            mock_crm_client,
+            mock_matching_service,
+            make_contact,
+        ):
+            """Should skip the history query when disabled."""
+            service = PushService(
+                uow=mock_uow,
+                crm_client=mock_crm_client,
+                matching_service=mock_matching_service,
+                history_lookup=False,
+            )
+            mock_uow.contacts.get_by_job_id.return_value = [make_contact(email="a@example.com")]
+
+            service.process_job(1)
+
+            mock_uow.contacts.get_latest_synced_by_keys.assert_not_called()
+
     # =========================================================================
     # get_job_status tests
     # =========================================================================
@@ -0,0 +1,110 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.infrastructure import (
+    PushJob,
+    QueryStatsMiddleware,
+    SqlAlchemyUnitOfWork,
+    assert_max_queries,
+    track_queries,
+)
+from app.infrastructure.database import query_stats
+from app.infrastructure.database.query_stats import report_queries, statement_shape
+from app.infrastructure.metrics.instruments import DB_SCOPE_STATEMENTS
+from app.repositories import ContactRepository
+from app.schemas import ContactCreate
+
+
+class TestQueryStats:
+    def test_shapes_collapse_parameter_lists(self):
+        assert statement_shape("SELECT id FROM contacts\n WHERE id IN (?, ?, ?)") == (
+            "SELECT id FROM contacts WHERE id IN (?...)"
+        )
+        assert statement_shape("INSERT INTO t (a, b) VALUES (?, ?), (?, ?)") == (
+            "INSERT INTO t (a, b) VALUES (?...), ..."
+        )
+
+    def test_counts_statements_in_nested_scopes(self, db_session):
+        with track_queries() as outer:
+            db_session.execute(text("SELECT 1"))
+            with track_queries() as inner:
+                db_session.execute(text("SELECT 1"))
+            with track_queries(inherit=False) as isolated:
+                db_session.execute(text("SELECT 2"))
+
+        assert (outer.statements, inner.statements, isolated.statements) == (2, 1, 1)
+        assert outer.shapes == {"SELECT 1": 2}
+        assert outer.seconds > 0
+
+    def test_unit_of_work_counts_only_its_transaction(self, session_factory, db_session):
+        with track_queries() as outer:
+            with SqlAlchemyUnitOfWork(session_factory) as uow:
+                uow.contacts.get_by_job_id(1)
+            db_session.execute(text("SELECT 1"))
+
+        assert uow.statement_count == 1
+        assert outer.statements == 2
+
+    def test_unit_of_work_closes_query_scope_when_session_fails(self):
+        def failing_session_factory():
+            raise RuntimeError("database unavailable")
+
+        with track_queries() as outer:
+            with pytest.raises(RuntimeError):
+                with SqlAlchemyUnitOfWork(failing_session_factory):
+                    pass
+
+            assert query_stats._scopes.get() == (outer,)
+
+    def test_logs_statements_repeated_per_row(self, db_session, caplog):
+        job = PushJob(status="pending")
+        db_session.add(job)
+        db_session.flush()
+        repository = ContactRepository(db_session)
+        contacts = repository.bulk_create(
+            [ContactCreate(job_id=job.id, email=f"user{i}@example.com") for i in range(25)]
+        )
+
+        with track_queries() as stats:
+            for contact in contacts:
+                repository.update_with_hubspot_data(contact.id, hubspot_id=f"hs_{contact.id}")
+        with caplog.at_level(logging.WARNING):
+            report_queries(stats, "job", "Push job 1")
+
+        assert any("a likely N+1" in record.message for record in caplog.records)
+
+    def test_assert_max_queries(self, db_session):
+        repository = ContactRepository(db_session)
+
+        # One query however many contacts the job has
+        with assert_max_queries(1):
+            repository.get_by_job_id(1)
+
+        with pytest.raises(AssertionError, match="2 statements run, at most 1 expected"):
+            with assert_max_queries(1):
+                repository.get_by_job_id(1)
+                repository.get_by_job_id(2)
+
+    def test_middleware_counts_statements_per_request(self, session_factory):
+        app = FastAPI()
+        app.add_middleware(QueryStatsMiddleware)
+
+        @app.get("/three")
+        def three_queries() -> dict:
+            with session_factory() as session:
+                for _ in range(3):
+                    session.execute(text("SELECT 1"))
+            return {}
+
+        child = DB_SCOPE_STATEMENTS.labels("http")
+        count_before, sum_before = child.snapshot()[0][-1], child.snapshot()[1]
+
+        TestClient(app).get("/three")
+
+        counts, total = child.snapshot()
+        assert counts[-1] == count_before + 1
+        assert total == sum_before + 3
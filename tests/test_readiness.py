@@ -0,0 +1,147 @@
+import asyncio
+import threading
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from app.dependencies import get_readiness_service
+from app.infrastructure import TokenBucket, pool_utilization
+from app.routers import health_router
+from app.services import ReadinessService
+
+
+class _FakeJobExecutor:
+    def __init__(self, queued_jobs: int = 0, accepting_jobs: bool = True):
+        self.queued_jobs = queued_jobs
+        self.accepting_jobs = accepting_jobs
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def _service(**kwargs) -> ReadinessService:
+    kwargs.setdefault("job_executor", _FakeJobExecutor())
+    kwargs.setdefault("ping", lambda: None)
+    kwargs.setdefault("pool_utilization", lambda: 0.5)
+    return ReadinessService(**kwargs)
+
+
+def _get_ready(service: ReadinessService):
+    app = FastAPI()
+    app.include_router(health_router)
+    app.dependency_overrides[get_readiness_service] = lambda: service
+    return TestClient(app).get("/health/ready")
+
+
+class TestTokenBucket:
+    def test_waits_once_the_burst_is_spent(self):
+        clock = _FakeClock()
+        bucket = TokenBucket(rate=10, burst=2, clock=clock, sleep=clock.sleep)
+
+        waits = [bucket.acquire() for _ in range(4)]
+
+        assert waits[:2] == [0.0, 0.0]
+        assert waits[2] == 0.1
+        assert round(waits[3], 6) == 0.1
+        assert round(clock.now, 6) == 0.2
+
+    def test_headroom_refills_over_time(self):
+        clock = _FakeClock()
+        bucket = TokenBucket(rate=10, burst=4, clock=clock, sleep=clock.sleep)
+        for _ in range(4):
+            bucket.acquire()
+        assert bucket.headroom == 0.0
+
+        clock.now += 0.2
+
+        assert bucket.headroom == 0.5
+
+
+class TestPoolUtilization:
+    def test_counts_overflow_in_the_capacity(self):
+        pool = QueuePool(lambda: None, pool_size=2, max_overflow=2)
+        assert pool_utilization(pool) == 0.0
+
+    def test_is_unknown_without_a_fixed_capacity(self):
+        assert pool_utilization(StaticPool(lambda: None)) is None
+        assert pool_utilization(QueuePool(lambda: None, pool_size=2, max_overflow=-1)) is None
+
+
+class TestReadiness:
+    def test_ready_when_every_check_passes(self):
+        response = _get_ready(_service(crm_headroom=lambda: 1.0))
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "ready"
+        assert set(body["checks"]) == {"database", "job_queue", "db_pool", "crm_rate_limit"}
+        assert all(check["ok"] for check in body["checks"].values())
+
+    def test_sheds_load_over_thresholds(self):
+        service = _service(
+            job_executor=_FakeJobExecutor(queued_jobs=5000),
+            pool_utilization=lambda: 1.0,
+            crm_headroom=lambda: 0.0,
+            max_queued_jobs=100,
+        )
+
+        response = _get_ready(service)
+
+        assert response.status_code == 503
+        checks = response.json()["checks"]
+        assert checks["job_queue"] == {"ok": False, "value": 5000, "threshold": 100, "message": None}
+        assert not checks["db_pool"]["ok"]
+        assert not checks["crm_rate_limit"]["ok"]
+        assert checks["database"]["ok"]
+
+    def test_sheds_load_while_shutting_down(self):
+        response = _get_ready(_service(job_executor=_FakeJobExecutor(accepting_jobs=False)))
+
+        assert response.status_code == 503
+        assert "Shutting down" in response.json()["checks"]["job_queue"]["message"]
+
+    def test_skips_checks_without_a_limit(self):
+        checks = asyncio.run(_service(pool_utilization=lambda: None).check())
+
+        skipped = [check for check in checks if check.name in ("db_pool", "crm_rate_limit")]
+        assert all(check.ok and check.value is None for check in skipped)
+
+    def test_reports_database_errors(self):
+        def ping():
+            raise ConnectionError("refused")
+
+        response = _get_ready(_service(ping=ping))
+
+        assert response.status_code == 503
+        assert response.json()["checks"]["database"]["message"] == "ConnectionError: refused"
+
+    def test_hung_database_runs_one_probe_at_a_time(self):
+        release = threading.Event()
+        pings = []
+
+        def ping():
+            pings.append(1)
+            release.wait(5)
+
+        service = _service(ping=ping, db_timeout=0.05)
+
+        async def scenario():
+            first = await service.check()
+            second = await service.check()
+            return first[0], second[0]
+
+        first, second = asyncio.run(scenario())
+        release.set()
+
+        assert not first.ok and first.message.startswith("No answer")
+        assert not second.ok and second.message == "Previous probe still running"
+        assert len(pings) == 1
@@ -0,0 +1,147 @@
+import threading
+
+import pytest
+
+from app.services.sync_pipeline import PipelineConfig, SyncPipeline
+
+
+class TestSyncPipeline:
+    """Tests for SyncPipeline."""
+
+    @pytest.fixture
+    def pipeline(self) -> SyncPipeline:
+        return SyncPipeline(PipelineConfig(partition_size=2, crm_queue_size=1, persist_queue_size=1))
+
+    @pytest.mark.parametrize(
+        "items,expected",
+        [
+            ([], [[]]),
+            ([1], [[1]]),
+            ([1, 2, 3], [[1, 2], [3]]),
+        ],
+        ids=["empty", "single", "several"],
+    )
+    def test_partition(self, pipeline: SyncPipeline, items: list, expected: list):
+        """Should split items into partitions, keeping at least one."""
+        assert pipeline.partition(items) == expected
+
+    def test_runs_every_item_through_all_stages(self, pipeline: SyncPipeline):
+        """Should match, write and persist every item in order."""
+        persisted = []
+
+        run = pipeline.run(
+            partitions=pipeline.partition([1, 2, 3, 4, 5]),
+            match=lambda partition: [i * 10 for i in partition],
+            write=lambda operation: operation + 1,
+            persist=persisted.append,
+            should_stop=lambda: False,
+        )
+
+        assert run.completed
+        assert persisted == [11, 21, 31, 41, 51]
+        assert [(stage.name, stage.items) for stage in run.stages] == [
+            ("match", 5),
+            ("crm_write", 5),
+            ("persist", 5),
+        ]
+
+    def test_persists_in_calling_thread(self, pipeline: SyncPipeline):
+        """Should run the persist stage on the thread that owns the session."""
+        persist_threads = set()
+
+        pipeline.run(
+            partitions=pipeline.partition([1, 2, 3]),
+            match=lambda partition: partition,
+            write=lambda operation: operation,
+            persist=lambda _: persist_threads.add(threading.get_ident()),
+            should_stop=lambda: False,
+        )
+
+        assert persist_threads == {threading.get_ident()}
+
+    def test_keeps_several_crm_writes_in_flight(self):
+        """Should run up to crm_concurrency writes at the same time."""
+        pipeline = SyncPipeline(PipelineConfig(partition_size=10, crm_concurrency=3))
+        barrier = threading.Barrier(3, timeout=2)
+        persisted = []
+
+        def write(operation):
+            barrier.wait()
+            return operation
+
+        run = pipeline.run(
+            partitions=pipeline.partition(list(range(6))),
+            match=lambda partition: partition,
+            write=write,
+            persist=persisted.append,
+            should_stop=lambda: False,
+        )
+
+        assert run.completed
+        assert sorted(persisted) == list(range(6))
+
+    @pytest.mark.parametrize("failing_stage", ["match", "write", "persist"])
+    def test_raises_first_stage_error(self, pipeline: SyncPipeline, failing_stage: str):
+        """Should stop all stages and re-raise an error from any stage."""
+
+        def stage(name):
+            def run(value):
+                if name == failing_stage:
+                    raise ValueError(f"{name} failed")
+                return value
+
+            return run
+
+        with pytest.raises(ValueError, match=f"{failing_stage} failed"):
+            pipeline.run(
+                partitions=pipeline.partition(list(range(10))),
+                match=stage("match"),
+                write=stage("write"),
+                persist=stage("persist"),
+                should_stop=lambda: False,
+            )
+
+    def test_persists_writes_made_before_stop(self, pipeline: SyncPipeline):
+        """Should persist every CRM write already made when asked to stop."""
+        written = []
+        persisted = []
+
+        def write(operation):
+            written.append(operation)
+            return operation
+
+        run = pipeline.run(
+            partitions=pipeline.partition(list(range(10))),
+            match=lambda partition: partition,
+            write=write,
+            persist=persisted.append,
+            should_stop=lambda: len(written) >= 3,
+        )
+
+        assert not run.completed
+        assert written == [0, 1, 2]
+        assert persisted == written
+
+    def test_persists_successful_writes_before_raising_a_write_error(self):
+        """Should persist writes completed alongside a failed one before re-raising."""
+        pipeline = SyncPipeline(PipelineConfig(partition_size=10, crm_concurrency=4))
+        barrier = threading.Barrier(4, timeout=2)
+        persisted = []
+
+        def write(operation):
+            # All four writes are in flight together and complete in one set
+            barrier.wait()
+            if operation == 1:
+                raise ValueError("write failed")
+            return operation
+
+        with pytest.raises(ValueError, match="write failed"):
+            pipeline.run(
+                partitions=pipeline.partition(list(range(4))),
+                match=lambda partition: partition,
+                write=write,
+                persist=persisted.append,
+                should_stop=lambda: False,
+            )
+
+        assert sorted(persisted) == [0, 2, 3]
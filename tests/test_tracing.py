@@ -0,0 +1,108 @@
+import asyncio
+import json
+
+import pytest
+
+from app.infrastructure import (
+    AsyncTaskExecutor,
+    FileSpanExporter,
+    HubSpotClient,
+    InMemorySpanExporter,
+    InstrumentedCrmClient,
+    SqlAlchemyUnitOfWork,
+    get_tracer,
+    set_span_exporter,
+)
+from app.infrastructure.tracing import INVALID_SPAN
+from app.services import PushService
+from app.services.contact_matching_service import ContactMatchingService
+
+tracer = get_tracer(__name__)
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    previous = set_span_exporter(exporter)
+    yield exporter
+    set_span_exporter(previous)
+
+
+class TestTracer:
+    def test_records_nothing_without_exporter(self):
+        with tracer.start_as_current_span("noop") as span:
+            span.set_attribute("key", "value")
+
+        assert span is INVALID_SPAN
+        assert tracer.start_span("noop") is INVALID_SPAN
+
+    def test_nests_spans_and_records_errors(self, exporter: InMemorySpanExporter):
+        with pytest.raises(ValueError):
+            with tracer.start_as_current_span("parent", attributes={"job.id": 1}):
+                with tracer.start_as_current_span("child"):
+                    raise ValueError("boom")
+
+        child, parent = exporter.get_finished_spans()
+        assert child.trace_id == parent.trace_id
+        assert child.parent_id == parent.span_id
+        assert parent.parent_id is None
+        assert parent.attributes == {
+            "job.id": 1, "exception.type": "ValueError", "exception.message": "boom"
+        }
+        assert child.status == parent.status == "ERROR"
+
+    def test_file_exporter_writes_json_lines(self, tmp_path):
+        path = tmp_path / "traces.jsonl"
+        exporter = FileSpanExporter(str(path))
+        previous = set_span_exporter(exporter)
+        try:
+            with tracer.start_as_current_span("written", attributes={"job.id": 7}):
+                pass
+        finally:
+            set_span_exporter(previous)
+            exporter.shutdown()
+
+        (line,) = path.read_text().splitlines()
+        span = json.loads(line)
+        assert span["name"] == "written"
+        assert span["attributes"] == {"job.id": 7}
+        assert span["duration_ms"] >= 0
+
+
+class TestJobTracing:
+    def test_background_job_joins_the_request_trace(
+        self, session_factory, exporter: InMemorySpanExporter
+    ):
+        """Spans of the job, its queries and CRM calls share the trace of the request."""
+        crm_client = HubSpotClient()
+        crm_client.create_contact({"email": "existing@example.com"})
+        service = PushService(
+            uow=SqlAlchemyUnitOfWork(session_factory),
+            crm_client=InstrumentedCrmClient(crm_client),
+            matching_service=ContactMatchingService(workers=0),
+        )
+        executor = AsyncTaskExecutor()
+        executor.add_task("process", service.process_job)
+
+        async def scenario():
+            with tracer.start_as_current_span("push_profiles"):
+                job = service.create_push_job(
+                    [{"email": "existing@example.com"}, {"email": "new@example.com"}]
+                )
+                tracked = executor.execute("process", job.id)
+            await tracked.future
+            return job
+
+        job = asyncio.run(scenario())
+
+        spans = exporter.get_finished_spans()
+        by_name = {span.name: span for span in spans}
+        root = by_name["push_profiles"]
+        assert {span.trace_id for span in spans} == {root.trace_id}
+        assert by_name["create_push_job"].attributes["job.id"] == job.id
+        assert by_name["process_job"].parent_id == root.span_id
+        assert by_name["process_job"].attributes["job.id"] == job.id
+        # CRM writes run in pipeline threads, still under the job
+        assert {"crm.get_contacts_page", "crm.update_contact", "crm.create_contact"} <= set(by_name)
+        assert by_name["crm.create_contact"].parent_id == by_name["process_job"].span_id
+        assert any(span.name == "db.select" for span in spans)